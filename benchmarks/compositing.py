@@ -0,0 +1,63 @@
+"""
+Compositing
+-----------
+
+Benchmark compositing a million drillhole intervals to fixed lengths and to
+domain runs with :func:`omfvista.composite_line_set`.
+
+Run with ``python benchmarks/compositing.py [n_holes] [n_intervals]``.
+"""
+import sys
+import time
+
+import numpy as np
+import pyvista
+
+import omfvista
+
+
+def make_holes(n_holes, n_intervals):
+    """Straight holes of contiguous random length intervals with an assay
+    and a lithology code per interval
+    """
+    rng = np.random.default_rng(0)
+    lengths = rng.uniform(0.2, 2.0, size=(n_holes, n_intervals))
+    depths = np.concatenate([np.zeros((n_holes, 1)), np.cumsum(lengths, axis=1)], axis=1)
+    collars = rng.uniform(0.0, 5000.0, size=(n_holes, 2))
+    points = np.empty((n_holes, n_intervals + 1, 3))
+    points[:, :, 0] = collars[:, :1]
+    points[:, :, 1] = collars[:, 1:]
+    points[:, :, 2] = -depths
+    ids = np.arange(n_holes * (n_intervals + 1)).reshape(n_holes, -1)
+    segments = np.stack([ids[:, :-1], ids[:, 1:]], axis=-1).reshape(-1, 2)
+    output = pyvista.PolyData()
+    output.points = points.reshape(-1, 3)
+    output.lines = np.c_[np.full(len(segments), 2), segments].ravel()
+    output.cell_data["Line Index"] = np.repeat(np.arange(n_holes), n_intervals)
+    output.cell_data["CU_pct"] = rng.lognormal(size=len(segments))
+    output.cell_data["Lithology"] = (np.arange(len(segments)) // 50) % 3
+    return output
+
+
+def best_time(func, repeats=3):
+    """Best wall time (in seconds) of a few calls"""
+    best = float("inf")
+    for _ in range(repeats):
+        tic = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - tic)
+    return best, result
+
+
+if __name__ == "__main__":
+    n_holes = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    n_intervals = int(sys.argv[2]) if len(sys.argv) > 2 else 1000
+    holes = make_holes(n_holes, n_intervals)
+    print("{:,d} intervals in {:,d} holes".format(holes.n_cells, n_holes))
+    for label, kwargs in (
+        ("2 m composites", dict(length=2.0)),
+        ("domain runs", dict(domain="Lithology")),
+        ("10 m in domains", dict(length=10.0, domain="Lithology")),
+    ):
+        seconds, output = best_time(lambda: omfvista.composite_line_set(holes, **kwargs))
+        print("{:<16} {:>8.3f} s  {:>10,d} composites".format(label, seconds, output.n_cells))
@@ -0,0 +1,59 @@
+"""
+Decompression
+-------------
+
+Benchmark the time of reading a block model with many data arrays from an OMF
+file with ``omf`` decompressing one array at a time compared to decompressing
+the arrays in a thread pool (see
+:meth:`omfvista.fileio.ProjectFile.read_element`).
+
+Run with ``python benchmarks/decompression.py [size] [arrays] [workers]``.
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+import omf
+
+from omfvista.fileio import ProjectFile
+
+
+def make_project(size, arrays):
+    """A project holding a cubic block model with random data arrays"""
+    geometry = omf.VolumeGridGeometry(
+        tensor_u=np.ones(size), tensor_v=np.ones(size), tensor_w=np.ones(size)
+    )
+    data = [
+        omf.ScalarData(
+            name="Data {:d}".format(i),
+            location="cells",
+            # Rounded so that the arrays compress like real grades do
+            array=np.round(np.random.rand(size**3), 2),
+        )
+        for i in range(arrays)
+    ]
+    element = omf.VolumeElement(name="Block Model", geometry=geometry, data=data)
+    return omf.Project(name="Benchmark", elements=[element])
+
+
+def measure(filename, workers):
+    """Wall time (in seconds) of reading the block model"""
+    with ProjectFile(filename) as pfile:
+        uid = pfile.project["elements"][0]
+        tic = time.perf_counter()
+        pfile.read_element(uid, workers=workers)
+        return time.perf_counter() - tic
+
+
+if __name__ == "__main__":
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 150
+    arrays = int(sys.argv[2]) if len(sys.argv) > 2 else 8
+    workers = int(sys.argv[3]) if len(sys.argv) > 3 else os.cpu_count()
+    with tempfile.TemporaryDirectory() as directory:
+        filename = os.path.join(directory, "benchmark.omf")
+        omf.OMFWriter(make_project(size, arrays), filename)
+        for label, count in (("serial", None), ("{:d} threads".format(workers), workers)):
+            print("{:<12} {:>8.3f} s".format(label, measure(filename, count)))
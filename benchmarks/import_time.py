@@ -0,0 +1,34 @@
+"""
+Import Time
+-----------
+
+Benchmark the time it takes to ``import omfvista`` in a fresh interpreter
+compared to the time it takes to access the converters (which imports
+``pyvista``/VTK and ``omf``).
+
+Run with ``python benchmarks/import_time.py``.
+"""
+import subprocess
+import sys
+import time
+
+REPEATS = 5
+
+
+def time_import(statement):
+    """Best wall time (in seconds) of running a statement in a fresh interpreter"""
+    best = float("inf")
+    for _ in range(REPEATS):
+        tic = time.perf_counter()
+        subprocess.check_call([sys.executable, "-c", statement])
+        best = min(best, time.perf_counter() - tic)
+    return best
+
+
+if __name__ == "__main__":
+    baseline = time_import("pass")
+    lazy = time_import("import omfvista")
+    full = time_import("import omfvista; omfvista.load_project")
+    print("interpreter startup:        {:.3f} s".format(baseline))
+    print("import omfvista:            {:.3f} s".format(lazy - baseline))
+    print("import omfvista converters: {:.3f} s".format(full - baseline))
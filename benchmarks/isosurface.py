@@ -0,0 +1,93 @@
+"""
+Isosurface
+----------
+
+Benchmark the time and peak memory of extracting a grade shell from a
+rotated block model with :func:`omfvista.volume_isosurface` compared to
+converting the volume with :func:`omfvista.volume_to_vtk`, interpolating its
+cell data to points and contouring it with VTK.
+
+Each method runs in its own process and its memory is the growth of the
+peak resident set size (``tracemalloc`` does not see VTK's allocations).
+
+Run with ``python benchmarks/isosurface.py [size] [workers]``.
+"""
+
+import resource
+import subprocess
+import sys
+import time
+
+import numpy as np
+import omf
+
+import omfvista
+
+
+def make_volume(size):
+    """A rotated cubic block model of a smooth grade field"""
+    u = np.linspace(0.0, 4.0 * np.pi, size)
+    grade = np.sin(u)[:, None, None] * np.cos(u)[None, :, None] + np.sin(u / 2.0)[None, None, :]
+    return omf.VolumeElement(
+        name="blocks",
+        geometry=omf.VolumeGridGeometry(
+            axis_u=[0.8, 0.6, 0.0],
+            axis_v=[-0.6, 0.8, 0.0],
+            axis_w=[0.0, 0.0, 1.0],
+            tensor_u=np.full(size, 10.0),
+            tensor_v=np.full(size, 10.0),
+            tensor_w=np.full(size, 5.0),
+        ),
+        data=[omf.ScalarData(name="grade", location="cells", array=grade.ravel())],
+    )
+
+
+def vtk_path(volume, value):
+    """Convert the whole volume and contour it with VTK"""
+    grid = omfvista.volume_to_vtk(volume)
+    return grid.cell_data_to_point_data().contour([value], scalars="grade")
+
+
+def resident_memory():
+    """The current resident set size of the process (in bytes)"""
+    with open("/proc/self/statm") as f:
+        return int(f.read().split()[1]) * resource.getpagesize()
+
+
+def measure(method, size, workers):
+    """Wall time (in seconds), peak memory growth (in bytes) and number of
+    triangles of a method
+    """
+    volume = make_volume(size)
+    before = resident_memory()
+    tic = time.perf_counter()
+    if method == "vtk":
+        surface = vtk_path(volume, 0.5)
+    else:
+        surface = omfvista.volume_isosurface(volume, "grade", 0.5, workers=workers)
+    seconds = time.perf_counter() - tic
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+    return seconds, peak - before, surface.n_cells
+
+
+if __name__ == "__main__":
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    workers = int(sys.argv[2]) if len(sys.argv) > 2 else 8
+    if len(sys.argv) > 3:
+        print(*measure(sys.argv[3], size, workers or None))
+        sys.exit()
+    print("{:d} cells".format(size**3))
+    for label, method, threads in (
+        ("vtk", "vtk", 0),
+        ("omfvista", "omfvista", 0),
+        ("threaded", "omfvista", workers),
+    ):
+        output = subprocess.check_output(
+            [sys.executable, __file__, str(size), str(threads), method]
+        )
+        seconds, peak, triangles = output.decode().split()
+        print(
+            "{:<9} {:>8.3f} s  {:>9.1f} MB peak  {:>9d} triangles".format(
+                label, float(seconds), float(peak) / 1024.0**2, int(triangles)
+            )
+        )
@@ -0,0 +1,51 @@
+"""
+Surface Grid
+------------
+
+Benchmark the time and peak memory of converting a large, unrotated surface
+grid (a DEM) to a :class:`pyvista.StructuredGrid` compared to the implicit
+:class:`pyvista.RectilinearGrid` with an ``offset_w`` warp scalar.
+
+Run with ``python benchmarks/surface_grid.py [size]``.
+"""
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+import omf
+
+import omfvista
+
+
+def make_grid(size):
+    """A square surface grid with random node elevations"""
+    return omf.SurfaceGridGeometry(
+        tensor_u=np.ones(size),
+        tensor_v=np.ones(size),
+        offset_w=np.random.rand((size + 1) ** 2),
+    )
+
+
+def measure(geom, implicit):
+    """Wall time (in seconds) and peak traced memory (in bytes) of a conversion"""
+    tracemalloc.start()
+    tic = time.perf_counter()
+    omfvista.surface_grid_geom_to_vtk(geom, implicit=implicit)
+    seconds = time.perf_counter() - tic
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return seconds, peak
+
+
+if __name__ == "__main__":
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    geom = make_grid(size)
+    omfvista.surface_grid_geom_to_vtk(make_grid(10))  # warm up
+    for implicit in (False, True):
+        seconds, peak = measure(geom, implicit)
+        print(
+            "{:<9} {:>8.3f} s  {:>9.1f} MB peak".format(
+                "implicit" if implicit else "explicit", seconds, peak / 1024.0**2
+            )
+        )
@@ -1,18 +1,11 @@
 """``omfvista``: 3D visualization for the Open Mining Format (omf)
+
+The public API is loaded lazily: ``import omfvista`` is cheap and the heavy
+dependencies (``pyvista``/VTK, ``omf`` and PIL) are only imported when an
+attribute that needs them is first accessed.
 """
 
-from omfvista.lineset import line_set_to_vtk
-from omfvista.pointset import point_set_to_vtk
-from omfvista.surface import surface_geom_to_vtk, surface_grid_geom_to_vtk, surface_to_vtk
-from omfvista.utilities import (
-    add_data,
-    add_texture_coordinates,
-    check_orientation,
-    check_orthogonal,
-    texture_to_vtk,
-)
-from omfvista.volume import volume_grid_geom_to_vtk, volume_to_vtk
-from omfvista.wrapper import load_project, project_to_vtk, wrap
+import importlib
 
 # Package meta data
 __author__ = "Bane Sullivan"
@@ -22,23 +15,119 @@ __version__ = "0.3.1"
 __displayname__ = "OMF-VTK"
 __name__ = "omfvista"
 
+# The submodule providing each attribute of the public API
+_LAZY_ATTRIBUTES = {
+    "iter_project_async": "omfvista.aio",
+    "load_project_async": "omfvista.aio",
+    "wrap_async": "omfvista.aio",
+    "grade_tonnage": "omfvista.analysis",
+    "reserve_summary": "omfvista.analysis",
+    "bin_points": "omfvista.binning",
+    "plan_project": "omfvista.budget",
+    "ProjectCache": "omfvista.cache",
+    "export_project": "omfvista.cache",
+    "load_cache": "omfvista.cache",
+    "composite_line_set": "omfvista.compositing",
+    "reload_project": "omfvista.incremental",
+    "inspect": "omfvista.inspection",
+    "volume_isosurface": "omfvista.isosurface",
+    "line_set_geom_to_vtk": "omfvista.lineset",
+    "line_set_to_vtk": "omfvista.lineset",
+    "merge_blocks": "omfvista.merging",
+    "merge_datasets": "omfvista.merging",
+    "merge_textures": "omfvista.merging",
+    "point_set_geom_to_vtk": "omfvista.pointset",
+    "point_set_to_vtk": "omfvista.pointset",
+    "Profiler": "omfvista.profiling",
+    "query_volume": "omfvista.query",
+    "sample_volume": "omfvista.sampling",
+    "dump_dataset": "omfvista.sharing",
+    "load_dataset": "omfvista.sharing",
+    "load_project_parallel": "omfvista.sharing",
+    "slice_volume": "omfvista.slicing",
+    "SpatialIndex": "omfvista.spatial",
+    "build_spatial_index": "omfvista.spatial",
+    "build_spatial_indices": "omfvista.spatial",
+    "StatisticsIndex": "omfvista.statistics",
+    "compute_statistics": "omfvista.statistics",
+    "surface_geom_to_vtk": "omfvista.surface",
+    "surface_grid_geom_to_vtk": "omfvista.surface",
+    "surface_to_vtk": "omfvista.surface",
+    "TextureCache": "omfvista.textures",
+    "mask_volume": "omfvista.topography",
+    "topography_mask": "omfvista.topography",
+    "add_data": "omfvista.utilities",
+    "add_texture_coordinates": "omfvista.utilities",
+    "check_orientation": "omfvista.utilities",
+    "check_orthogonal": "omfvista.utilities",
+    "geometry_hash": "omfvista.utilities",
+    "ignore_warnings": "omfvista.utilities",
+    "texture_to_vtk": "omfvista.utilities",
+    "volume_grid_geom_to_vtk": "omfvista.volume",
+    "volume_to_vtk": "omfvista.volume",
+    "iter_project": "omfvista.wrapper",
+    "load_project": "omfvista.wrapper",
+    "project_to_vtk": "omfvista.wrapper",
+    "wrap": "omfvista.wrapper",
+}
+
+_SUBMODULES = {
+    "aio",
+    "analysis",
+    "binning",
+    "budget",
+    "cache",
+    "cli",
+    "compositing",
+    "fileio",
+    "incremental",
+    "inspection",
+    "isosurface",
+    "lineset",
+    "merging",
+    "pointset",
+    "profiling",
+    "query",
+    "sampling",
+    "sharing",
+    "slicing",
+    "spatial",
+    "statistics",
+    "surface",
+    "textures",
+    "topography",
+    "utilities",
+    "volume",
+    "wrapper",
+}
 
-def ignore_warnings():
-    """Sets a warning filter for pillow's annoying ``DecompressionBombWarning``"""
-    import warnings
+# Star imports resolve each name through __getattr__
+__all__ = sorted(list(_LAZY_ATTRIBUTES) + ["download_forge_example"])
 
-    from PIL import Image
 
-    warnings.simplefilter(action="ignore", category=Image.DecompressionBombWarning)
+def __getattr__(name):
+    """Import the public API from its submodule on first access"""
+    if name in _SUBMODULES:
+        return importlib.import_module("omfvista." + name)
+    try:
+        module = _LAZY_ATTRIBUTES[name]
+    except KeyError:
+        raise AttributeError("module 'omfvista' has no attribute '{}'".format(name))
+    value = getattr(importlib.import_module(module), name)
+    globals()[name] = value
+    return value
 
 
-ignore_warnings()
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_ATTRIBUTES) | _SUBMODULES)
 
 
 def download_forge_example(load_textures=True):
     """Download and load the FORGE geothermal prroject data."""
     from pyvista import examples
 
+    from omfvista.wrapper import load_project
+
     print("Downloading FORGE data... Please be patient.")
     filename, _ = examples.downloads._download_file("FORGE.omf")
     print("FORGE Data Downloaded!")
@@ -0,0 +1,6 @@
+"""Run the ``omfvista`` command line interface with ``python -m omfvista``"""
+import sys
+
+from omfvista.cli import main
+
+sys.exit(main())
@@ -0,0 +1,180 @@
+"""``asyncio`` interface to load OMF projects without blocking the event loop
+of a web or Jupyter server.
+
+Example Use
+-----------
+
+Render elements as soon as they are converted:
+
+.. code-block:: python
+
+    import omfvista
+
+    async def handler(plotter):
+        async for name, dataset, textures in omfvista.iter_project_async('test_file.omf'):
+            plotter.add_mesh(dataset, name=name)
+
+or wait for the whole project:
+
+.. code-block:: python
+
+    data = await omfvista.load_project_async('test_file.omf')
+
+Each element is read from the file and converted on worker threads (the
+loop's default executor unless one is given), as the synchronous
+:func:`omfvista.iter_project` does. Elements are only submitted as earlier
+ones complete, so at most ``max_concurrency`` of them are read and held in
+memory at a time. Elements that are not yet converted are cancelled when the
+consumer stops iterating.
+"""
+
+__all__ = [
+    "iter_project_async",
+    "load_project_async",
+    "wrap_async",
+]
+
+__displayname__ = "Async"
+
+import asyncio
+import itertools
+import threading
+
+import numpy as np
+import pyvista
+
+from omfvista.fileio import ProjectFile
+from omfvista.utilities import get_textures
+from omfvista.wrapper import wrap
+
+
+def _convert(element, origin, load_textures):
+    """Convert an element and (optionally) its textures"""
+    output = wrap(element, origin=origin)
+    textures = []
+    if load_textures and getattr(element, "textures", None):
+        textures = get_textures(element)
+    return output, textures
+
+
+def _read_convert(pfile, lock, position, uid, origin, load_textures):
+    """Read an element from a project file and convert it"""
+    # The file is shared by the worker threads: read one element at a time
+    with lock:
+        element = pfile.read_element(uid)
+    output, textures = _convert(element, origin, load_textures)
+    return position, element.name, output, textures
+
+
+async def wrap_async(data, origin=(0.0, 0.0, 0.0), executor=None):
+    """Wraps the OMF data object/project as a VTK data object on a worker
+    thread (see :func:`omfvista.wrap`).
+
+    Args:
+        data: any OMF data object
+        origin (tuple(float)): the origin to shift the data object by
+        executor (:class:`concurrent.futures.Executor`): the executor to run
+            the conversion in. Defaults to the loop's default executor.
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(executor, wrap, data, origin)
+
+
+async def _iter_elements(filename, load_textures, max_concurrency, executor):
+    """Read and convert the elements of a project concurrently and yield them
+    with their position in the project as they become ready
+    """
+    if max_concurrency < 1:
+        raise ValueError("max_concurrency must be at least 1")
+    loop = asyncio.get_running_loop()
+    pfile = await loop.run_in_executor(executor, ProjectFile, filename)
+    lock = threading.Lock()
+    origin = np.array(pfile.origin)
+    uids = enumerate(pfile.project["elements"])
+    pending = set()
+    try:
+        while True:
+            # Only submit new elements as earlier ones complete
+            for i, uid in itertools.islice(uids, max_concurrency - len(pending)):
+                pending.add(
+                    loop.run_in_executor(
+                        executor, _read_convert, pfile, lock, i, uid, origin, load_textures
+                    )
+                )
+            if not pending:
+                break
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for future in done:
+                yield future.result()
+    finally:
+        # Stop converting if the consumer bails out early. The file is closed
+        # once the element being read (if any) is read: wait for it on a
+        # worker thread so the loop is not blocked.
+        for future in pending:
+            future.cancel()
+
+        def _close():
+            with lock:
+                pfile.close()
+
+        await loop.run_in_executor(executor, _close)
+
+
+async def iter_project_async(filename, load_textures=False, max_concurrency=4, executor=None):
+    """Asynchronously iterate over the converted elements of an OMF project
+    file in the order they finish converting.
+
+    Args:
+        filename (str): the OMF project file to load
+        load_textures (bool): also convert the textures of each element
+        max_concurrency (int): the maximum number of elements converted at
+            the same time
+        executor (:class:`concurrent.futures.Executor`): the executor to read
+            and convert in. Defaults to the loop's default executor.
+
+    Yields:
+        tuple: the name of the element, its VTK data object and a list of its
+        textures (empty unless ``load_textures`` is set)
+    """
+    elements = _iter_elements(filename, load_textures, max_concurrency, executor)
+    try:
+        async for _, name, output, textures in elements:
+            yield name, output, textures
+    finally:
+        # Close the file now rather than when the generator is collected
+        await elements.aclose()
+
+
+async def load_project_async(filename, load_textures=False, max_concurrency=4, executor=None):
+    """Asynchronously loads an OMF project file into a
+    :class:`pyvista.MultiBlock` dataset (see :func:`omfvista.load_project`).
+
+    Args:
+        filename (str): the OMF project file to load
+        load_textures (bool): also return a dictionary of the textures of
+            each element
+        max_concurrency (int): the maximum number of elements converted at
+            the same time
+        executor (:class:`concurrent.futures.Executor`): the executor to read
+            and convert in. Defaults to the loop's default executor.
+    """
+    converted = {}
+    async for i, name, output, tex in _iter_elements(
+        filename, load_textures, max_concurrency, executor
+    ):
+        converted[i] = (name, output, tex)
+    data = pyvista.MultiBlock()
+    textures = {}
+    for i in sorted(converted):
+        name, output, tex = converted[i]
+        data[name] = output
+        if tex:
+            textures[name] = tex
+    if load_textures:
+        return data, textures
+    return data
+
+
+iter_project_async.__displayname__ = "Iterate Project Asynchronously"
+load_project_async.__displayname__ = "Load Project File Asynchronously"
+wrap_async.__displayname__ = "The Asynchronous Wrapper"
@@ -0,0 +1,197 @@
+"""Grade–tonnage curves and reserve summaries of gridded volumes (block
+models) computed straight from their tensors and data arrays.
+
+Example Use
+-----------
+
+The tonnage and mean grade above many cutoffs at once:
+
+.. code-block:: python
+
+    import numpy as np
+    import omf
+    import omfvista
+
+    project = omf.OMFReader('test_file.omf').get_project()
+    table = omfvista.grade_tonnage(
+        project.elements[4], 'CU_pct', np.linspace(0.0, 2.0, 41), density='DENSITY'
+    )
+    table['tonnage'], table['grade']
+
+and the reserves of each domain above a cutoff:
+
+.. code-block:: python
+
+    summary = omfvista.reserve_summary(
+        project.elements[4], 'CU_pct', cutoff=0.3, density='DENSITY', domain='DOMAIN'
+    )
+
+Cell volumes are the outer product of the tensors of the volume (see
+:func:`omfvista.volume.get_volume_cell_volumes`), so no geometry is built.
+Cells are processed in chunks (in parallel threads when asked to) in a
+single pass: each cell is binned by the number of cutoffs below its grade
+with :func:`numpy.searchsorted` and the tonnage (and metal) of the bins is
+summed with :func:`numpy.bincount`, so the cost barely depends on the number
+of cutoffs. Cells with a missing (NaN) grade or density are left out.
+"""
+
+__all__ = [
+    "grade_tonnage",
+    "reserve_summary",
+]
+
+__displayname__ = "Analysis"
+
+import numpy as np
+
+from omfvista.utilities import map_chunks
+from omfvista.volume import get_volume_arrays, get_volume_cell_volumes, get_volume_shape
+
+# Number of cells processed at a time
+CHUNK_SIZE = 2**22
+
+
+def _cell_arrays(volelement, names):
+    """The flat cell data arrays of a volume by name"""
+    names = [name for name in names if isinstance(name, str)]
+    arrays = {}
+    for name, (arr, _, on_nodes) in get_volume_arrays(volelement, names=names).items():
+        if on_nodes:
+            raise ValueError("Data ({}) must be on the cells of the volume.".format(name))
+        arrays[name] = arr
+    return arrays
+
+
+def _chunk(volelement, arrays, grade, density, start, stop):
+    """The volume, tonnage and grade of the sampled cells of a chunk"""
+    volume = get_volume_cell_volumes(volelement.geometry, start, stop)
+    values = np.asarray(arrays[grade][start:stop], dtype=float)
+    if isinstance(density, str):
+        tonnage = volume * arrays[density][start:stop]
+    else:
+        tonnage = volume * density
+    valid = np.isfinite(values) & np.isfinite(tonnage)
+    return valid, volume, tonnage, values
+
+
+def _totals(volume, tonnage, values, bins, minlength):
+    """Sum the volume, tonnage and metal of each bin"""
+    return np.stack(
+        [
+            np.bincount(bins, weights=volume, minlength=minlength),
+            np.bincount(bins, weights=tonnage, minlength=minlength),
+            np.bincount(bins, weights=tonnage * values, minlength=minlength),
+        ]
+    )
+
+
+def _table(totals):
+    """Turn summed volume, tonnage and metal into a table"""
+    volume, tonnage, metal = totals
+    with np.errstate(invalid="ignore", divide="ignore"):
+        grade = np.where(tonnage > 0, metal / tonnage, np.nan)
+    return {"volume": volume, "tonnage": tonnage, "grade": grade, "metal": metal}
+
+
+def grade_tonnage(volelement, grade, cutoffs, density=1.0, chunk_size=CHUNK_SIZE, workers=None):
+    """Compute the grade–tonnage curve of a volume element.
+
+    Args:
+        volelement (:class:`omf.volume.VolumeElement`): the block model
+        grade (str): the name of the cell data array of grades
+        cutoffs (np.ndarray): the cutoff grades
+        density (str or float): the name of a cell data array of densities
+            or a constant density. Tonnages are volumes by default.
+        chunk_size (int): the number of cells processed at a time
+        workers (int): the number of threads processing chunks. Chunks are
+            processed in the calling thread by default.
+
+    Return:
+        dict: for each cutoff (``"cutoff"``), the ``"volume"``,
+        ``"tonnage"`` and ``"metal"`` (tonnage times grade) of the cells
+        with a grade at or above it and their mean ``"grade"`` weighted by
+        tonnage (NaN when no cell is above the cutoff)
+    """
+    cutoffs = np.asarray(cutoffs, dtype=float).ravel()
+    order = np.argsort(cutoffs)
+    arrays = _cell_arrays(volelement, [grade, density])
+    n = len(cutoffs)
+
+    def process(start, stop):
+        valid, volume, tonnage, values = _chunk(volelement, arrays, grade, density, start, stop)
+        values = values[valid]
+        # The number of cutoffs at or below each grade
+        bins = np.searchsorted(cutoffs[order], values, side="right")
+        return _totals(volume[valid], tonnage[valid], values, bins, n + 1)
+
+    n_cells = int(np.prod(get_volume_shape(volelement.geometry)))
+    totals = sum(map_chunks(process, n_cells, chunk_size, workers=workers))
+    if np.isscalar(totals):
+        totals = np.zeros((3, n + 1))
+    # The cells above a cutoff are those in the bins past it
+    above = np.cumsum(totals[:, ::-1], axis=1)[:, ::-1][:, 1:]
+    # Back to the order the cutoffs were given in
+    above[:, order] = above.copy()
+    return dict(cutoff=cutoffs, **_table(above))
+
+
+def reserve_summary(
+    volelement,
+    grade,
+    cutoff=None,
+    density=1.0,
+    domain=None,
+    chunk_size=CHUNK_SIZE,
+    workers=None,
+):
+    """Summarize the reserves of a volume element above a cutoff, by domain.
+
+    Args:
+        volelement (:class:`omf.volume.VolumeElement`): the block model
+        grade (str): the name of the cell data array of grades
+        cutoff (float): the cutoff grade. All sampled cells are counted by
+            default.
+        density (str or float): the name of a cell data array of densities
+            or a constant density. Tonnages are volumes by default.
+        domain (str): the name of a cell data array of integer domain codes
+            to summarize the reserves of separately
+        chunk_size (int): the number of cells processed at a time
+        workers (int): the number of threads processing chunks
+
+    Return:
+        dict: the ``"volume"``, ``"tonnage"``, ``"metal"`` and mean
+        ``"grade"`` of the cells at or above the cutoff in each ``"domain"``
+        (sorted codes, or a single ``None`` domain when not given)
+    """
+    arrays = _cell_arrays(volelement, [grade, density, domain])
+    if domain is not None and arrays[domain].dtype.kind not in "biu":
+        raise ValueError("Domain codes ({}) must be integers.".format(domain))
+
+    def process(start, stop):
+        valid, volume, tonnage, values = _chunk(volelement, arrays, grade, density, start, stop)
+        if cutoff is not None:
+            valid &= values >= cutoff
+        if domain is None:
+            codes = np.zeros(np.count_nonzero(valid), dtype=np.intp)
+        else:
+            codes = arrays[domain][start:stop][valid]
+        codes, bins = np.unique(codes, return_inverse=True)
+        totals = _totals(volume[valid], tonnage[valid], values[valid], bins.ravel(), len(codes))
+        return dict(zip(codes.tolist(), totals.T))
+
+    summed = {}
+    n_cells = int(np.prod(get_volume_shape(volelement.geometry)))
+    for found in map_chunks(process, n_cells, chunk_size, workers=workers):
+        for code, totals in found.items():
+            summed[code] = summed[code] + totals if code in summed else totals
+    codes = sorted(summed)
+    totals = np.array([summed[code] for code in codes]).reshape(-1, 3).T
+    if domain is None:
+        codes = [None]
+        if not len(totals[0]):
+            totals = np.zeros((3, 1))
+    return dict(domain=codes, **_table(totals))
+
+
+grade_tonnage.__displayname__ = "Grade Tonnage"
+reserve_summary.__displayname__ = "Reserve Summary"
@@ -0,0 +1,208 @@
+"""Bin the data of point sets (assays, geophysical readings) onto the cells of
+gridded volumes: the counts, means and extrema of the points in each cell.
+
+Example Use
+-----------
+
+The mean and maximum grade of the samples in each block of a block model:
+
+.. code-block:: python
+
+    import omf
+    import omfvista
+
+    project = omf.OMFReader('test_file.omf').get_project()
+    binned = omfvista.bin_points(
+        project.elements[0], project.elements[4].geometry, names=['CU_pct']
+    )
+    binned.data  # 'Point Count', 'CU_pct count', 'CU_pct mean', 'CU_pct max'
+
+Points are transformed into the coordinates of the grid (undoing the rotation
+by its axes) and located along each axis by division when its cells are
+regular, or with :func:`numpy.searchsorted` on the cell boundaries when
+their sizes vary.
+Points are handled in chunks: counts and sums are reduced with
+:func:`numpy.bincount` and extrema with :meth:`numpy.ufunc.at`, accumulating
+straight into one array per statistic, so memory grows with the grid rather
+than the number of points. Points outside of the grid and missing (NaN)
+values are left out.
+"""
+
+__all__ = [
+    "bin_points",
+]
+
+__displayname__ = "Binning"
+
+import numpy as np
+import omf
+
+from omfvista.utilities import is_pyvista_dataset
+from omfvista.volume import (
+    get_volume_edges,
+    get_volume_shape,
+    volume_to_grid_coordinates,
+    volume_to_vtk,
+)
+
+STATISTICS = ("count", "sum", "mean", "min", "max")
+OUTPUTS = ("element", "vtk")
+
+# The name of the number of points in each cell
+POINT_COUNT = "Point Count"
+
+# Number of points binned at a time
+CHUNK_SIZE = 2**22
+
+
+def _point_arrays(points, names):
+    """The points and the numeric data arrays of a point set element or a
+    data object
+    """
+    if is_pyvista_dataset(points):
+        arrays = {name: points.point_data[name] for name in points.point_data.keys()}
+        points = points.points
+    else:
+        arrays = {d.name: d.array.array for d in points.data if d.location == "vertices"}
+        points = points.geometry.vertices.array
+    points = np.asarray(points, dtype=float).reshape(-1, 3)
+    arrays = {name: np.asarray(arr) for name, arr in arrays.items()}
+    if names is None:
+        return points, {
+            name: arr for name, arr in arrays.items() if arr.ndim == 1 and arr.dtype.kind in "biuf"
+        }
+    missing = set(names) - set(arrays)
+    if missing:
+        raise KeyError("Point set has no data named {}".format(sorted(missing)))
+    for name in names:
+        if arrays[name].ndim != 1 or arrays[name].dtype.kind not in "biuf":
+            raise ValueError("Data ({}) must be a numeric scalar array.".format(name))
+    return points, {name: arrays[name] for name in names}
+
+
+def _locate(local, edges, shape):
+    """The flat (C order) cell id of each point given in grid coordinates
+    and whether it is inside of the grid
+    """
+    inside = np.ones(len(local), dtype=bool)
+    ids = np.zeros(len(local), dtype=np.intp)
+    for axis, u in enumerate(np.ascontiguousarray(local.T)):
+        bounds = edges[axis]
+        inside &= (u >= bounds[0]) & (u <= bounds[-1])
+        widths = np.diff(bounds)
+        # Points on the last boundary belong to the last cell
+        if np.all(widths == widths[0]):
+            # Regular cells are found by division rather than bisection
+            index = np.floor((u - bounds[0]) / widths[0])
+            index = np.clip(np.nan_to_num(index), 0, shape[axis] - 1).astype(np.intp)
+            # The division may round across a boundary: check against them
+            index -= u < bounds[index]
+            index += u >= bounds[index + 1]
+            index = np.clip(index, 0, shape[axis] - 1)
+        else:
+            index = np.searchsorted(bounds, u, side="right") - 1
+            index = np.clip(index, 0, shape[axis] - 1)
+        ids = ids * shape[axis] + index
+    return ids, inside
+
+
+def bin_points(
+    points,
+    volgeom,
+    names=None,
+    statistics=("count", "mean", "max"),
+    origin=(0.0, 0.0, 0.0),
+    output="element",
+    name=None,
+    chunk_size=CHUNK_SIZE,
+):
+    """Bin the data of a point set onto the cells of a gridded volume.
+
+    Args:
+        points (:class:`omf.pointset.PointSetElement` or :class:`pyvista.DataSet`):
+            the point set, or a data object with point data
+        volgeom (:class:`omf.volume.VolumeGridGeometry`): the grid to bin onto
+        names (list(str)): the names of the data arrays to bin. All numeric
+            scalar arrays are binned by default.
+        statistics (list(str)): the statistics of each array to compute, out
+            of ``"count"`` (of the values that are not missing), ``"sum"``,
+            ``"mean"``, ``"min"`` and ``"max"``
+        origin (tuple(float)): the origin of the project: the points of a
+            data object (converted with it) and the VTK output are shifted
+            by it
+        output (str): ``"element"`` for an :class:`omf.volume.VolumeElement`
+            or ``"vtk"`` for its converted grid (see
+            :func:`omfvista.volume_to_vtk`)
+        name (str): the name of the output element
+        chunk_size (int): the number of points binned at a time
+
+    Return:
+        :class:`omf.volume.VolumeElement` or :class:`pyvista.DataSet`: the
+        volume with cell data of the number of points in each cell
+        (``"Point Count"``) and of each statistic of each array (e.g.
+        ``"CU_pct mean"``). Statistics of cells without values are NaN.
+    """
+    for statistic in statistics:
+        if statistic not in STATISTICS:
+            raise ValueError(
+                "Statistic ({}) is not supported. Use any of {}".format(statistic, STATISTICS)
+            )
+    if output not in OUTPUTS:
+        raise ValueError("Output ({}) is not supported. Use one of {}".format(output, OUTPUTS))
+    if name is None:
+        name = getattr(points, "name", None) or "Binned Points"
+    if is_pyvista_dataset(points):
+        shift = np.array(origin, dtype=float)
+    else:
+        shift = np.zeros(3)
+    points, arrays = _point_arrays(points, names)
+    shape = get_volume_shape(volgeom)
+    edges = get_volume_edges(volgeom)
+    n_cells = int(np.prod(shape))
+
+    point_count = np.zeros(n_cells, dtype=np.int64)
+    counts = {key: np.zeros(n_cells, dtype=np.int64) for key in arrays}
+    sums = {key: np.zeros(n_cells) for key in arrays}
+    minima = {key: np.full(n_cells, np.inf) for key in arrays if "min" in statistics}
+    maxima = {key: np.full(n_cells, -np.inf) for key in arrays if "max" in statistics}
+    for start in range(0, len(points), chunk_size):
+        stop = start + chunk_size
+        local = volume_to_grid_coordinates(volgeom, points[start:stop], origin=shift)
+        ids, inside = _locate(local, edges, shape)
+        point_count += np.bincount(ids[inside], minlength=n_cells)
+        for key, arr in arrays.items():
+            values = np.asarray(arr[start:stop], dtype=float)
+            valid = inside & np.isfinite(values)
+            cells, values = ids[valid], values[valid]
+            counts[key] += np.bincount(cells, minlength=n_cells)
+            sums[key] += np.bincount(cells, weights=values, minlength=n_cells)
+            if key in minima:
+                np.minimum.at(minima[key], cells, values)
+            if key in maxima:
+                np.maximum.at(maxima[key], cells, values)
+
+    data = [omf.ScalarData(name=POINT_COUNT, location="cells", array=point_count)]
+    for key in arrays:
+        empty = counts[key] == 0
+        results = {"count": counts[key], "sum": sums[key]}
+        with np.errstate(invalid="ignore", divide="ignore"):
+            results["mean"] = np.where(empty, np.nan, sums[key] / counts[key])
+        if key in minima:
+            results["min"] = np.where(empty, np.nan, minima[key])
+        if key in maxima:
+            results["max"] = np.where(empty, np.nan, maxima[key])
+        for statistic in statistics:
+            data.append(
+                omf.ScalarData(
+                    name="{} {}".format(key, statistic),
+                    location="cells",
+                    array=results[statistic],
+                )
+            )
+    element = omf.VolumeElement(name=name, geometry=volgeom, data=data)
+    if output == "vtk":
+        return volume_to_vtk(element, origin=origin)
+    return element
+
+
+bin_points.__displayname__ = "Bin Points"
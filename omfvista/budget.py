@@ -0,0 +1,270 @@
+"""Plan the conversion of an OMF project file to fit in a memory budget.
+
+Example Use
+-----------
+
+Load a project in at most 4 GB, and see what had to give:
+
+.. code-block:: python
+
+    import omfvista
+
+    data, plan = omfvista.load_project('test_file.omf', max_memory=4 * 2**30)
+    plan['strategies'], plan['deferred']
+
+The size of each converted element is estimated from the JSON dictionary of
+the project (see :func:`omfvista.inspect`): the shapes of the grids, the
+number of vertices and cells and the dtype of each data array. OMF array
+pointers do not record the number of values of the compressed arrays, so
+the vertices and cells of point sets, line sets and surfaces are counted by
+streaming the decompression of the smallest array at each location, holding
+none of it (see :func:`omfvista.inspection.element_summary`). Textures are
+not counted, as their images are held by the texture cache under its own
+budget (see :mod:`omfvista.textures`). The budget covers the converted
+project plus the element being converted, whose OMF arrays are held
+alongside it, counted as the size of its converted blocks. Geometries shared
+by several elements (by UID) are counted once.
+
+While the estimate is over budget, strategies are applied in turn, from the
+cheapest to the most intrusive:
+
+1. ``"implicit"``: unrotated surface grids become flat
+   :class:`pyvista.RectilinearGrid` with an ``offset_w`` point array (see
+   :func:`omfvista.surface_grid_geom_to_vtk`)
+2. ``"float32"``: 64 bit float data arrays are downcast to 32 bit
+3. ``"attributes"``: data arrays are dropped, largest first, from the
+   largest elements, keeping the first array of each element
+4. ``"deferred"``: the largest elements are not converted. Their blocks are
+   left empty (``None``) to be loaded later (see
+   :meth:`omfvista.fileio.ProjectFile.iter_elements`).
+"""
+
+__all__ = [
+    "apply_plan",
+    "estimate_element",
+    "plan_project",
+]
+
+__displayname__ = "Budget"
+
+import numpy as np
+
+from omfvista.fileio import ProjectFile
+from omfvista.inspection import element_summary
+from omfvista.utilities import check_orientation
+
+# Bytes of a point (three 64 bit floats), a cell id and a texture coordinate
+POINT_BYTES = 24
+ID_BYTES = 8
+TCOORD_BYTES = 8
+
+# The number of points of each cell of the geometries with explicit cells
+CELL_POINTS = {
+    "PointSetGeometry": 1,
+    "LineSetGeometry": 2,
+    "SurfaceGeometry": 3,
+}
+
+
+def _unrotated(geom):
+    """Check if a grid geometry (as JSON) has the default axes"""
+    axis_u = np.array(geom.get("axis_u", (1.0, 0.0, 0.0)), dtype=float)
+    axis_v = np.array(geom.get("axis_v", (0.0, 1.0, 0.0)), dtype=float)
+    axis_w = np.array(geom.get("axis_w", np.cross(axis_u, axis_v)), dtype=float)
+    return check_orientation(axis_u, axis_v, axis_w)
+
+
+def _geometry_nbytes(summary, geom, implicit=False):
+    """Estimate the bytes of a converted geometry"""
+    kind = summary["geometry"]
+    n_points, n_cells = summary["n_points"], summary["n_cells"]
+    if kind in CELL_POINTS:
+        # Points plus the offsets and connectivity of the cells
+        return n_points * POINT_BYTES + ID_BYTES * (n_cells + 1 + n_cells * CELL_POINTS[kind])
+    coordinates = ID_BYTES * sum(n + 1 for n in summary["shape"])
+    if kind == "SurfaceGridGeometry" and implicit:
+        # The coordinates and the offset_w point array
+        return coordinates + ID_BYTES * n_points
+    if kind == "VolumeGridGeometry" and _unrotated(geom):
+        return coordinates
+    return n_points * POINT_BYTES
+
+
+def _array_nbytes(data, float32=False):
+    """Estimate the bytes of a converted data array"""
+    dtype = np.dtype(data["dtype"] or float)
+    if float32 and dtype == np.float64:
+        dtype = np.dtype(np.float32)
+    return data["length"] * data["components"] * dtype.itemsize
+
+
+def estimate_element(summary, geom, implicit=False, float32=False, dropped=()):
+    """Estimate the bytes of a converted element.
+
+    Args:
+        summary (dict): the summary of the element (see
+            :func:`omfvista.inspect`)
+        geom (dict): the JSON dictionary of the geometry of the element
+        implicit (bool): an unrotated surface grid is converted implicitly
+        float32 (bool): 64 bit float data arrays are downcast
+        dropped (list(str)): the names of the data arrays left out
+
+    Return:
+        tuple(int): the bytes of the geometry and of the data arrays (and
+        texture coordinates)
+    """
+    data = sum(
+        _array_nbytes(d, float32=float32) for d in summary["data"] if d["name"] not in dropped
+    )
+    data += len(summary["textures"]) * summary["n_points"] * TCOORD_BYTES
+    return _geometry_nbytes(summary, geom, implicit=implicit), data
+
+
+class _Entry(object):
+    """The plan of a single element"""
+
+    def __init__(self, summary, geom):
+        self.summary = summary
+        self.geom = geom
+        self.implicit = False
+        self.float32 = False
+        self.dropped = []
+        self.deferred = False
+        self._key = self._estimate = None
+        self.original = sum(self.estimate())
+
+    def estimate(self):
+        # Only estimate again once the plan of the element changed
+        key = (self.implicit, self.float32, len(self.dropped))
+        if key != self._key:
+            self._key = key
+            self._estimate = estimate_element(
+                self.summary, self.geom, self.implicit, self.float32, self.dropped
+            )
+        return self._estimate
+
+    def to_dict(self):
+        return {
+            "name": self.summary["name"],
+            "uid": self.summary["uid"],
+            "estimate": self.original,
+            "planned": 0 if self.deferred else sum(self.estimate()),
+            "implicit": self.implicit,
+            "float32": self.float32,
+            "dropped": list(self.dropped),
+            "deferred": self.deferred,
+        }
+
+
+def _total(entries):
+    """The estimated peak bytes of converting the elements that are not
+    deferred: every block plus the OMF arrays of the largest element
+    """
+    geometries, data, largest = {}, 0, 0
+    for entry in entries:
+        if entry.deferred:
+            continue
+        geometry, arrays = entry.estimate()
+        geometries[entry.summary["geometry_uid"]] = geometry
+        data += arrays
+        largest = max(largest, geometry + arrays)
+    return sum(geometries.values()) + data + largest
+
+
+def plan_project(filename, max_memory):
+    """Plan the conversion of a project file within a memory budget.
+
+    Args:
+        filename (str): the OMF project file
+        max_memory (int): the budget in bytes
+
+    Return:
+        dict: the ``max_memory``, the ``estimate`` (in bytes) of converting
+        the project as is and the ``planned`` estimate, the ``strategies``
+        that were applied, whether the plan ``fits``, the names of the
+        ``deferred`` elements and, for each of the ``elements``, its
+        ``name``, ``uid``, ``estimate``, ``planned`` estimate and whether it
+        is ``implicit``, ``float32``, ``deferred`` and which arrays were
+        ``dropped``
+    """
+    entries = []
+    with ProjectFile(filename) as pfile:
+        for uid in pfile.project["elements"]:
+            summary = element_summary(pfile, uid, bounds=False)
+            summary["geometry_uid"] = pfile.registry[uid]["geometry"]
+            entries.append(_Entry(summary, pfile.registry[summary["geometry_uid"]]))
+    estimate = _total(entries)
+    applied = []
+
+    def over():
+        return _total(entries) > max_memory
+
+    if over():
+        implicit = [
+            e
+            for e in entries
+            if e.summary["geometry"] == "SurfaceGridGeometry" and _unrotated(e.geom)
+        ]
+        for entry in implicit:
+            entry.implicit = True
+        if implicit:
+            applied.append("implicit")
+    if over():
+        downcast = [e for e in entries if any(d["dtype"] == "float64" for d in e.summary["data"])]
+        for entry in downcast:
+            entry.float32 = True
+        if downcast:
+            applied.append("float32")
+    largest = sorted(entries, key=lambda e: -sum(e.estimate()))
+    for entry in largest:
+        if not over():
+            break
+        data = sorted(
+            entry.summary["data"][1:], key=lambda d: -_array_nbytes(d, float32=entry.float32)
+        )
+        for d in data:
+            if not over():
+                break
+            entry.dropped.append(d["name"])
+            if "attributes" not in applied:
+                applied.append("attributes")
+    for entry in largest:
+        if not over():
+            break
+        entry.deferred = True
+        if "deferred" not in applied:
+            applied.append("deferred")
+    return {
+        "max_memory": max_memory,
+        "estimate": estimate,
+        "planned": _total(entries),
+        "strategies": applied,
+        "fits": not over(),
+        "deferred": [e.summary["name"] for e in entries if e.deferred],
+        "elements": [e.to_dict() for e in entries],
+    }
+
+
+def apply_plan(element, entry):
+    """Drop and downcast the data arrays of an OMF element as planned (see
+    :func:`plan_project`) before it is converted. The element is modified in
+    place.
+
+    Args:
+        element: the OMF element, freshly read from the project file
+        entry (dict): the plan of the element
+    """
+    if entry["dropped"]:
+        element.data = [d for d in element.data if d.name not in entry["dropped"]]
+    if entry["float32"]:
+        for data in element.data:
+            model = getattr(data, "array", None)
+            arr = getattr(model, "array", None)
+            if isinstance(arr, np.ndarray) and arr.dtype == np.float64:
+                data.array = type(model)(arr.astype(np.float32))
+    return element
+
+
+estimate_element.__displayname__ = "Estimate Element"
+plan_project.__displayname__ = "Plan Project"
+apply_plan.__displayname__ = "Apply Plan"
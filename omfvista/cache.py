@@ -0,0 +1,388 @@
+"""Methods to export converted OMF projects to an on-disk cache of VTK files
+that can be partially reloaded without decoding the OMF file again.
+
+Example Use
+-----------
+
+Export each element of a project to its own compressed VTK XML file alongside
+an ``index.json`` describing the elements:
+
+.. code-block:: python
+
+    import omfvista
+
+    cache = omfvista.export_project('test_file.omf', 'test_file_cache')
+
+Then, in any other process, only read the pieces that are needed:
+
+.. code-block:: python
+
+    import omfvista
+
+    cache = omfvista.ProjectCache('test_file_cache')
+    cache.names
+    cache.bounds('Topography')
+    topo = cache['Topography']
+
+Elements are looked up by name or by UID. Element names need not be unique
+in a project: looking up a name shared by several elements raises an error,
+and those elements are read by UID instead (see :attr:`ProjectCache.uids`).
+
+The cache directory also holds a ``project.vtm`` file referencing every piece
+so that it can be opened directly in ParaView.
+
+Every data array is written to the VTK files, including string arrays (like
+categorical labels). Statistics are only computed for numeric arrays: the
+``statistics`` of other arrays in the index are ``None``.
+"""
+
+__all__ = [
+    "ProjectCache",
+    "export_project",
+    "load_cache",
+]
+
+__displayname__ = "Cache"
+
+import json
+import os
+from xml.sax.saxutils import quoteattr
+
+import numpy as np
+import pyvista
+
+from omfvista.fileio import ProjectFile
+from omfvista.spatial import SpatialIndex, _indexable, build_spatial_index
+from omfvista.statistics import StatisticsIndex, array_statistics
+from omfvista.wrapper import wrap
+
+CACHE_FORMAT = "omfvista-cache"
+CACHE_VERSION = 1
+INDEX_FILENAME = "index.json"
+MULTIBLOCK_FILENAME = "project.vtm"
+SPATIAL_INDEX_EXTENSION = ".npz"
+
+# VTK XML file extensions for each of the data types omfvista produces
+EXTENSIONS = {
+    "PolyData": ".vtp",
+    "StructuredGrid": ".vts",
+    "RectilinearGrid": ".vtr",
+    "UnstructuredGrid": ".vtu",
+    "ImageData": ".vti",
+    "UniformGrid": ".vti",
+}
+
+
+def _array_entries(dataset):
+    """Describe the point and cell data arrays of a dataset (and their
+    statistics) for the index
+    """
+    entries = []
+    for association, arrays in (("point", dataset.point_data), ("cell", dataset.cell_data)):
+        for name in arrays.keys():
+            arr = arrays[name]
+            statistics = None
+            if arr.dtype.kind in "biuf":
+                statistics = array_statistics(arr, name, association)._asdict()
+            entries.append(
+                {
+                    "name": name,
+                    "association": association,
+                    "dtype": str(arr.dtype),
+                    "components": 1 if arr.ndim == 1 else int(arr.shape[1]),
+                    "statistics": statistics,
+                }
+            )
+    return entries
+
+
+def write_element(dataset, element, directory, position, checksum=None, spatial_index=False):
+    """Write a converted element to the cache directory and return its index
+    entry.
+
+    Args:
+        dataset (:class:`pyvista.DataSet`): the converted element
+        element (:class:`omf.base.ProjectElement`): the OMF element it came
+            from
+        directory (str): the cache directory
+        position (int): the position of the element in the project, used to
+            name the file on disk
+        checksum (str): the checksum of the element in its project file (see
+            :meth:`omfvista.fileio.ProjectFile.checksum`)
+        spatial_index (bool): also build and write the spatial index of point
+            sets and line sets (see :class:`omfvista.spatial.SpatialIndex`)
+
+    Return:
+        dict
+    """
+    key = dataset.__class__.__name__
+    try:
+        ext = EXTENSIONS[key]
+    except KeyError:
+        raise RuntimeError("Data of type ({}) cannot be cached currently.".format(key))
+    filename = "{:04d}{}".format(position, ext)
+    # VTK's XML writers compress the appended data in independent blocks
+    dataset.save(os.path.join(directory, filename))
+    index_filename = None
+    if spatial_index and _indexable(dataset):
+        index_filename = "{:04d}{}".format(position, SPATIAL_INDEX_EXTENSION)
+        build_spatial_index(dataset).save(os.path.join(directory, index_filename))
+    return {
+        "name": element.name,
+        "uid": str(element.uid),
+        "type": element.__class__.__name__,
+        "file": filename,
+        "checksum": checksum,
+        "spatial_index": index_filename,
+        "dataset": key,
+        "bounds": [float(b) for b in dataset.bounds],
+        "n_points": int(dataset.n_points),
+        "n_cells": int(dataset.n_cells),
+        "arrays": _array_entries(dataset),
+    }
+
+
+def _write_multiblock(directory, entries):
+    """Write a ``.vtm`` file that references each of the cached pieces"""
+    lines = [
+        '<?xml version="1.0"?>',
+        '<VTKFile type="vtkMultiBlockDataSet" version="1.0" byte_order="LittleEndian">',
+        "  <vtkMultiBlockDataSet>",
+    ]
+    for i, entry in enumerate(entries):
+        lines.append(
+            '    <DataSet index="{:d}" name={} file={}/>'.format(
+                i, quoteattr(entry["name"]), quoteattr(entry["file"])
+            )
+        )
+    lines += ["  </vtkMultiBlockDataSet>", "</VTKFile>", ""]
+    with open(os.path.join(directory, MULTIBLOCK_FILENAME), "w") as f:
+        f.write("\n".join(lines))
+
+
+def write_index(directory, project, entries):
+    """Write the ``index.json`` and ``project.vtm`` files for a cache
+    directory.
+
+    Args:
+        directory (str): the cache directory
+        project (:class:`omf.base.Project` or :class:`omfvista.fileio.ProjectFile`):
+            the project that was exported
+        entries (list(dict)): the element entries from :func:`write_element`
+    """
+    index = {
+        "format": CACHE_FORMAT,
+        "version": CACHE_VERSION,
+        "name": project.name,
+        "uid": str(project.uid),
+        "origin": [float(o) for o in project.origin],
+        "elements": entries,
+    }
+    with open(os.path.join(directory, INDEX_FILENAME), "w") as f:
+        json.dump(index, f, indent=2)
+    _write_multiblock(directory, entries)
+
+
+def filter_arrays(dataset, element, attributes):
+    """Remove the converted OMF data arrays of an element that are not in
+    ``attributes``. Arrays that omfvista generates itself (like the
+    ``"Line Index"`` of a line set) are kept.
+    """
+    for d in element.data:
+        if d.name not in attributes:
+            dataset.point_data.pop(d.name, None)
+            dataset.cell_data.pop(d.name, None)
+    return dataset
+
+
+def convert_elements(project, elements=None, attributes=None):
+    """Convert the selected elements of an OMF project one at a time.
+
+    Args:
+        project (:class:`omf.base.Project` or :class:`omfvista.fileio.ProjectFile`):
+            the project to convert. The elements of a project file are read
+            one at a time.
+        elements (list(str)): the names of the elements to convert. All
+            elements are converted by default.
+        attributes (list(str)): the names of the data arrays to keep. All
+            data arrays are kept by default.
+
+    Yields:
+        tuple: the position of the element in the project, the OMF element
+        and its converted VTK data object
+    """
+    origin = np.array(project.origin)
+    if isinstance(project, ProjectFile):
+        selected = project.iter_elements(names=elements)
+    else:
+        selected = (
+            (i, e) for i, e in enumerate(project.elements) if elements is None or e.name in elements
+        )
+    for i, e in selected:
+        d = wrap(e, origin=origin)
+        if attributes is not None:
+            filter_arrays(d, e, attributes)
+        yield i, e, d
+
+
+def export_project(project, directory, elements=None, attributes=None, spatial_index=False):
+    """Convert each element of an OMF project and write it to its own
+    compressed VTK file in ``directory`` together with an index of the
+    element names, bounds and attribute lists.
+
+    Elements are converted and written one at a time so that only a single
+    converted element is held in memory.
+
+    Args:
+        project (str or :class:`omf.base.Project`): the OMF project file or
+            project to export. The elements of a project file are read and
+            converted one at a time.
+        directory (str): the directory to write the cache to. It is created
+            if it does not exist.
+        elements (list(str)): the names of the elements to export. All
+            elements are exported by default.
+        attributes (list(str)): the names of the data arrays to keep. All
+            data arrays are kept by default.
+        spatial_index (bool): also build and write the spatial index of each
+            point set and line set
+
+    Return:
+        :class:`omfvista.cache.ProjectCache`
+    """
+    os.makedirs(directory, exist_ok=True)
+    if isinstance(project, str):
+        with ProjectFile(project) as pfile:
+            return export_project(
+                pfile,
+                directory,
+                elements=elements,
+                attributes=attributes,
+                spatial_index=spatial_index,
+            )
+    entries = []
+    for i, e, d in convert_elements(project, elements=elements, attributes=attributes):
+        checksum = None
+        if isinstance(project, ProjectFile):
+            checksum = project.checksum(str(e.uid))
+        entries.append(
+            write_element(d, e, directory, i, checksum=checksum, spatial_index=spatial_index)
+        )
+    write_index(directory, project, entries)
+    return ProjectCache(directory)
+
+
+class ProjectCache(object):
+    """A project exported with :func:`export_project`. Elements are only read
+    from disk when they are accessed.
+
+    Args:
+        directory (str): the cache directory
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+        with open(os.path.join(directory, INDEX_FILENAME), "r") as f:
+            self.index = json.load(f)
+        if self.index.get("format") != CACHE_FORMAT:
+            raise ValueError("({}) is not an omfvista cache.".format(directory))
+        self._entries = {entry["uid"]: entry for entry in self.index["elements"]}
+        self._uids = {}
+        for entry in self.index["elements"]:
+            self._uids.setdefault(entry["name"], []).append(entry["uid"])
+
+    def __repr__(self):
+        return "<ProjectCache {!r} ({:d} elements)>".format(self.directory, len(self))
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, name):
+        return name in self._entries or name in self._uids
+
+    def __iter__(self):
+        return iter(self.names)
+
+    def __getitem__(self, name):
+        return pyvista.read(self.filename(name))
+
+    @property
+    def names(self):
+        """The names of the cached elements in project order"""
+        return [entry["name"] for entry in self.index["elements"]]
+
+    @property
+    def uids(self):
+        """The UIDs of the cached elements in project order"""
+        return [entry["uid"] for entry in self.index["elements"]]
+
+    def keys(self):
+        """The names of the cached elements (like :meth:`pyvista.MultiBlock.keys`)"""
+        return self.names
+
+    def entry(self, name):
+        """Get the index entry of an element by UID or by name. Names shared
+        by several elements are ambiguous and raise a ``ValueError``.
+        """
+        if name in self._entries:
+            return self._entries[name]
+        uids = self._uids.get(name)
+        if not uids:
+            raise KeyError("Element ({}) is not in the cache.".format(name))
+        if len(uids) > 1:
+            raise ValueError(
+                "Element name ({}) is ambiguous: use one of the UIDs {}".format(name, uids)
+            )
+        return self._entries[uids[0]]
+
+    def filename(self, name):
+        """Get the path to the file holding an element"""
+        return os.path.join(self.directory, self.entry(name)["file"])
+
+    def bounds(self, name):
+        """Get the bounds of an element without reading it"""
+        return tuple(self.entry(name)["bounds"])
+
+    def arrays(self, name):
+        """Get the names of the data arrays of an element without reading it"""
+        return [array["name"] for array in self.entry(name)["arrays"]]
+
+    def statistics(self):
+        """The bounds and array statistics of the cached elements (see
+        :class:`omfvista.statistics.StatisticsIndex`), read from the index
+        """
+        elements = [
+            dict(entry, arrays=[a["statistics"] for a in entry["arrays"] if a["statistics"]])
+            for entry in self.index["elements"]
+        ]
+        return StatisticsIndex.from_dict({"elements": elements})
+
+    def spatial_index(self, name):
+        """Read the spatial index of an element (see
+        :class:`omfvista.spatial.SpatialIndex`) without reading the element
+        """
+        filename = self.entry(name).get("spatial_index")
+        if filename is None:
+            raise KeyError("Element ({}) has no cached spatial index.".format(name))
+        return SpatialIndex.load(os.path.join(self.directory, filename))
+
+    def load(self, names=None):
+        """Read the given elements (all by default, by name or UID) into a
+        :class:`pyvista.MultiBlock`
+        """
+        if names is None:
+            names = self.uids
+        data = pyvista.MultiBlock()
+        for name in names:
+            data.append(self[name], self.entry(name)["name"])
+        return data
+
+
+def load_cache(directory, names=None):
+    """Loads the elements of a cache directory written by
+    :func:`export_project` into a :class:`pyvista.MultiBlock` dataset
+    """
+    return ProjectCache(directory).load(names=names)
+
+
+export_project.__displayname__ = "Export Project"
+load_cache.__displayname__ = "Load Cache"
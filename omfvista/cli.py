@@ -0,0 +1,335 @@
+"""Command line interface to batch convert OMF project files to VTK formats.
+
+Example Use
+-----------
+
+Convert every ``.omf`` file in a directory using four worker processes:
+
+.. code-block:: bash
+
+    omfvista nightly/ -o converted/ -j 4
+
+Convert the elements of a single large project in parallel and only keep a
+couple of its attributes:
+
+.. code-block:: bash
+
+    omfvista project.omf -o converted/ --split-elements -a CU_pct -a DENSITY
+
+The same conversion is available from Python with :func:`convert_files`.
+"""
+
+__all__ = [
+    "convert_files",
+    "main",
+]
+
+__displayname__ = "Command Line Interface"
+
+import argparse
+import glob
+import multiprocessing
+import os
+import sys
+import time
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+FORMATS = ("cache", "vtm")
+
+
+def _peak_memory():
+    """The peak resident memory of this process in bytes (if available)"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform == "darwin":
+        return peak
+    return peak * 1024
+
+
+def output_path(filename, output, file_format="cache"):
+    """The path a converted project file is written to"""
+    stem = os.path.splitext(os.path.basename(filename))[0]
+    if file_format == "vtm":
+        return os.path.join(output, stem + ".vtm")
+    return os.path.join(output, stem)
+
+
+def _convert_file(filename, path, file_format, elements, attributes):
+    """Convert a whole project file"""
+    import pyvista
+
+    from omfvista.cache import convert_elements, export_project
+    from omfvista.fileio import ProjectFile
+
+    if file_format == "vtm":
+        data = pyvista.MultiBlock()
+        with ProjectFile(filename) as pfile:
+            for _, e, d in convert_elements(pfile, elements=elements, attributes=attributes):
+                data[e.name] = d
+        data.save(path)
+    else:
+        export_project(filename, path, elements=elements, attributes=attributes)
+    return None
+
+
+def _convert_element(filename, directory, position, uid, attributes):
+    """Convert a single element of a project file into a cache directory"""
+    import numpy as np
+
+    from omfvista.cache import filter_arrays, write_element
+    from omfvista.fileio import ProjectFile
+    from omfvista.wrapper import wrap
+
+    with ProjectFile(filename) as pfile:
+        element = pfile.read_element(uid)
+        origin = np.array(pfile.origin)
+        checksum = pfile.checksum(uid)
+    d = wrap(element, origin=origin)
+    if attributes is not None:
+        filter_arrays(d, element, attributes)
+    return write_element(d, element, directory, position, checksum=checksum)
+
+
+def _run(job):
+    """Worker: run a conversion job and time it"""
+    kind, name, args = job
+    tic = time.time()
+    entry, error = None, None
+    try:
+        if kind == "element":
+            entry = _convert_element(*args)
+        else:
+            _convert_file(*args)
+    except Exception as e:  # report the failure and carry on with the batch
+        error = "{}: {}".format(e.__class__.__name__, e)
+    return {
+        "name": name,
+        "seconds": time.time() - tic,
+        "peak_memory": _peak_memory(),
+        "error": error,
+        "entry": entry,
+    }
+
+
+def _run_indexed(item):
+    """Worker: run a job and keep track of its position"""
+    i, job = item
+    return i, _run(job)
+
+
+def _element_jobs(filename, directory, elements, attributes):
+    """Make a job for each selected element of a project file"""
+    from omfvista.fileio import ProjectFile
+
+    with ProjectFile(filename) as project:
+        jobs = []
+        for i, uid in enumerate(project.project["elements"]):
+            element_name = project.registry[uid].get("name", "")
+            if elements is not None and element_name not in elements:
+                continue
+            name = "{}:{}".format(os.path.basename(filename), element_name)
+            jobs.append(("element", name, (filename, directory, i, uid, attributes)))
+    return project, jobs
+
+
+def find_files(paths):
+    """Expand the given paths to a sorted list of OMF files. Directories are
+    searched for ``*.omf`` files.
+    """
+    filenames = []
+    for path in paths:
+        if os.path.isdir(path):
+            filenames += sorted(glob.glob(os.path.join(path, "*.omf")))
+        else:
+            filenames.append(path)
+    return filenames
+
+
+def convert_files(
+    filenames,
+    output,
+    file_format="cache",
+    elements=None,
+    attributes=None,
+    processes=None,
+    split_elements=False,
+    progress=None,
+):
+    """Convert many OMF project files with a pool of worker processes.
+
+    Each job runs in a fresh worker process so that the reported peak memory
+    belongs to that job alone.
+
+    Args:
+        filenames (list(str)): the OMF project files to convert
+        output (str): the directory to write the converted files to
+        file_format (str): ``"cache"`` writes a directory per project (see
+            :func:`omfvista.cache.export_project`) and ``"vtm"`` writes a
+            single VTK MultiBlock file per project
+        elements (list(str)): the names of the elements to convert. All
+            elements are converted by default.
+        attributes (list(str)): the names of the data arrays to keep. All
+            data arrays are kept by default.
+        processes (int): the number of worker processes. Defaults to the
+            number of CPUs.
+        split_elements (bool): convert the elements of each file in separate
+            jobs rather than a job per file. Only supported for the
+            ``"cache"`` format.
+        progress (callable): called with ``(done, total, result)`` after each
+            job completes
+
+    Return:
+        list(dict): the name, time in ``seconds``, ``peak_memory`` in bytes
+        and ``error`` message (if any) of each job
+    """
+    if file_format not in FORMATS:
+        raise ValueError("Format ({}) is not supported. Use one of {}".format(file_format, FORMATS))
+    if split_elements and file_format != "cache":
+        raise ValueError("Elements can only be split across jobs with the 'cache' format.")
+    os.makedirs(output, exist_ok=True)
+    jobs, projects = [], []
+    for filename in filenames:
+        path = output_path(filename, output, file_format)
+        if split_elements:
+            os.makedirs(path, exist_ok=True)
+            project, element_jobs = _element_jobs(filename, path, elements, attributes)
+            projects.append((path, project, len(jobs), len(element_jobs)))
+            jobs += element_jobs
+        else:
+            args = (filename, path, file_format, elements, attributes)
+            jobs.append(("file", filename, args))
+    results = [None] * len(jobs)
+    pool = multiprocessing.Pool(processes=processes, maxtasksperchild=1)
+    try:
+        ordered = pool.imap_unordered(_run_indexed, list(enumerate(jobs)))
+        for done, (i, result) in enumerate(ordered, start=1):
+            results[i] = result
+            if progress is not None:
+                progress(done, len(jobs), result)
+    finally:
+        pool.close()
+        pool.join()
+    if split_elements:
+        from omfvista.cache import write_index
+
+        for path, project, start, count in projects:
+            entries = [r["entry"] for r in results[start : start + count] if r["error"] is None]
+            write_index(path, project, entries)
+    for result in results:
+        result.pop("entry")
+    return results
+
+
+def _format_memory(nbytes):
+    """Human readable memory size"""
+    if nbytes is None:
+        return "n/a"
+    return "{:.1f} MB".format(nbytes / 1024.0**2)
+
+
+def _print_progress(done, total, result):
+    """Report a completed job on stderr"""
+    status = "ok" if result["error"] is None else "FAILED ({})".format(result["error"])
+    print(
+        "[{}/{}] {}  {:.2f} s  {}  {}".format(
+            done,
+            total,
+            result["name"],
+            result["seconds"],
+            _format_memory(result["peak_memory"]),
+            status,
+        ),
+        file=sys.stderr,
+    )
+
+
+def _print_summary(results, seconds):
+    """Print a table of the per-job timings and peak memory"""
+    width = max([len(r["name"]) for r in results] + [4])
+    print("{:<{w}}  {:>10}  {:>12}  {}".format("Name", "Time", "Peak Memory", "Status", w=width))
+    for r in results:
+        print(
+            "{:<{w}}  {:>8.2f} s  {:>12}  {}".format(
+                r["name"],
+                r["seconds"],
+                _format_memory(r["peak_memory"]),
+                "ok" if r["error"] is None else "FAILED",
+                w=width,
+            )
+        )
+    failed = sum(r["error"] is not None for r in results)
+    print(
+        "{} jobs ({} failed) in {:.2f} s of wall time ({:.2f} s of work)".format(
+            len(results), failed, seconds, sum(r["seconds"] for r in results)
+        )
+    )
+
+
+def main(argv=None):
+    """Entry point of the ``omfvista`` command"""
+    parser = argparse.ArgumentParser(
+        prog="omfvista",
+        description="Batch convert OMF project files to VTK formats.",
+    )
+    parser.add_argument("paths", nargs="+", help="OMF files or directories of OMF files")
+    parser.add_argument(
+        "-o", "--output", default=".", help="directory to write the converted files to"
+    )
+    parser.add_argument(
+        "-f",
+        "--format",
+        dest="file_format",
+        choices=FORMATS,
+        default="cache",
+        help="'cache' writes an indexed directory of VTK pieces per file and "
+        "'vtm' writes a single VTK MultiBlock per file (default: cache)",
+    )
+    parser.add_argument(
+        "-e",
+        "--element",
+        dest="elements",
+        action="append",
+        help="only convert the element with this name (repeatable)",
+    )
+    parser.add_argument(
+        "-a",
+        "--attribute",
+        dest="attributes",
+        action="append",
+        help="only keep the data array with this name (repeatable)",
+    )
+    parser.add_argument(
+        "-j", "--processes", type=int, default=None, help="number of worker processes"
+    )
+    parser.add_argument(
+        "--split-elements",
+        action="store_true",
+        help="convert the elements of each file in separate jobs",
+    )
+    parser.add_argument("-q", "--quiet", action="store_true", help="do not report progress")
+    args = parser.parse_args(argv)
+
+    filenames = find_files(args.paths)
+    if not filenames:
+        parser.error("no OMF files found")
+    tic = time.time()
+    results = convert_files(
+        filenames,
+        args.output,
+        file_format=args.file_format,
+        elements=args.elements,
+        attributes=args.attributes,
+        processes=args.processes,
+        split_elements=args.split_elements,
+        progress=None if args.quiet else _print_progress,
+    )
+    _print_summary(results, time.time() - tic)
+    return int(any(r["error"] is not None for r in results))
+
+
+convert_files.__displayname__ = "Convert Files"
@@ -0,0 +1,216 @@
+"""Composite the interval data of drillholes (line sets) to fixed lengths or
+domain boundaries.
+
+Example Use
+-----------
+
+Length weighted averages of the assays of each hole over 2 m intervals:
+
+.. code-block:: python
+
+    import omfvista
+
+    data = omfvista.load_project('wolfpass.omf')
+    composites = omfvista.composite_line_set(data['wolfpass_WP_assay'], length=2.0)
+
+or over the runs of intervals sharing a lithology code (split into pieces of
+at most 10 m):
+
+.. code-block:: python
+
+    composites = omfvista.composite_line_set(
+        data['wolfpass_WP_assay'], length=10.0, domain='Lithology'
+    )
+
+Each hole is a group of segments with the same ``"Line Index"`` (the
+connected lines numbered by :func:`omfvista.line_set_to_vtk`) or with the
+same value of another cell array identifying the holes, ordered downhole in
+the order they are stored. Segments run from their first vertex to their
+second and gaps between consecutive segments of a hole count as unsampled.
+
+All holes are composited at once: the segments of every hole are laid end to
+end along a single downhole axis on which the cumulative integral of each
+array (and of the sampled length) is piecewise linear, so the average over any
+interval is the difference of two :func:`numpy.interp` lookups.
+"""
+
+__all__ = [
+    "composite_line_set",
+]
+
+__displayname__ = "Compositing"
+
+import numpy as np
+import pyvista
+
+LINE_INDEX = "Line Index"
+
+# Space left between holes along the downhole axis so that they never touch
+HOLE_SEPARATION = 1.0
+
+
+def _segments(dataset, hole):
+    """The segments of a line set in downhole order and their hole"""
+    if hole not in dataset.cell_data:
+        raise ValueError("The line set has no '{}' cell array.".format(hole))
+    lines = dataset.lines.reshape(-1, 3)
+    if len(lines) != dataset.n_cells or np.any(lines[:, 0] != 2):
+        raise ValueError("The line set must only hold two point segments.")
+    holes = np.asarray(dataset.cell_data[hole])
+    order = np.argsort(holes, kind="stable")
+    return order, lines[order, 1:], holes[order]
+
+
+def _downhole_axis(starts, ends, holes):
+    """Lay the segments end to end along a single axis.
+
+    Return:
+        tuple: the position of the start and end of each segment along the
+        axis, the length of each segment and the position of the collar of
+        its hole
+    """
+    lengths = np.linalg.norm(ends - starts, axis=1)
+    steps = np.empty(len(lengths))
+    steps[:1] = 0.0
+    # The gap from the end of the previous segment of the same hole
+    steps[1:] = np.linalg.norm(starts[1:] - ends[:-1], axis=1)
+    new_hole = np.r_[True, holes[1:] != holes[:-1]]
+    steps[new_hole] = HOLE_SEPARATION
+    steps += lengths
+    to = np.cumsum(steps)
+    top = to - lengths
+    first = np.maximum.accumulate(np.where(new_hole, np.arange(len(holes)), 0))
+    return top, to, lengths, top[first]
+
+
+def _interleave(a, b):
+    """Interleave two arrays of the same length"""
+    out = np.empty((2 * len(a),) + np.shape(a)[1:], dtype=np.result_type(a, b))
+    out[0::2] = a
+    out[1::2] = b
+    return out
+
+
+def _spans(starts, ends, keys):
+    """The range along the axis of each run of consecutive segments with the
+    same key
+    """
+    new = np.r_[True, np.any(keys[1:] != keys[:-1], axis=1)]
+    first = np.flatnonzero(new)
+    last = np.r_[first[1:], len(keys)] - 1
+    return starts[first], ends[last], first
+
+
+def _split(lower, upper, length):
+    """Split each span into intervals of (at most) ``length``
+
+    Return:
+        tuple: the bounds of the intervals and the span of each interval
+    """
+    counts = np.maximum(np.ceil((upper - lower) / length).astype(np.int_), 1)
+    span = np.repeat(np.arange(len(lower)), counts)
+    k = np.arange(len(span)) - np.repeat(np.cumsum(counts) - counts, counts)
+    a = lower[span] + k * length
+    b = np.minimum(a + length, upper[span])
+    return a, b, span
+
+
+def _locate(axis, starts, ends, at):
+    """The points at positions along the axis"""
+    return np.column_stack(
+        [np.interp(at, axis, _interleave(starts[:, c], ends[:, c])) for c in range(3)]
+    )
+
+
+def _integrate(axis, values, lengths, a, b):
+    """Length weighted averages of segment values over intervals"""
+    sampled = np.isfinite(values)
+    weights = np.where(sampled, lengths, 0.0)
+    amounts = np.where(sampled, values, 0.0) * weights
+    total = np.cumsum(amounts)
+    total_weight = np.cumsum(weights)
+    integral = _interleave(total - amounts, total)
+    covered = _interleave(total_weight - weights, total_weight)
+    weight = np.interp(b, axis, covered) - np.interp(a, axis, covered)
+    amount = np.interp(b, axis, integral) - np.interp(a, axis, integral)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where(weight > 0, amount / weight, np.nan), weight
+
+
+def composite_line_set(dataset, length=None, domain=None, arrays=None, hole=LINE_INDEX):
+    """Composite the segment (cell) data of a line set into length weighted
+    averages over fixed length intervals and/or domain runs of each hole.
+
+    Args:
+        dataset (:class:`pyvista.PolyData`): a line set converted by
+            :func:`omfvista.line_set_to_vtk`
+        length (float): the length of the composites. Composites restart at
+            the top of each hole (or domain run) and the last composite of
+            each may be shorter.
+        domain (str): the name of a cell array of domain codes. Composites
+            break wherever the domain changes down a hole.
+        arrays (list(str)): the names of the cell arrays to composite. All
+            numeric cell arrays are composited by default. Missing values
+            (NaN) are left out of the averages.
+        hole (str): the name of the cell array identifying the hole of each
+            segment. Defaults to the ``"Line Index"`` of connected segments,
+            so use a hole ID array when holes have gaps.
+
+    Return:
+        :class:`pyvista.PolyData`: a segment per composite with the
+        composited arrays, its hole (``"Line Index"``), the ``"From"`` and ``"To"``
+        distance down its hole, the ``"Sampled Length"`` and (if given) its
+        domain
+    """
+    if length is None and domain is None:
+        raise ValueError("Give a composite length and/or a domain.")
+    if length is not None and length <= 0:
+        raise ValueError("The composite length must be positive.")
+    order, ids, holes = _segments(dataset, hole)
+    points = np.asarray(dataset.points, dtype=float)
+    starts, ends = points[ids[:, 0]], points[ids[:, 1]]
+    tops, bottoms, lengths, collars = _downhole_axis(starts, ends, holes)
+    axis = _interleave(tops, bottoms)
+    if arrays is None:
+        arrays = [
+            name
+            for name in dataset.cell_data.keys()
+            if name not in (LINE_INDEX, hole, domain)
+            and np.asarray(dataset.cell_data[name]).dtype.kind in "biuf"
+        ]
+
+    # Break at holes (and domains)
+    keys = holes[:, None]
+    if domain is not None:
+        codes = np.asarray(dataset.cell_data[domain])[order]
+        keys = np.c_[holes, codes.reshape(len(codes), -1)]
+    lower, upper, first = _spans(tops, bottoms, keys)
+    if length is None:
+        a, b, span = lower, upper, np.arange(len(lower))
+    else:
+        a, b, span = _split(lower, upper, length)
+    segment = first[span]
+
+    n = len(a)
+    output = pyvista.PolyData()
+    output.points = _interleave(_locate(axis, starts, ends, a), _locate(axis, starts, ends, b))
+    output.lines = np.c_[np.full(n, 2), np.arange(0, 2 * n, 2), np.arange(1, 2 * n, 2)].ravel()
+    for name in arrays:
+        values = np.asarray(dataset.cell_data[name], dtype=float)[order]
+        if values.ndim == 1:
+            composited = _integrate(axis, values, lengths, a, b)[0]
+        else:
+            composited = np.column_stack(
+                [_integrate(axis, values[:, c], lengths, a, b)[0] for c in range(values.shape[1])]
+            )
+        output.cell_data[name] = composited
+    output.cell_data[hole] = holes[segment]
+    output.cell_data["From"] = a - collars[segment]
+    output.cell_data["To"] = b - collars[segment]
+    output.cell_data["Sampled Length"] = _integrate(axis, np.zeros(len(lengths)), lengths, a, b)[1]
+    if domain is not None:
+        output.cell_data[domain] = codes[segment]
+    return output
+
+
+composite_line_set.__displayname__ = "Composite Line Set"
@@ -0,0 +1,336 @@
+"""Low level access to the contents of OMF project files without building the
+``omf`` object model.
+
+An OMF file starts with a 60 byte header, followed by a binary blob of zlib
+compressed arrays and a JSON dictionary of every object in the project keyed
+by UID (see :class:`omf.fileio.OMFWriter`). Arrays in the JSON are pointers to
+their compressed data in the binary blob.
+
+Example Use
+-----------
+
+Read an element, decompressing its arrays in parallel threads:
+
+.. code-block:: python
+
+    from omfvista.fileio import ProjectFile
+
+    with ProjectFile('test_file.omf') as pfile:
+        element = pfile.read_element(pfile.project['elements'][0], workers=4)
+
+``omf`` decompresses each array in turn as it builds the object model. With
+``workers``, the compressed bytes of the numeric arrays of an element are
+read in file order, the object model is built without them and the arrays
+are then decompressed (zlib releases the GIL), shaped and validated in a
+thread pool before being set on their models.
+"""
+
+__all__ = [
+    "ProjectFile",
+]
+
+__displayname__ = "File IO"
+
+from concurrent.futures import ThreadPoolExecutor
+import hashlib
+import json
+import struct
+import uuid
+import zlib
+
+import numpy as np
+
+MAGIC = b"\x84\x83\x82\x81"
+COMPATIBILITY_VERSION = b"OMF-v0.9.0"
+HEADER_LENGTH = 60
+
+# Number of compressed bytes to read at a time when streaming an array
+CHUNK_SIZE = 2**20
+
+# The dtypes of the numeric arrays of OMF (images are left to ``omf``)
+ARRAY_DTYPES = ("<i8", "<f8")
+
+# Keys that change when a project is re-exported without changing its content
+VOLATILE_KEYS = ("uid", "date_created", "date_modified")
+
+
+def is_array_index(value):
+    """Check if a JSON value points to an array in the binary blob"""
+    return isinstance(value, dict) and "start" in value and "length" in value
+
+
+class ProjectFile(object):
+    """An open OMF project file. Reads the header and the JSON dictionary of
+    the project on init; arrays are only read on request.
+
+    Args:
+        filename (str or file): the OMF project file (or a file object opened
+            in binary mode)
+    """
+
+    def __init__(self, filename):
+        if isinstance(filename, str):
+            self._fopen = open(filename, "rb")
+            self._owner = True
+        else:
+            self._fopen = filename
+            self._owner = False
+        self.uid, self._json_start = self.read_header()
+        self.registry = self.read_json()
+        # The number of values of the arrays counted so far, by start
+        self._sizes = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+        return False
+
+    def close(self):
+        """Close the file (if this object opened it)"""
+        if self._owner and not self._fopen.closed:
+            self._fopen.close()
+
+    def read_header(self):
+        """Checks magic number and version; gets project uid and json start"""
+        self._fopen.seek(0, 0)
+        header = self._fopen.read(HEADER_LENGTH)
+        if len(header) != HEADER_LENGTH or header[0:4] != MAGIC:
+            raise ValueError("Invalid OMF file")
+        version = struct.unpack("<32s", header[4:36])[0][0 : len(COMPATIBILITY_VERSION)]
+        if version != COMPATIBILITY_VERSION:
+            raise ValueError(
+                "Version mismatch: file version {}, reader version {}".format(
+                    version, COMPATIBILITY_VERSION
+                )
+            )
+        uid = uuid.UUID(bytes=struct.unpack("<16s", header[36:52])[0])
+        json_start = struct.unpack("<Q", header[52:60])[0]
+        return str(uid), json_start
+
+    def read_json(self):
+        """Gets json dictionary from project file"""
+        self._fopen.seek(self._json_start, 0)
+        return json.loads(self._fopen.read().decode("utf-8"))
+
+    @property
+    def project(self):
+        """The JSON dictionary of the project"""
+        return self.registry[self.uid]
+
+    @property
+    def name(self):
+        """The name of the project"""
+        return self.project.get("name", "")
+
+    @property
+    def origin(self):
+        """The origin of the project"""
+        return tuple(self.project.get("origin", (0.0, 0.0, 0.0)))
+
+    @property
+    def elements(self):
+        """The JSON dictionaries of the project elements in project order"""
+        return [self.registry[uid] for uid in self.project["elements"]]
+
+    def _deserialize(self, uid, registry, workers=None):
+        """Build the ``omf`` object model of a UID from a copy of the registry,
+        decompressing its numeric arrays in ``workers`` threads if given
+        """
+        import omf
+
+        if workers is None or workers <= 1:
+            return omf.base.UidModel.deserialize(uid=uid, registry=registry, open_file=self._fopen)
+        arrays = self.array_indices(uid, registry)
+        # Read in file order (file objects are not thread safe) and leave the
+        # arrays out of the models until they are decompressed
+        compressed = {}
+        for ref, key, index in sorted(arrays, key=lambda a: a[2]["start"]):
+            compressed[ref, key] = self.read_compressed(index)
+        for ref in {ref for ref, _, _ in arrays}:
+            registry[ref] = dict(registry[ref])
+        for ref, key, _ in arrays:
+            del registry[ref][key]
+        model = omf.base.UidModel.deserialize(uid=uid, registry=registry, open_file=self._fopen)
+
+        def decompress(item):
+            ref, key, index = item
+            prop = type(registry[ref])._props[key]
+            # zlib streams do not record their size, so the arrays can not be
+            # decompressed into preallocated buffers: wrap the decompressed
+            # bytes, which validation copies once into a writable array
+            arr = np.frombuffer(zlib.decompress(compressed.pop((ref, key))), index["dtype"])
+            (shape,) = prop.shape
+            arr = arr.reshape([-1 if dim == "*" else dim for dim in shape])
+            return prop.validate(registry[ref], arr)
+
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            for (ref, key, _), arr in zip(arrays, pool.map(decompress, arrays)):
+                registry[ref]._backend[key] = arr
+        return model
+
+    def array_indices(self, uid, registry=None):
+        """Find the numeric arrays of an object and of everything it
+        references.
+
+        Return:
+            list(tuple): the UID of the object holding each array, the key of
+            the array and its index in the binary blob
+        """
+        registry = self.registry if registry is None else registry
+        found, seen, stack = [], set(), [uid]
+        while stack:
+            ref = stack.pop()
+            if ref in seen or not isinstance(registry.get(ref), dict):
+                continue
+            seen.add(ref)
+            for key, value in registry[ref].items():
+                if is_array_index(value) and value.get("dtype") in ARRAY_DTYPES:
+                    found.append((ref, key, value))
+                    continue
+                for value in value if isinstance(value, list) else [value]:
+                    if isinstance(value, str) and value in registry:
+                        stack.append(value)
+        return found
+
+    def read_element(self, uid, workers=None):
+        """Read a single element (:class:`omf.base.ProjectElement`) and its
+        arrays. Nothing is shared with previously read elements, so the arrays
+        of an element are released as soon as it is no longer referenced.
+
+        Args:
+            uid (str): the UID of the element
+            workers (int): the number of threads decompressing the arrays of
+                the element. Arrays are decompressed by ``omf`` one at a time
+                by default.
+        """
+        # Deserializing replaces the entries of the registry with models, so
+        # work on a (shallow) copy to keep this file's registry reusable.
+        return self._deserialize(uid, dict(self.registry), workers=workers)
+
+    def read_project(self, element_uids=None, workers=None):
+        """Read the project (:class:`omf.base.Project`), optionally only
+        loading the elements with the given UIDs and decompressing the arrays
+        in ``workers`` threads (see :meth:`read_element`).
+        """
+        registry = dict(self.registry)
+        if element_uids is not None:
+            project = dict(registry[self.uid])
+            project["elements"] = [uid for uid in project["elements"] if uid in element_uids]
+            registry[self.uid] = project
+        return self._deserialize(self.uid, registry, workers=workers)
+
+    def iter_elements(self, names=None, workers=None):
+        """Read the elements of the project one at a time.
+
+        Args:
+            names (list(str)): only read the elements with these names
+            workers (int): the number of threads decompressing the arrays of
+                each element (see :meth:`read_element`)
+
+        Yields:
+            tuple: the position of the element in the project and the element
+        """
+        for i, uid in enumerate(self.project["elements"]):
+            if names is not None and self.registry[uid].get("name", "") not in names:
+                continue
+            yield i, self.read_element(uid, workers=workers)
+
+    def checksum(self, uid):
+        """A digest of the content of an object and of everything it
+        references, including the compressed bytes of its arrays. UIDs and
+        dates are left out so that unchanged content re-exported under new
+        UIDs has the same checksum.
+        """
+        return self._checksum(uid, {})
+
+    def _checksum(self, uid, memo):
+        """Checksum an object, reusing the checksums of shared objects"""
+        if uid not in memo:
+            digest = hashlib.blake2b(digest_size=16)
+            for key, value in sorted(self.registry[uid].items()):
+                if key in VOLATILE_KEYS:
+                    continue
+                digest.update(key.encode("utf-8"))
+                self._update_checksum(digest, value, memo)
+            memo[uid] = digest.hexdigest()
+        return memo[uid]
+
+    def _update_checksum(self, digest, value, memo):
+        """Add a JSON value to a checksum"""
+        if isinstance(value, str) and value in self.registry:
+            digest.update(b"@" + self._checksum(value, memo).encode("utf-8"))
+        elif is_array_index(value):
+            digest.update(b"#" + value["dtype"].encode("utf-8"))
+            self._fopen.seek(value["start"], 0)
+            remaining = value["length"]
+            while remaining > 0:
+                chunk = self._fopen.read(min(CHUNK_SIZE, remaining))
+                if not chunk:
+                    break
+                remaining -= len(chunk)
+                digest.update(chunk)
+        elif isinstance(value, list):
+            digest.update(b"[")
+            for item in value:
+                self._update_checksum(digest, item, memo)
+            digest.update(b"]")
+        else:
+            digest.update(json.dumps(value, sort_keys=True).encode("utf-8"))
+
+    def manifest(self):
+        """Describe the project and checksum each of its elements (see
+        :meth:`checksum`) to detect which elements changed between two
+        versions of a project.
+
+        Return:
+            dict: the ``origin`` of the project and the ``name``, ``uid`` and
+            ``checksum`` of each of its ``elements``
+        """
+        memo = {}
+        return {
+            "origin": [float(o) for o in self.origin],
+            "elements": [
+                {
+                    "name": self.registry[uid].get("name", ""),
+                    "uid": uid,
+                    "checksum": self._checksum(uid, memo),
+                }
+                for uid in self.project["elements"]
+            ],
+        }
+
+    def read_compressed(self, index):
+        """Read the compressed bytes of an array"""
+        self._fopen.seek(index["start"], 0)
+        return self._fopen.read(index["length"])
+
+    def read_array(self, index):
+        """Read and decompress an array (as a flat array)"""
+        return np.frombuffer(zlib.decompress(self.read_compressed(index)), index["dtype"])
+
+    def array_size(self, index):
+        """Count the number of values in an array by streaming its
+        decompression, without holding the whole array in memory. OMF arrays
+        are zlib streams, which do not store their decompressed size, so
+        this costs a full decompression of the array. Counts are kept, so an
+        array is only decompressed once.
+        """
+        if index["start"] in self._sizes:
+            return self._sizes[index["start"]]
+        decompressor = zlib.decompressobj()
+        self._fopen.seek(index["start"], 0)
+        remaining = index["length"]
+        nbytes = 0
+        while remaining > 0:
+            chunk = self._fopen.read(min(CHUNK_SIZE, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            while chunk:
+                nbytes += len(decompressor.decompress(chunk, CHUNK_SIZE))
+                chunk = decompressor.unconsumed_tail
+        nbytes += len(decompressor.flush())
+        self._sizes[index["start"]] = nbytes // np.dtype(index["dtype"]).itemsize
+        return self._sizes[index["start"]]
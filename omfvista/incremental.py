@@ -0,0 +1,103 @@
+"""Reload a re-exported OMF project file, only converting the elements that
+changed since it was last loaded.
+
+Example Use
+-----------
+
+.. code-block:: python
+
+    import omfvista
+
+    data, manifest = omfvista.reload_project('model.omf')
+    # ... the model is re-exported with a couple of elements changed ...
+    data, manifest = omfvista.reload_project('model.omf', data, manifest)
+
+A cache directory written by :func:`omfvista.export_project` can stand in for
+the previous project and its manifest:
+
+.. code-block:: python
+
+    cache = omfvista.ProjectCache('model_cache')
+    data, manifest = omfvista.reload_project('model.omf', cache)
+
+Elements are matched on the checksum of their content (see
+:meth:`omfvista.fileio.ProjectFile.checksum`), which only requires reading the
+compressed bytes of their arrays: unchanged elements are neither decompressed
+nor converted.
+"""
+
+__all__ = [
+    "reload_project",
+]
+
+__displayname__ = "Incremental Reload"
+
+import numpy as np
+import pyvista
+
+from omfvista import profiling
+from omfvista.fileio import ProjectFile
+from omfvista.wrapper import wrap
+
+
+def _reusable(previous, manifest, origin):
+    """Map the checksums of the previous elements to their names (their UIDs
+    in a cache, where names may be shared)
+    """
+    if previous is None:
+        return {}
+    multiblock = isinstance(previous, pyvista.MultiBlock)
+    if manifest is None:
+        if multiblock:
+            raise ValueError("A manifest is needed to reuse the elements of a MultiBlock.")
+        # A ProjectCache is its own manifest
+        manifest = previous.index
+    if not np.allclose(manifest.get("origin", (0.0, 0.0, 0.0)), origin):
+        return {}  # every element moved
+    key = "name" if multiblock else "uid"
+    names = set(previous.keys() if multiblock else previous.uids)
+    return {
+        entry["checksum"]: entry[key]
+        for entry in manifest["elements"]
+        if entry.get("checksum") is not None and entry[key] in names
+    }
+
+
+def reload_project(filename, previous=None, manifest=None):
+    """Loads an OMF project file into a :class:`pyvista.MultiBlock` dataset,
+    reusing the elements of a previous load that have not changed.
+
+    Args:
+        filename (str): the OMF project file to load
+        previous (:class:`pyvista.MultiBlock` or :class:`omfvista.cache.ProjectCache`):
+            the previously loaded project. Unchanged elements of a
+            MultiBlock are reused in place (the same data objects); those of
+            a cache are read from disk.
+        manifest (dict): the manifest returned with ``previous``. Not
+            needed for a cache.
+
+    Return:
+        tuple: the :class:`pyvista.MultiBlock` and the manifest of the file
+        (see :meth:`omfvista.fileio.ProjectFile.manifest`), where each
+        element is flagged as ``converted`` or reused
+    """
+    data = pyvista.MultiBlock()
+    with ProjectFile(filename) as pfile:
+        current = pfile.manifest()
+        origin = np.array(current["origin"])
+        reusable = _reusable(previous, manifest, origin)
+        for entry in current["elements"]:
+            name = reusable.get(entry["checksum"])
+            entry["converted"] = name is None
+            if name is not None:
+                data[entry["name"]] = previous[name]
+                continue
+            with profiling.element(entry["name"]):
+                with profiling.stage("read"):
+                    element = pfile.read_element(entry["uid"])
+            data[entry["name"]] = wrap(element, origin=origin)
+            del element
+    return data, current
+
+
+reload_project.__displayname__ = "Reload Project File"
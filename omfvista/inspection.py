@@ -0,0 +1,285 @@
+"""Summarize the elements of an OMF project file without converting them to
+VTK data objects.
+
+Example Use
+-----------
+
+.. code-block:: python
+
+    import omfvista
+
+    summary = omfvista.inspect('test_file.omf')
+    for element in summary['elements']:
+        print(element['name'], element['type'], element['n_cells'])
+
+Only the JSON dictionary of the project is parsed: volume and surface grid
+shapes come from their tensors and attribute names and types from the array
+pointers. Vertex arrays are only decompressed to compute bounds and textures
+are never decoded.
+
+OMF arrays are zlib streams, which do not store their decompressed size, so
+the number of vertices, segments and triangles can not be read from the
+array pointers. Each is counted by streaming the decompression of one array
+at that location (the smallest, often a data array rather than the
+geometry), holding none of it in memory.
+"""
+
+__all__ = [
+    "element_summary",
+    "inspect",
+]
+
+__displayname__ = "Inspection"
+
+import itertools
+
+import numpy as np
+
+from omfvista.fileio import ProjectFile, is_array_index
+
+# Number of components of each row of the array types
+COMPONENTS = {
+    "Vector2Array": 2,
+    "Vector3Array": 3,
+    "Int2Array": 2,
+    "Int3Array": 3,
+}
+
+
+def _array_model(pfile, uid):
+    """Get the JSON dictionary of an array model"""
+    return pfile.registry[uid]
+
+
+def _count(pfile, uid):
+    """Count the rows of an array model without keeping it in memory"""
+    model = _array_model(pfile, uid)
+    value = model["array"]
+    if is_array_index(value):
+        return pfile.array_size(value) // COMPONENTS.get(model["__class__"], 1)
+    return len(value)
+
+
+def _count_rows(pfile, uid, data, location):
+    """Count the rows of an array model, or of the data array at the same
+    location that is the cheapest to decompress
+    """
+    uids = [uid] + [
+        d["array"]
+        for d in data
+        if d.get("location") == location and isinstance(d.get("array"), str)
+    ]
+
+    def compressed(uid):
+        value = _array_model(pfile, uid).get("array")
+        return value["length"] if is_array_index(value) else 0
+
+    return _count(pfile, min(uids, key=compressed))
+
+
+def _read(pfile, uid):
+    """Read the array of an array model with its rows"""
+    model = _array_model(pfile, uid)
+    arr = pfile.read_array(model["array"])
+    components = COMPONENTS.get(model["__class__"], 1)
+    if components > 1:
+        arr = arr.reshape(-1, components)
+    return arr
+
+
+def _points_bounds(points, origin):
+    """Bounds of an array of points shifted by the project origin"""
+    if len(points) == 0:
+        return None
+    lower = points.min(axis=0) + origin
+    upper = points.max(axis=0) + origin
+    return [float(v) for pair in zip(lower, upper) for v in pair]
+
+
+def _box_bounds(extents, axes, origin):
+    """Bounds of a rotated box given the extents along each of its axes"""
+    corners = np.array(list(itertools.product(*extents)), dtype=float)
+    return _points_bounds(corners.dot(np.array(axes, dtype=float)), origin)
+
+
+def _tensor_extent(start, tensor):
+    """The range covered by a tensor of cell widths"""
+    return (start, start + float(np.sum(tensor)))
+
+
+def _vertices_summary(pfile, geom, bounds, origin, data):
+    """Number of vertices and their bounds"""
+    if bounds:
+        vertices = _read(pfile, geom["vertices"])
+        return len(vertices), _points_bounds(vertices, origin)
+    return _count_rows(pfile, geom["vertices"], data, "vertices"), None
+
+
+def _point_set(pfile, geom, bounds, origin, data):
+    """Summarize a point set geometry"""
+    n_points, box = _vertices_summary(pfile, geom, bounds, origin, data)
+    return {"n_points": n_points, "n_cells": n_points, "bounds": box}
+
+
+def _line_set(pfile, geom, bounds, origin, data):
+    """Summarize a line set geometry"""
+    n_points, box = _vertices_summary(pfile, geom, bounds, origin, data)
+    n_cells = _count_rows(pfile, geom["segments"], data, "segments")
+    return {"n_points": n_points, "n_cells": n_cells, "bounds": box}
+
+
+def _surface(pfile, geom, bounds, origin, data):
+    """Summarize a triangulated surface geometry"""
+    n_points, box = _vertices_summary(pfile, geom, bounds, origin, data)
+    n_cells = _count_rows(pfile, geom["triangles"], data, "faces")
+    return {"n_points": n_points, "n_cells": n_cells, "bounds": box}
+
+
+def _surface_grid(pfile, geom, bounds, origin, data):
+    """Summarize a surface grid geometry"""
+    shape = (len(geom["tensor_u"]), len(geom["tensor_v"]))
+    summary = {
+        "shape": shape,
+        "n_points": (shape[0] + 1) * (shape[1] + 1),
+        "n_cells": shape[0] * shape[1],
+        "bounds": None,
+    }
+    if bounds:
+        ox, oy, oz = geom["origin"]
+        offset = (0.0, 0.0)
+        if geom.get("offset_w"):
+            offset_w = _read(pfile, geom["offset_w"])
+            offset = (float(np.min(offset_w)), float(np.max(offset_w)))
+        axis_u = np.array(geom["axis_u"], dtype=float)
+        axis_v = np.array(geom["axis_v"], dtype=float)
+        extents = (
+            _tensor_extent(ox, geom["tensor_u"]),
+            _tensor_extent(oy, geom["tensor_v"]),
+            (oz + offset[0], oz + offset[1]),
+        )
+        summary["bounds"] = _box_bounds(extents, (axis_u, axis_v, np.cross(axis_u, axis_v)), origin)
+    return summary
+
+
+def _volume_grid(pfile, geom, bounds, origin, data):
+    """Summarize a volume grid geometry"""
+    shape = (len(geom["tensor_u"]), len(geom["tensor_v"]), len(geom["tensor_w"]))
+    summary = {
+        "shape": shape,
+        "n_points": (shape[0] + 1) * (shape[1] + 1) * (shape[2] + 1),
+        "n_cells": shape[0] * shape[1] * shape[2],
+        "bounds": None,
+    }
+    if bounds:
+        extents = [
+            _tensor_extent(o, geom[tensor])
+            for o, tensor in zip(geom["origin"], ("tensor_u", "tensor_v", "tensor_w"))
+        ]
+        axes = (geom["axis_u"], geom["axis_v"], geom["axis_w"])
+        summary["bounds"] = _box_bounds(extents, axes, origin)
+    return summary
+
+
+GEOMETRIES = {
+    "PointSetGeometry": _point_set,
+    "LineSetGeometry": _line_set,
+    "SurfaceGeometry": _surface,
+    "SurfaceGridGeometry": _surface_grid,
+    "VolumeGridGeometry": _volume_grid,
+}
+
+
+def _data_summary(pfile, data, geometry):
+    """Name, type and location of a data array"""
+    summary = {
+        "name": data.get("name", ""),
+        "type": data["__class__"],
+        "location": data.get("location"),
+        "dtype": None,
+        "components": 1,
+        "length": (
+            geometry["n_points"] if data.get("location") == "vertices" else geometry["n_cells"]
+        ),
+    }
+    if isinstance(data.get("array"), str):
+        model = _array_model(pfile, data["array"])
+        value = model.get("array")
+        if is_array_index(value):
+            summary["dtype"] = np.dtype(value["dtype"]).name
+        summary["components"] = COMPONENTS.get(model["__class__"], 1)
+    return summary
+
+
+def element_summary(pfile, uid, bounds=True):
+    """Summarize a single element of an open project file (see
+    :func:`inspect`).
+
+    Args:
+        pfile (:class:`omfvista.fileio.ProjectFile`): the project file
+        uid (str): the UID of the element
+        bounds (bool): compute the bounds of the element
+
+    Return:
+        dict: the summary of the element
+    """
+    origin = np.array(pfile.origin, dtype=float)
+    element = dict(pfile.registry[uid], uid=uid)
+    geom = pfile.registry[element["geometry"]]
+    key = geom["__class__"]
+    try:
+        summarize = GEOMETRIES[key]
+    except KeyError:
+        raise RuntimeError("Geometry of type ({}) is not supported currently.".format(key))
+    data = [pfile.registry[uid] for uid in element.get("data", [])]
+    geometry = summarize(pfile, geom, bounds, origin, data)
+    summary = {
+        "name": element.get("name", ""),
+        "uid": element["uid"],
+        "type": element["__class__"],
+        "subtype": element.get("subtype"),
+        "description": element.get("description", ""),
+        "geometry": key,
+    }
+    summary.update(geometry)
+    summary["data"] = [_data_summary(pfile, d, geometry) for d in data]
+    summary["textures"] = [
+        pfile.registry[uid].get("name", "") for uid in element.get("textures", [])
+    ]
+    return summary
+
+
+def inspect(filename, bounds=True):
+    """Summarize the elements of an OMF project file without converting them
+    to VTK data objects or holding their data in memory.
+
+    Args:
+        filename (str): the OMF project file to inspect
+        bounds (bool): compute the bounds of each element (in the same
+            coordinates as :func:`omfvista.load_project`). This requires
+            decompressing the vertices of point sets, line sets and surfaces.
+            The bounds of rotated surface grids are those of their oriented
+            bounding box. Without bounds, the vertices, segments and
+            triangles of those elements are still counted by streaming the
+            decompression of one array each (see the module documentation).
+
+    Return:
+        dict: the ``name``, ``uid``, ``description`` and ``origin`` of the
+        project and a list of ``elements``. Each element has its ``name``,
+        ``uid``, ``type``, ``geometry`` type, ``n_points``, ``n_cells``,
+        ``bounds``, ``data`` arrays (with their ``name``, ``location`` and
+        ``dtype``), ``textures`` names, and ``shape`` for grids.
+    """
+    with ProjectFile(filename) as pfile:
+        project = pfile.project
+        elements = [element_summary(pfile, uid, bounds=bounds) for uid in project["elements"]]
+    return {
+        "name": project.get("name", ""),
+        "uid": pfile.uid,
+        "description": project.get("description", ""),
+        "origin": [float(o) for o in pfile.origin],
+        "elements": elements,
+    }
+
+
+element_summary.__displayname__ = "Element Summary"
+inspect.__displayname__ = "Inspect Project File"
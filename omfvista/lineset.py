@@ -2,6 +2,7 @@
 
 
 __all__ = [
+    "line_set_geom_to_vtk",
     "line_set_to_vtk",
 ]
 
@@ -10,35 +11,65 @@ __displayname__ = "Line Set"
 import numpy as np
 import pyvista
 
+from omfvista.profiling import stage
 from omfvista.utilities import add_data
 
 
-def line_set_to_vtk(lse, origin=(0.0, 0.0, 0.0)):
-    """Convert the line set to a :class:`pyvista.PolyData` data object.
+def line_set_geom_to_vtk(linegeom, origin=(0.0, 0.0, 0.0)):
+    """Convert the line set geometry to a :class:`pyvista.PolyData` data
+    object with a ``Line Index`` cell array numbering its connected lines.
 
     Args:
-        lse (:class:`omf.lineset.LineSetElement`): The line set to convert
+        linegeom (:class:`omf.lineset.LineSetGeometry`): The line set
+            geometry to convert
 
     Return:
         :class:`pyvista.PolyData`
     """
-    ids = np.array(lse.geometry.segments).reshape(-1, 2).astype(np.int_)
+    ids = np.array(linegeom.segments.array).reshape(-1, 2).astype(np.int_)
     lines = np.c_[np.full(len(ids), 2, dtype=np.int_), ids]
 
+    points = np.array(linegeom.vertices.array, dtype=float)
+    points += np.array(origin)
     output = pyvista.PolyData()
-    output.points = np.array(lse.geometry.vertices)
+    output.points = points
     output.lines = lines
 
-    indices = output.connectivity().cell_data["RegionId"]
-    output["Line Index"] = np.array(indices)
+    with stage("connectivity") as s:
+        indices = output.connectivity().cell_data["RegionId"]
+        indices = np.array(indices)
+        output["Line Index"] = indices
+        s.add(indices)
+
+    return output
+
+
+def line_set_to_vtk(lse, origin=(0.0, 0.0, 0.0), mesh=None):
+    """Convert the line set to a :class:`pyvista.PolyData` data object.
+
+    Args:
+        lse (:class:`omf.lineset.LineSetElement`): The line set to convert
+        mesh (:class:`pyvista.PolyData`): the already converted geometry of
+            the line set. The output shares its points and lines rather than
+            converting the geometry again.
+
+    Return:
+        :class:`pyvista.PolyData`
+    """
+    if mesh is None:
+        with stage("geometry") as s:
+            output = line_set_geom_to_vtk(lse.geometry, origin=origin)
+            s.add(output)
+    else:
+        output = mesh.copy(deep=False)
 
     # Now add data to lines:
     add_data(output, lse.data)
 
     # TODO: if subtype is borehole make a tube
 
-    output.points += np.array(origin)
     return output
 
 
+line_set_geom_to_vtk.__displayname__ = "Line Set Geometry to VTK"
 line_set_to_vtk.__displayname__ = "Line Set to VTK"
@@ -0,0 +1,252 @@
+"""Merge the many small elements of a project into a few batched datasets so
+that a scene has a handful of actors instead of hundreds.
+
+Example Use
+-----------
+
+.. code-block:: python
+
+    import omfvista
+
+    data = omfvista.load_project('test_file.omf', merge=True)
+    data['Line Sets']['Element Index']
+
+Point sets, line sets and triangulated surfaces are each concatenated into a
+single :class:`pyvista.PolyData` (``"Point Sets"``, ``"Line Sets"`` and
+``"Surfaces"``, numbered like ``"Surfaces (2)"`` if an element that is kept
+has that name) in the place of their first element; gridded surfaces and
+volumes are kept as they are. The points and the connectivity of the cells
+are concatenated at once, shifting the point ids of each element by the
+number of points before it.
+
+Each merged dataset has an ``"Element Index"`` point and cell array (the
+position of the element among the merged ones) and an ``"Element Names"``
+field array to look the names up. The data arrays of the elements are merged
+by name: elements without an array get NaN (or empty strings) and arrays
+whose number of components differs between elements are dropped. The
+``"Line Index"`` of the connected lines of each line set is shifted so that
+it numbers the connected lines of all of the merged line sets.
+
+The textures of merged elements are keyed by the merged dataset that holds
+them (see :func:`merge_textures`), their texture coordinates being merged
+point arrays like any other.
+"""
+
+__all__ = [
+    "dataset_kind",
+    "merge_blocks",
+    "merge_datasets",
+    "merge_textures",
+]
+
+__displayname__ = "Merging"
+
+import numpy as np
+import pyvista
+
+from omfvista.utilities import POLY_CELLS, cell_arrays, to_cell_array
+
+ELEMENT_INDEX = "Element Index"
+ELEMENT_NAMES = "Element Names"
+LINE_INDEX = "Line Index"
+
+# The name of the merged dataset of each kind of element and the cells of
+# the PolyData it holds (see POLY_CELLS)
+KINDS = {
+    "Point Sets": "verts",
+    "Line Sets": "lines",
+    "Surfaces": "polys",
+}
+
+
+def dataset_kind(dataset):
+    """The kind of element a converted dataset is (a key of ``KINDS``) or
+    ``None`` when it is not merged
+    """
+    if not isinstance(dataset, pyvista.PolyData) or dataset.n_cells == 0:
+        return None
+    counts = {
+        "verts": dataset.n_verts,
+        "lines": dataset.n_lines,
+        "polys": dataset.GetNumberOfPolys(),
+    }
+    for kind, cells in KINDS.items():
+        if counts[cells] == dataset.n_cells:
+            return kind
+    return None
+
+
+def _merge_array(arrays, sizes):
+    """Concatenate the arrays of the elements, filling in missing ones"""
+    present = [arr for arr in arrays if arr is not None]
+    shapes = {arr.shape[1:] for arr in present}
+    if len(shapes) > 1:
+        return None
+    shape = shapes.pop()
+    dtype = np.result_type(*present)
+    fill = None
+    if len(present) < len(arrays):
+        if dtype.kind in "biu":
+            dtype = np.dtype(float)
+        fill = "" if dtype.kind == "U" else np.nan
+    pieces = []
+    for arr, size in zip(arrays, sizes):
+        if arr is None:
+            arr = np.full((size,) + shape, fill, dtype=dtype)
+        pieces.append(np.asarray(arr, dtype=dtype))
+    return np.concatenate(pieces)
+
+
+def _merge_attributes(output, datasets, association, sizes):
+    """Merge the point or cell data arrays of the elements onto the output"""
+    attributes = []
+    for dataset in datasets:
+        arrays = getattr(dataset, association)
+        attributes.append({name: np.asarray(arrays[name]) for name in arrays.keys()})
+    names = {}
+    for arrays in attributes:
+        names.update(dict.fromkeys(arrays))
+    target = getattr(output, association)
+    for name in names:
+        merged = _merge_array([arrays.get(name) for arrays in attributes], sizes)
+        if merged is not None:
+            target[name] = merged
+
+
+def _merge_line_index(datasets, sizes):
+    """Concatenate the ``"Line Index"`` of the elements, shifting that of each
+    element past the lines of the elements before it
+    """
+    pieces = []
+    shift = 0
+    for dataset in datasets:
+        if LINE_INDEX not in dataset.cell_data.keys():
+            pieces.append(None)
+            continue
+        indices = np.asarray(dataset.cell_data[LINE_INDEX])
+        pieces.append(indices + shift)
+        if indices.size:
+            shift += int(indices.max()) + 1
+    return _merge_array(pieces, sizes)
+
+
+def merge_datasets(datasets, names=None):
+    """Concatenate PolyData of a single kind of cell into one.
+
+    Args:
+        datasets (list(:class:`pyvista.PolyData`)): the converted elements,
+            holding only vertices, only lines or only polygons
+        names (list(str)): the names of the elements
+
+    Return:
+        :class:`pyvista.PolyData`: the merged elements with their data
+        arrays, the ``"Element Index"`` of each point and cell and the
+        ``"Element Names"``
+    """
+    if names is None:
+        names = ["Element {:d}".format(i) for i in range(len(datasets))]
+    kinds = {dataset_kind(d) for d in datasets}
+    if len(kinds) != 1 or None in kinds:
+        raise ValueError("Only PolyData of a single kind of cell can be merged.")
+    getter, setter = POLY_CELLS[KINDS[kinds.pop()]]
+    n_points = np.array([d.n_points for d in datasets])
+    n_cells = np.array([d.n_cells for d in datasets])
+    point_offsets = np.cumsum(n_points) - n_points
+
+    output = pyvista.PolyData()
+    output.points = np.concatenate([np.asarray(d.points) for d in datasets])
+    offsets, connectivity = [], []
+    shift = 0
+    for d, start in zip(datasets, point_offsets):
+        cell_offsets, cell_connectivity = cell_arrays(getattr(d, getter)())
+        offsets.append(cell_offsets[:-1] + shift)
+        connectivity.append(cell_connectivity + start)
+        shift += len(cell_connectivity)
+    offsets.append([shift])
+    getattr(output, setter)(to_cell_array(np.concatenate(offsets), np.concatenate(connectivity)))
+
+    _merge_attributes(output, datasets, "point_data", n_points)
+    _merge_attributes(output, datasets, "cell_data", n_cells)
+    if LINE_INDEX in output.cell_data.keys():
+        output.cell_data[LINE_INDEX] = _merge_line_index(datasets, n_cells)
+    index = np.arange(len(datasets))
+    output.point_data[ELEMENT_INDEX] = np.repeat(index, n_points)
+    output.cell_data[ELEMENT_INDEX] = np.repeat(index, n_cells)
+    output.field_data[ELEMENT_NAMES] = np.array(names, dtype=str)
+    return output
+
+
+def merge_blocks(data):
+    """Merge the point sets, line sets and triangulated surfaces of a
+    converted project.
+
+    Args:
+        data (:class:`pyvista.MultiBlock`): the converted project
+
+    Return:
+        :class:`pyvista.MultiBlock`: the merged datasets in the place of the
+        first element of their kind, and the other elements as they were.
+        A merged dataset named like an element that is kept is numbered
+        (e.g. ``"Surfaces (2)"``).
+    """
+    groups = {}
+    order = []
+    blocks = {}
+    # Look the blocks up by position: by name is linear in the number of blocks
+    for i, name in enumerate(data.keys()):
+        dataset = blocks[name] = data[i]
+        kind = dataset_kind(dataset)
+        if kind is None:
+            order.append((name, None))
+            continue
+        if kind not in groups:
+            groups[kind] = []
+            order.append((kind, kind))
+        groups[kind].append((name, dataset))
+    kept = {name for name, kind in order if kind is None}
+    output = {}
+    for name, kind in order:
+        if kind is None:
+            output[name] = blocks[name]
+            continue
+        number = 1
+        while name in kept:
+            number += 1
+            name = "{} ({:d})".format(kind, number)
+        names, datasets = zip(*groups[kind])
+        output[name] = merge_datasets(list(datasets), list(names))
+    return pyvista.MultiBlock(output)
+
+
+def merge_textures(data, textures):
+    """Key the textures of the elements of a project by the blocks holding
+    them once merged (see :func:`merge_blocks`).
+
+    Args:
+        data (:class:`pyvista.MultiBlock`): the merged project
+        textures (dict): the lists of textures of the elements by name
+
+    Return:
+        dict: the textures of the kept elements by name and those of the
+        merged elements by the name of their merged dataset, in the order
+        of the elements
+    """
+    blocks = {}
+    for i, name in enumerate(data.keys()):
+        dataset = data[i]
+        field = getattr(dataset, "field_data", {})
+        if ELEMENT_NAMES in field:
+            for element in field[ELEMENT_NAMES]:
+                blocks[str(element)] = name
+        else:
+            blocks.setdefault(name, name)
+    output = {}
+    for name, tex in textures.items():
+        output.setdefault(blocks.get(name, name), []).extend(tex)
+    return output
+
+
+dataset_kind.__displayname__ = "Dataset Kind"
+merge_datasets.__displayname__ = "Merge Datasets"
+merge_blocks.__displayname__ = "Merge Blocks"
+merge_textures.__displayname__ = "Merge Textures"
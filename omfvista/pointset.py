@@ -2,6 +2,7 @@
 
 
 __all__ = [
+    "point_set_geom_to_vtk",
     "point_set_to_vtk",
 ]
 
@@ -10,28 +11,52 @@ __displayname__ = "Point Set"
 import numpy as np
 import pyvista
 
+from omfvista.profiling import stage
 from omfvista.utilities import add_data, add_texture_coordinates
 
 
-def point_set_to_vtk(pse, origin=(0.0, 0.0, 0.0)):
+def point_set_geom_to_vtk(pointgeom, origin=(0.0, 0.0, 0.0)):
+    """Convert the point set geometry to a :class:`pyvista.PolyData` data
+    object.
+
+    Args:
+        pointgeom (:class:`omf.pointset.PointSetGeometry`): The point set
+            geometry to convert
+
+    Return:
+        :class:`pyvista.PolyData`
+    """
+    points = np.array(pointgeom.vertices.array, dtype=float)
+    points += np.array(origin)
+    return pyvista.PolyData(points)
+
+
+def point_set_to_vtk(pse, origin=(0.0, 0.0, 0.0), mesh=None):
     """Convert the point set to a :class:`pyvista.PolyData` data object.
 
     Args:
         pse (:class:`omf.pointset.PointSetElement`): The point set to convert
+        mesh (:class:`pyvista.PolyData`): the already converted geometry of
+            the point set. The output shares its points rather than
+            converting the geometry again.
 
     Return:
         :class:`pyvista.PolyData`
     """
-    points = np.array(pse.geometry.vertices)
-    output = pyvista.PolyData(points)
+    if mesh is None:
+        with stage("geometry") as s:
+            output = point_set_geom_to_vtk(pse.geometry, origin=origin)
+            s.add(output)
+    else:
+        output = mesh.copy(deep=False)
 
     # Now add point data:
     add_data(output, pse.data)
 
-    add_texture_coordinates(output, pse.textures, pse.name)
+    add_texture_coordinates(output, pse.textures, pse.name, origin=origin)
 
-    output.points += np.array(origin)
     return output
 
 
+point_set_geom_to_vtk.__displayname__ = "Point Set Geometry to VTK"
 point_set_to_vtk.__displayname__ = "Point Set to VTK"
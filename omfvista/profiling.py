@@ -0,0 +1,204 @@
+"""Opt-in instrumentation of the conversion pipeline to find out where the
+time and memory of loading a project goes.
+
+Example Use
+-----------
+
+Record the wall time, allocated bytes and array sizes of each stage of each
+element while loading a project:
+
+.. code-block:: python
+
+    import omfvista
+
+    with omfvista.Profiler() as profiler:
+        data = omfvista.load_project('test_file.omf')
+    report = profiler.report()
+    report['stages']
+
+or simply:
+
+.. code-block:: python
+
+    data, report = omfvista.load_project('test_file.omf', profile=True)
+
+When no :class:`Profiler` is active the instrumentation does nothing.
+"""
+
+__all__ = [
+    "Profiler",
+    "StageRecord",
+    "element",
+    "stage",
+]
+
+__displayname__ = "Profiling"
+
+from collections import namedtuple
+import contextvars
+import time
+import tracemalloc
+
+StageRecord = namedtuple("StageRecord", ["element", "stage", "seconds", "allocated", "nbytes"])
+StageRecord.__doc__ = """A timed stage of the conversion of an element.
+
+``allocated`` is the net number of bytes allocated during the stage (only
+recorded when tracing memory) and ``nbytes`` is the size of the arrays the
+stage produced.
+"""
+
+# The profiler that is currently recording (if any)
+_ACTIVE = None
+# The name of the element that is being converted
+_ELEMENT = contextvars.ContextVar("omfvista_element", default=None)
+
+
+class _NullStage(object):
+    """Stand-in for :class:`_Stage` when no profiler is active"""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        return False
+
+    def add(self, *arrays):
+        """Does nothing"""
+
+
+_NULL = _NullStage()
+
+
+class _Stage(object):
+    """Times a single stage and records it with the profiler"""
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+        self.nbytes = 0
+
+    def __enter__(self):
+        if self.profiler.trace_memory:
+            self._memory = tracemalloc.get_traced_memory()[0]
+        self._tic = time.perf_counter()
+        return self
+
+    def __exit__(self, *args):
+        seconds = time.perf_counter() - self._tic
+        allocated = None
+        if self.profiler.trace_memory:
+            allocated = tracemalloc.get_traced_memory()[0] - self._memory
+        self.profiler.records.append(
+            StageRecord(_ELEMENT.get(), self.name, seconds, allocated, self.nbytes)
+        )
+        return False
+
+    def add(self, *arrays):
+        """Count the size of arrays (or VTK data objects) produced by this
+        stage
+        """
+        for arr in arrays:
+            if hasattr(arr, "GetActualMemorySize"):
+                self.nbytes += arr.GetActualMemorySize() * 1024
+            else:
+                self.nbytes += getattr(arr, "nbytes", 0)
+
+
+class _Element(object):
+    """Sets the element that stages are recorded against"""
+
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        self._token = _ELEMENT.set(self.name)
+        return self
+
+    def __exit__(self, *args):
+        _ELEMENT.reset(self._token)
+        return False
+
+
+def stage(name):
+    """Context manager timing a stage of the conversion pipeline. Use the
+    ``add`` method of the returned object to count the arrays it produces.
+    """
+    if _ACTIVE is None:
+        return _NULL
+    return _Stage(_ACTIVE, name)
+
+
+def element(name):
+    """Context manager recording stages against the named element"""
+    if _ACTIVE is None:
+        return _NULL
+    return _Element(name)
+
+
+class Profiler(object):
+    """Records the time, memory and array sizes of each stage of the
+    conversion pipeline while active.
+
+    Args:
+        trace_memory (bool): trace the memory allocated by each stage with
+            :mod:`tracemalloc`. This slows down the conversion.
+    """
+
+    def __init__(self, trace_memory=True):
+        self.trace_memory = trace_memory
+        self.records = []
+        self.seconds = 0.0
+        self._previous = None
+        self._started_tracing = False
+
+    def __enter__(self):
+        global _ACTIVE
+        if self.trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+        self._previous = _ACTIVE
+        _ACTIVE = self
+        self._tic = time.perf_counter()
+        return self
+
+    def __exit__(self, *args):
+        global _ACTIVE
+        self.seconds += time.perf_counter() - self._tic
+        _ACTIVE = self._previous
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+        return False
+
+    @staticmethod
+    def _total(records):
+        """Sum up a group of records"""
+        allocated = [r.allocated for r in records if r.allocated is not None]
+        return {
+            "count": len(records),
+            "seconds": sum(r.seconds for r in records),
+            "allocated": sum(allocated) if allocated else None,
+            "nbytes": sum(r.nbytes for r in records),
+        }
+
+    def report(self):
+        """Get a structured report of the recorded stages.
+
+        Return:
+            dict: the total ``seconds`` spent while profiling, every stage
+            ``records`` and the records summed by ``stages`` and by
+            ``elements`` (elements map to their stages)
+        """
+        stages, elements = {}, {}
+        for r in self.records:
+            stages.setdefault(r.stage, []).append(r)
+            elements.setdefault(r.element, {}).setdefault(r.stage, []).append(r)
+        return {
+            "seconds": self.seconds,
+            "records": [r._asdict() for r in self.records],
+            "stages": {name: self._total(records) for name, records in stages.items()},
+            "elements": {
+                name: {s: self._total(records) for s, records in element_stages.items()}
+                for name, element_stages in elements.items()
+            },
+        }
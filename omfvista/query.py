@@ -0,0 +1,344 @@
+"""Select the cells of gridded volumes by the values of their data and only
+convert the selected cells.
+
+Example Use
+-----------
+
+The ore blocks of a block model as a compact hexahedral mesh:
+
+.. code-block:: python
+
+    import omf
+    import omfvista
+
+    project = omf.OMFReader('test_file.omf').get_project()
+    ore = omfvista.query_volume(
+        project.elements[4], 'CU_pct > 0.3 and DOMAIN in {2, 5}', origin=project.origin
+    )
+
+or as a point cloud of their centers with only a few of the data arrays:
+
+.. code-block:: python
+
+    centers = omfvista.query_volume(
+        project.elements[4], 'CU_pct > 0.3', attributes=['CU_pct'], output='points'
+    )
+
+Expressions combine the cell data arrays of the volume by name (quote names
+that are not identifiers with backticks: ```Random Data` > 0.5``) with
+arithmetic, comparisons, membership (``in {2, 5}``), the element-wise logical
+``and``/``or``/``not``, the NumPy operators ``&``/``|``/``~`` and the
+functions ``abs``, ``isnan`` and ``isfinite``. Nothing else is evaluated. A
+callable taking a dictionary of array chunks and returning a boolean mask
+may be given instead.
+
+As in Python and NumPy, ``&``/``|``/``~`` are bitwise on integer arrays and
+bind tighter than comparisons, so comparisons combined with them need
+parentheses: ``(a > 1) & (b < 2)``, or ``a > 1 and b < 2``. A comparison
+chained through ``&`` or ``|`` (``a > 1 & b < 2``) is rejected rather than
+evaluated as ``a > (1 & b) < 2``.
+
+The expression is evaluated with NumPy over chunks of cells (in parallel
+threads when asked to) on the flat OMF arrays, so the volume is never
+converted as a whole and memory only grows with the selection.
+"""
+
+__all__ = [
+    "query_volume",
+]
+
+__displayname__ = "Query"
+
+import ast
+import operator
+import re
+
+import numpy as np
+import pyvista
+
+from omfvista.utilities import map_chunks
+from omfvista.volume import (
+    get_volume_arrays,
+    get_volume_edges,
+    get_volume_rotation,
+    get_volume_shape,
+)
+
+OUTPUTS = ("cells", "points")
+
+# Number of cells evaluated at a time
+CHUNK_SIZE = 2**22
+
+BINARY_OPERATORS = {
+    ast.Add: operator.add,
+    ast.Sub: operator.sub,
+    ast.Mult: operator.mul,
+    ast.Div: operator.truediv,
+    ast.Mod: operator.mod,
+    ast.Pow: operator.pow,
+    ast.BitAnd: operator.and_,
+    ast.BitOr: operator.or_,
+}
+
+UNARY_OPERATORS = {
+    ast.USub: operator.neg,
+    ast.UAdd: operator.pos,
+    ast.Not: np.logical_not,
+    ast.Invert: operator.invert,
+}
+
+COMPARISONS = {
+    ast.Lt: operator.lt,
+    ast.LtE: operator.le,
+    ast.Gt: operator.gt,
+    ast.GtE: operator.ge,
+    ast.Eq: operator.eq,
+    ast.NotEq: operator.ne,
+}
+
+FUNCTIONS = {
+    "abs": np.abs,
+    "isnan": np.isnan,
+    "isfinite": np.isfinite,
+}
+
+# VTK corner order of a hexahedron as (u, v, w) offsets
+HEXAHEDRON_CORNERS = np.array(
+    [
+        [0, 0, 0],
+        [1, 0, 0],
+        [1, 1, 0],
+        [0, 1, 0],
+        [0, 0, 1],
+        [1, 0, 1],
+        [1, 1, 1],
+        [0, 1, 1],
+    ]
+)
+
+
+class Expression(object):
+    """A parsed selection expression restricted to array arithmetic and
+    comparisons.
+
+    Args:
+        source (str): the expression
+    """
+
+    def __init__(self, source):
+        self.source = source
+        self._quoted = {}
+
+        def quote(match):
+            key = "_array_{:d}".format(len(self._quoted))
+            self._quoted[key] = match.group(1)
+            return key
+
+        text = re.sub(r"`([^`]*)`", quote, source)
+        try:
+            tree = ast.parse(text.strip(), mode="eval")
+        except SyntaxError as e:
+            raise ValueError("Invalid expression ({}): {}".format(source, e.msg))
+        for node in ast.walk(tree):
+            # An operand between two comparisons: ``a > 1 & b < 2``
+            if isinstance(node, ast.Compare) and any(
+                isinstance(c, ast.BinOp) and isinstance(c.op, (ast.BitAnd, ast.BitOr))
+                for c in node.comparators[:-1]
+            ):
+                raise ValueError(
+                    "Ambiguous expression ({}): & and | bind tighter than comparisons, "
+                    "parenthesize the comparisons they combine.".format(source)
+                )
+        self._tree = tree.body
+        self.names = sorted(set(self._names(self._tree)))
+
+    def __repr__(self):
+        return "<Expression {!r}>".format(self.source)
+
+    def _names(self, node):
+        """The names of the arrays used by a node"""
+        if isinstance(node, ast.Name):
+            yield self._quoted.get(node.id, node.id)
+        elif isinstance(node, ast.Call):
+            for arg in node.args:
+                yield from self._names(arg)
+        else:
+            for child in ast.iter_child_nodes(node):
+                yield from self._names(child)
+
+    def _constants(self, node):
+        """The values of a literal collection for membership tests"""
+        if not isinstance(node, (ast.Set, ast.List, ast.Tuple)):
+            raise ValueError("Membership is only tested against literal collections.")
+        return [self._evaluate(elt, {}) for elt in node.elts]
+
+    def _evaluate(self, node, arrays):
+        if isinstance(node, ast.Constant) and isinstance(node.value, (int, float, bool)):
+            return node.value
+        if isinstance(node, ast.Name):
+            return arrays[self._quoted.get(node.id, node.id)]
+        if isinstance(node, ast.BoolOp):
+            combine = np.logical_and if isinstance(node.op, ast.And) else np.logical_or
+            result = self._evaluate(node.values[0], arrays)
+            for value in node.values[1:]:
+                result = combine(result, self._evaluate(value, arrays))
+            return result
+        if isinstance(node, ast.UnaryOp) and type(node.op) in UNARY_OPERATORS:
+            return UNARY_OPERATORS[type(node.op)](self._evaluate(node.operand, arrays))
+        if isinstance(node, ast.BinOp) and type(node.op) in BINARY_OPERATORS:
+            left = self._evaluate(node.left, arrays)
+            right = self._evaluate(node.right, arrays)
+            return BINARY_OPERATORS[type(node.op)](left, right)
+        if isinstance(node, ast.Compare):
+            result = True
+            left = self._evaluate(node.left, arrays)
+            for op, comparator in zip(node.ops, node.comparators):
+                if isinstance(op, (ast.In, ast.NotIn)):
+                    found = np.isin(left, self._constants(comparator))
+                    result = result & (found if isinstance(op, ast.In) else ~found)
+                    continue
+                if type(op) not in COMPARISONS:
+                    break
+                right = self._evaluate(comparator, arrays)
+                result = result & COMPARISONS[type(op)](left, right)
+                left = right
+            else:
+                return result
+        if (
+            isinstance(node, ast.Call)
+            and isinstance(node.func, ast.Name)
+            and node.func.id in FUNCTIONS
+            and not node.keywords
+        ):
+            args = [self._evaluate(arg, arrays) for arg in node.args]
+            return FUNCTIONS[node.func.id](*args)
+        raise ValueError("Unsupported expression ({}) in ({})".format(ast.dump(node), self.source))
+
+    def __call__(self, arrays):
+        """Evaluate the expression over a dictionary of arrays"""
+        return self._evaluate(self._tree, arrays)
+
+
+def _select_chunk(selector, arrays, start, stop):
+    """The flat (C order) indices of the selected cells of a chunk"""
+    chunk = {name: arr[start:stop] for name, arr in arrays.items()}
+    mask = np.broadcast_to(np.asarray(selector(chunk), dtype=bool), (stop - start,))
+    return np.flatnonzero(mask) + start
+
+
+def _hexahedra(geom, ijk, origin):
+    """The points and connectivity of the hexahedra of the selected cells,
+    sharing the nodes of neighbouring cells
+    """
+    nodes = tuple(n + 1 for n in get_volume_shape(geom))
+    corners = HEXAHEDRON_CORNERS
+    rotation = get_volume_rotation(geom)
+    if np.linalg.det(rotation) < 0:
+        # Left handed axes turn the hexahedra inside out
+        corners = corners[[4, 5, 6, 7, 0, 1, 2, 3]]
+    node_ids = np.ravel_multi_index(
+        tuple(ijk[axis][:, None] + corners[None, :, axis] for axis in range(3)), nodes
+    )
+    used, connectivity = np.unique(node_ids, return_inverse=True)
+    edges = get_volume_edges(geom)
+    local = np.column_stack(
+        [edges[axis][n] for axis, n in enumerate(np.unravel_index(used, nodes))]
+    )
+    points = local.dot(rotation) + np.array(origin, dtype=float)
+    cells = np.column_stack([np.full(len(node_ids), 8), connectivity.reshape(-1, 8)])
+    return points, cells
+
+
+def _centers(geom, ijk, origin):
+    """The centers of the selected cells"""
+    edges = get_volume_edges(geom)
+    local = np.column_stack(
+        [(edges[axis][i] + edges[axis][i + 1]) / 2.0 for axis, i in enumerate(ijk)]
+    )
+    return local.dot(get_volume_rotation(geom)) + np.array(origin, dtype=float)
+
+
+def query_volume(
+    volelement,
+    expression,
+    attributes=None,
+    output="cells",
+    origin=(0.0, 0.0, 0.0),
+    chunk_size=CHUNK_SIZE,
+    workers=None,
+):
+    """Select the cells of a volume element with a boolean expression over its
+    cell data and convert only those cells.
+
+    Args:
+        volelement (:class:`omf.volume.VolumeElement`): the volume to query
+        expression (str or callable): the selection expression (see
+            :mod:`omfvista.query`) or a callable taking a dictionary of the
+            chunks of the cell data arrays and returning a boolean mask
+        attributes (list(str)): the names of the data arrays to keep on the
+            output. All cell data arrays are kept by default (vertex data is
+            not carried over).
+        output (str): ``"cells"`` for a hexahedral mesh of the selected cells
+            or ``"points"`` for a point cloud of their centers
+        origin (tuple(float)): the origin of the project (see
+            :func:`omfvista.volume_to_vtk`)
+        chunk_size (int): the number of cells evaluated at a time
+        workers (int): the number of threads evaluating chunks. Chunks are
+            evaluated in the calling thread by default.
+
+    Return:
+        :class:`pyvista.UnstructuredGrid` or :class:`pyvista.PolyData`: the
+        selected cells with their attributes and ``"vtkOriginalCellIds"``,
+        their ids in the grid converted by :func:`omfvista.volume_to_vtk`
+    """
+    if output not in OUTPUTS:
+        raise ValueError("Output ({}) is not supported. Use one of {}".format(output, OUTPUTS))
+    geom = volelement.geometry
+    shape = get_volume_shape(geom)
+    arrays = {
+        name: arr
+        for name, (arr, _, on_nodes) in get_volume_arrays(volelement).items()
+        if not on_nodes
+    }
+    if callable(expression):
+        selector = expression
+    else:
+        selector = Expression(expression)
+        missing = set(selector.names) - set(arrays)
+        if missing:
+            raise KeyError("Volume has no cell data named {}".format(sorted(missing)))
+        arrays = {name: arrays[name] for name in selector.names}
+    found = map_chunks(
+        lambda start, stop: _select_chunk(selector, arrays, start, stop),
+        int(np.prod(shape)),
+        chunk_size,
+        workers=workers,
+    )
+    ids = np.concatenate(found) if found else np.zeros(0, dtype=np.intp)
+    return _selection(volelement, ids, attributes, output, origin)
+
+
+def _selection(volelement, ids, attributes=None, output="cells", origin=(0.0, 0.0, 0.0)):
+    """Convert the cells of a volume element with the given flat (C order) ids
+    and their cell data (see :func:`query_volume`)
+    """
+    geom = volelement.geometry
+    shape = get_volume_shape(geom)
+    ijk = np.unravel_index(ids, shape)
+
+    if output == "points":
+        result = pyvista.PolyData(_centers(geom, ijk, origin))
+        data = result.point_data
+    else:
+        points, cells = _hexahedra(geom, ijk, origin)
+        celltypes = np.full(len(ids), pyvista.CellType.HEXAHEDRON, dtype=np.uint8)
+        result = pyvista.UnstructuredGrid(cells.ravel(), celltypes, points)
+        data = result.cell_data
+    for name, (arr, _, on_nodes) in get_volume_arrays(volelement, names=attributes).items():
+        if not on_nodes:
+            data[name] = arr[ids]
+    data["vtkOriginalCellIds"] = np.ravel_multi_index(ijk, shape, order="F")
+    return result
+
+
+query_volume.__displayname__ = "Query Volume"
@@ -0,0 +1,146 @@
+"""Sample the data of gridded volumes at arbitrary points without building
+their VTK grid.
+
+Example Use
+-----------
+
+Sample the attributes of a block model onto the vertices of drillholes:
+
+.. code-block:: python
+
+    import omf
+    import omfvista
+
+    project = omf.OMFReader('test_file.omf').get_project()
+    holes = omfvista.wrap(project.elements[1], origin=project.origin)
+    sampled = omfvista.sample_volume(
+        project.elements[4], holes, method='linear', origin=project.origin
+    )
+
+Points are transformed into the coordinates of the grid (undoing the rotation
+by its axes) and located with :func:`numpy.searchsorted` on the cumulative
+cell sizes, so no cell locator is built and the cost is linear in the number
+of points. Points are handled in chunks to bound the memory used by
+temporaries.
+"""
+
+__all__ = [
+    "sample_volume",
+]
+
+__displayname__ = "Sampling"
+
+import numpy as np
+
+from omfvista.utilities import is_pyvista_dataset
+from omfvista.volume import get_volume_arrays, get_volume_edges, volume_to_grid_coordinates
+
+METHODS = ("nearest", "linear")
+
+# Number of points sampled at a time
+CHUNK_SIZE = 2**20
+
+
+def _nearest(bounds, u):
+    """Index of the interval of ``bounds`` holding each value"""
+    return np.clip(np.searchsorted(bounds, u, side="right") - 1, 0, len(bounds) - 2)
+
+
+def _linear(coords, u):
+    """The two neighbouring coordinates of each value and the weight of the
+    second (values past the first or last coordinate take its value)
+    """
+    if len(coords) == 1:
+        i = np.zeros(len(u), dtype=np.intp)
+        return i, i, np.zeros(len(u))
+    i = np.clip(np.searchsorted(coords, u, side="right") - 1, 0, len(coords) - 2)
+    t = np.clip((u - coords[i]) / (coords[i + 1] - coords[i]), 0.0, 1.0)
+    return i, i + 1, t
+
+
+def _sample_chunk(local, edges, arr, shape, on_nodes, method):
+    """Sample a flat array at points given in grid coordinates"""
+    inside = np.ones(len(local), dtype=bool)
+    for axis in range(3):
+        inside &= (local[:, axis] >= edges[axis][0]) & (local[:, axis] <= edges[axis][-1])
+    strides = (shape[1] * shape[2], shape[2], 1)
+    if method == "nearest":
+        index = np.zeros(len(local), dtype=np.intp)
+        for axis in range(3):
+            bounds = edges[axis]
+            if on_nodes:
+                bounds = np.r_[bounds[0], (bounds[1:] + bounds[:-1]) / 2.0, bounds[-1]]
+            index += _nearest(bounds, local[:, axis]) * strides[axis]
+        values = arr[index].astype(float)
+    else:
+        located = []
+        for axis in range(3):
+            coords = edges[axis]
+            if not on_nodes:
+                coords = (coords[1:] + coords[:-1]) / 2.0
+            located.append(_linear(coords, local[:, axis]))
+        values = np.zeros(len(local))
+        for corner in range(8):
+            index = np.zeros(len(local), dtype=np.intp)
+            weight = np.ones(len(local))
+            for axis in range(3):
+                low, high, t = located[axis]
+                if (corner >> axis) & 1:
+                    index += high * strides[axis]
+                    weight *= t
+                else:
+                    index += low * strides[axis]
+                    weight *= 1.0 - t
+            values += weight * arr[index]
+    values[~inside] = np.nan
+    return values
+
+
+def sample_volume(
+    volelement, points, names=None, method="nearest", origin=(0.0, 0.0, 0.0), chunk_size=CHUNK_SIZE
+):
+    """Sample the data of a volume element at arbitrary points.
+
+    Args:
+        volelement (:class:`omf.volume.VolumeElement`): the volume to sample
+        points (np.ndarray or :class:`pyvista.DataSet`): an (N, 3) array of
+            points or a data object to sample at the points of
+        names (list(str)): the names of the data arrays to sample. All data
+            arrays are sampled by default.
+        method (str): ``"nearest"`` takes the value of the cell (or node)
+            holding each point and ``"linear"`` interpolates trilinearly
+            between cell centers (or nodes)
+        origin (tuple(float)): the origin the points are shifted by (the
+            origin of the project when the points were converted with it)
+        chunk_size (int): the number of points sampled at a time
+
+    Return:
+        dict or :class:`pyvista.DataSet`: the sampled values of each array
+        (NaN outside of the volume). For a data object, a shallow copy of it
+        with the sampled values as point data.
+    """
+    if method not in METHODS:
+        raise ValueError("Method ({}) is not supported. Use one of {}".format(method, METHODS))
+    geom = volelement.geometry
+    dataset = None
+    if is_pyvista_dataset(points):
+        dataset = points
+        points = dataset.points
+    points = np.asarray(points, dtype=float).reshape(-1, 3)
+    edges = get_volume_edges(geom)
+    arrays = get_volume_arrays(volelement, names)
+    sampled = {name: np.empty(len(points)) for name in arrays}
+    for start in range(0, len(points), chunk_size):
+        stop = start + chunk_size
+        local = volume_to_grid_coordinates(geom, points[start:stop], origin=origin)
+        for name, (arr, shape, on_nodes) in arrays.items():
+            sampled[name][start:stop] = _sample_chunk(local, edges, arr, shape, on_nodes, method)
+    if dataset is None:
+        return sampled
+    output = dataset.copy(deep=False)
+    for name, values in sampled.items():
+        output.point_data[name] = values
+    return output
+
+
+sample_volume.__displayname__ = "Sample Volume"
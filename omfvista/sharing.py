@@ -0,0 +1,261 @@
+"""Hand converted VTK data objects from worker processes back to the parent
+without pickling their arrays.
+
+Example Use
+-----------
+
+Convert the elements of a project in a pool of worker processes:
+
+.. code-block:: python
+
+    import omfvista
+
+    data = omfvista.load_project_parallel('test_file.omf', processes=4)
+
+A worker dumps the points, cell connectivity and data arrays of its output to
+``.npy`` files in a temporary directory (on the RAM backed ``/dev/shm`` where
+available) and only sends a small handle describing them to the parent. The
+parent memory maps the files and builds the VTK data objects directly on top
+of the mapped memory, so each array is neither copied nor pickled.
+
+The same handoff can be used in custom pools with :func:`dump_dataset` and
+:func:`load_dataset`.
+
+String arrays (like categorical labels) are handed off too, but VTK stores
+them in its own string arrays so they are copied rather than mapped. Arrays of
+any other non-numeric type are dropped with a warning.
+"""
+
+__all__ = [
+    "dump_dataset",
+    "load_dataset",
+    "load_project_parallel",
+    "shared_directory",
+]
+
+__displayname__ = "Shared Memory"
+
+import multiprocessing
+import os
+import shutil
+import tempfile
+import warnings
+
+import numpy as np
+import pyvista
+from vtkmodules.vtkCommonDataModel import vtkUnstructuredGrid
+
+from omfvista.utilities import POLY_CELLS, cell_arrays, to_cell_array
+
+# RAM backed file system used for the handoff where available
+SHARED_MEMORY_DIRECTORY = "/dev/shm"
+
+ASSOCIATIONS = ("point_data", "cell_data")
+
+
+def shared_directory():
+    """The directory to create handoff files in: ``/dev/shm`` if it is
+    available so nothing is written to disk, otherwise the default temporary
+    directory.
+    """
+    if os.path.isdir(SHARED_MEMORY_DIRECTORY) and os.access(SHARED_MEMORY_DIRECTORY, os.W_OK):
+        return SHARED_MEMORY_DIRECTORY
+    return None
+
+
+def dump_dataset(dataset, directory=None):
+    """Dump the arrays of a VTK data object to ``.npy`` files so that another
+    process can rebuild it with :func:`load_dataset`.
+
+    Supports the :class:`pyvista.PolyData`, :class:`pyvista.StructuredGrid`,
+    :class:`pyvista.RectilinearGrid` and :class:`pyvista.UnstructuredGrid`
+    outputs of the converters. Numeric and string data arrays are dumped;
+    arrays of other types are dropped with a warning.
+
+    Args:
+        dataset (pyvista.DataSet): the data object to dump
+        directory (str): the directory to create the files in. Defaults to
+            :func:`shared_directory`.
+
+    Return:
+        dict: a small, picklable handle describing the dumped data object
+    """
+    if directory is None:
+        directory = shared_directory()
+    path = tempfile.mkdtemp(prefix="omfvista-", dir=directory)
+    arrays = {}
+
+    def save(key, arr):
+        filename = key + ".npy"
+        np.save(os.path.join(path, filename), np.ascontiguousarray(arr))
+        arrays[key] = filename
+
+    kind = dataset.GetClassName()
+    handle = {"type": kind, "directory": path, "arrays": arrays}
+    if kind == "vtkRectilinearGrid":
+        handle["dimensions"] = list(dataset.dimensions)
+        save("x", dataset.x)
+        save("y", dataset.y)
+        save("z", dataset.z)
+    elif kind in ("vtkPolyData", "vtkStructuredGrid", "vtkUnstructuredGrid"):
+        save("points", dataset.points)
+        if kind == "vtkStructuredGrid":
+            handle["dimensions"] = list(dataset.dimensions)
+        elif kind == "vtkPolyData":
+            for key, (getter, _) in POLY_CELLS.items():
+                cells = getattr(dataset, getter)()
+                if cells.GetNumberOfCells():
+                    offsets, connectivity = cell_arrays(cells)
+                    save(key + "_offsets", offsets)
+                    save(key + "_connectivity", connectivity)
+        else:
+            offsets, connectivity = cell_arrays(dataset.GetCells())
+            save("offsets", offsets)
+            save("connectivity", connectivity)
+            save("celltypes", dataset.celltypes)
+    else:
+        shutil.rmtree(path, ignore_errors=True)
+        raise TypeError("Data object of type ({}) cannot be shared.".format(kind))
+    for association in ASSOCIATIONS:
+        attributes = getattr(dataset, association)
+        names = []
+        for name in attributes.keys():
+            arr = attributes[name]
+            if arr.dtype.kind not in "biufSU":
+                warnings.warn(
+                    "Array ({}) of type ({}) cannot be shared and is dropped.".format(
+                        name, arr.dtype
+                    )
+                )
+                continue
+            save("{}_{}".format(association, len(names)), arr)
+            names.append(name)
+        handle[association] = names
+        active = attributes.active_scalars_name
+        handle["active_" + association] = active if active in names else None
+    return handle
+
+
+def _remove(handle):
+    """Remove the files of a handle. Mapped arrays stay valid on POSIX systems;
+    elsewhere the files are left for the enclosing directory to clean up.
+    """
+    try:
+        shutil.rmtree(handle["directory"])
+    except OSError:
+        pass
+
+
+def load_dataset(handle, cleanup=True):
+    """Rebuild a VTK data object dumped by :func:`dump_dataset`. The arrays
+    are memory mapped (copy-on-write) and wrapped by VTK without copying.
+
+    Args:
+        handle (dict): the handle returned by :func:`dump_dataset`
+        cleanup (bool): remove the dumped files once they are mapped
+
+    Return:
+        pyvista.DataSet: the rebuilt data object
+    """
+    path, arrays = handle["directory"], handle["arrays"]
+
+    def load(key):
+        return np.load(os.path.join(path, arrays[key]), mmap_mode="c")
+
+    kind = handle["type"]
+    if kind == "vtkRectilinearGrid":
+        output = pyvista.RectilinearGrid()
+        output.SetDimensions(handle["dimensions"])
+        output.SetXCoordinates(pyvista.convert_array(load("x")))
+        output.SetYCoordinates(pyvista.convert_array(load("y")))
+        output.SetZCoordinates(pyvista.convert_array(load("z")))
+    elif kind == "vtkStructuredGrid":
+        output = pyvista.StructuredGrid()
+        output.SetDimensions(handle["dimensions"])
+        output.SetPoints(pyvista.vtk_points(load("points"), deep=False))
+    elif kind == "vtkPolyData":
+        output = pyvista.PolyData()
+        output.SetPoints(pyvista.vtk_points(load("points"), deep=False))
+        for key, (_, setter) in POLY_CELLS.items():
+            if key + "_offsets" in arrays:
+                cells = to_cell_array(load(key + "_offsets"), load(key + "_connectivity"))
+                getattr(output, setter)(cells)
+    elif kind == "vtkUnstructuredGrid":
+        grid = vtkUnstructuredGrid()
+        grid.SetPoints(pyvista.vtk_points(load("points"), deep=False))
+        celltypes = pyvista.convert_array(np.asarray(load("celltypes"), dtype=np.uint8))
+        grid.SetCells(celltypes, to_cell_array(load("offsets"), load("connectivity")))
+        output = pyvista.wrap(grid)
+    else:
+        raise TypeError("Data object of type ({}) cannot be shared.".format(kind))
+    for association in ASSOCIATIONS:
+        attributes = getattr(output, association)
+        for i, name in enumerate(handle[association]):
+            attributes.set_array(load("{}_{}".format(association, i)), name, deep_copy=False)
+        if handle["active_" + association] is not None:
+            attributes.active_scalars_name = handle["active_" + association]
+    if cleanup:
+        _remove(handle)
+    return output
+
+
+def _convert_element(job):
+    """Worker: convert an element and dump it for the parent"""
+    from omfvista.fileio import ProjectFile
+    from omfvista.utilities import get_textures
+    from omfvista.wrapper import wrap
+
+    filename, uid, directory, load_textures = job
+    with ProjectFile(filename) as pfile:
+        element = pfile.read_element(uid)
+        origin = np.array(pfile.origin)
+    output = wrap(element, origin=origin)
+    # Textures are small next to the data objects and are sent as images
+    images = []
+    if load_textures and getattr(element, "textures", None):
+        images = [texture.to_array() for texture in get_textures(element)]
+    return element.name, dump_dataset(output, directory), images
+
+
+def load_project_parallel(filename, processes=None, load_textures=False):
+    """Loads an OMF project file into a :class:`pyvista.MultiBlock` dataset,
+    converting its elements in a pool of worker processes (see
+    :func:`omfvista.load_project`).
+
+    The converted data objects are handed back to this process through
+    memory mapped files rather than pickled.
+
+    Args:
+        filename (str): the OMF project file to load
+        processes (int): the number of worker processes. Defaults to the
+            number of CPUs.
+        load_textures (bool): also return a dictionary of the textures of
+            each element
+    """
+    from omfvista.fileio import ProjectFile
+
+    with ProjectFile(filename) as pfile:
+        uids = list(pfile.project["elements"])
+    directory = tempfile.mkdtemp(prefix="omfvista-", dir=shared_directory())
+    jobs = [(filename, uid, directory, load_textures) for uid in uids]
+    data = pyvista.MultiBlock()
+    textures = {}
+    pool = multiprocessing.Pool(processes=processes)
+    try:
+        for name, handle, images in pool.imap(_convert_element, jobs):
+            data[name] = load_dataset(handle)
+            if images:
+                textures[name] = [pyvista.numpy_to_texture(img) for img in images]
+    finally:
+        pool.close()
+        pool.join()
+        shutil.rmtree(directory, ignore_errors=True)
+    if load_textures:
+        return data, textures
+    return data
+
+
+dump_dataset.__displayname__ = "Dump Data Object"
+load_dataset.__displayname__ = "Load Dumped Data Object"
+load_project_parallel.__displayname__ = "Load Project File in Parallel"
+shared_directory.__displayname__ = "Shared Directory"
@@ -0,0 +1,113 @@
+"""Extract orthogonal slices of gridded volumes straight from their OMF data
+arrays without building the VTK grid of the whole volume.
+
+Example Use
+-----------
+
+A plan through the 20th layer of cells of a block model along its ``w`` axis:
+
+.. code-block:: python
+
+    import omf
+    import omfvista
+
+    project = omf.OMFReader('test_file.omf').get_project()
+    plan = omfvista.slice_volume(project.elements[4], 'w', index=20, origin=project.origin)
+
+or the section through the cells 150 m along its ``u`` axis:
+
+.. code-block:: python
+
+    section = omfvista.slice_volume(project.elements[4], 'u', offset=150.0)
+
+A slice is the layer of cells one cell thick, so it carries the cell data of
+the volume unchanged. It is gathered with a strided view of the reshaped data
+arrays, so its cost only depends on the size of the slice.
+"""
+
+__all__ = [
+    "slice_volume",
+]
+
+__displayname__ = "Slicing"
+
+import numpy as np
+import pyvista
+
+from omfvista.volume import get_volume_arrays, get_volume_edges, get_volume_rotation
+
+AXES = ("u", "v", "w")
+
+
+def _slice_axis(axis):
+    """The position of an axis given by name or number"""
+    if axis in AXES:
+        return AXES.index(axis)
+    if axis in (0, 1, 2):
+        return int(axis)
+    raise ValueError("Axis ({}) is not supported. Use one of {}".format(axis, AXES))
+
+
+def _slice_index(edges, index, offset):
+    """The index of the layer of cells to slice along an axis"""
+    n = len(edges) - 1
+    if (index is None) == (offset is None):
+        raise ValueError("Give either the index or the offset of the slice.")
+    if offset is not None:
+        if not 0.0 <= offset <= edges[-1] - edges[0]:
+            raise ValueError("Offset ({}) is outside of the volume.".format(offset))
+        # Snap to the boundaries of the cell holding the offset
+        index = min(int(np.searchsorted(edges - edges[0], offset, side="right")) - 1, n - 1)
+    if index < 0:
+        index += n
+    if not 0 <= index < n:
+        raise IndexError("Slice index ({}) is out of range for {} cells.".format(index, n))
+    return index
+
+
+def slice_volume(volelement, axis, index=None, offset=None, origin=(0.0, 0.0, 0.0), names=None):
+    """Extract a layer of cells of a volume element along one of its axes.
+
+    Args:
+        volelement (:class:`omf.volume.VolumeElement`): the volume to slice
+        axis (str or int): ``"u"``, ``"v"`` or ``"w"`` (or 0, 1 or 2)
+        index (int): the index of the layer of cells along the axis
+            (negative indices count from the end)
+        offset (float): the distance along the axis from the start of the
+            volume. The layer of cells holding it is taken.
+        origin (tuple(float)): the origin of the project (see
+            :func:`omfvista.volume_to_vtk`)
+        names (list(str)): the names of the data arrays to slice. All data
+            arrays are sliced by default.
+
+    Return:
+        :class:`pyvista.StructuredGrid`: the layer of cells (in place and
+        rotated like the converted volume) with the data of the volume
+    """
+    geom = volelement.geometry
+    axis = _slice_axis(axis)
+    edges = list(get_volume_edges(geom))
+    index = _slice_index(edges[axis], index, offset)
+    edges[axis] = edges[axis][index : index + 2]
+
+    # Build the nodes of the layer only
+    xx, yy, zz = np.meshgrid(*edges, indexing="ij")
+    points = np.c_[xx.ravel("F"), yy.ravel("F"), zz.ravel("F")]
+    points = points.dot(get_volume_rotation(geom)) + np.array(origin, dtype=float)
+
+    output = pyvista.StructuredGrid()
+    output.points = points
+    output.dimensions = tuple(len(e) for e in edges)
+    layer = [slice(None)] * 3
+    for name, (arr, shape, on_nodes) in get_volume_arrays(volelement, names).items():
+        layer[axis] = slice(index, index + 2) if on_nodes else slice(index, index + 1)
+        # A strided view of the layer, only copied when flattened for VTK
+        values = arr.reshape(shape)[tuple(layer)].ravel(order="F")
+        if on_nodes:
+            output.point_data[name] = values
+        else:
+            output.cell_data[name] = values
+    return output
+
+
+slice_volume.__displayname__ = "Slice Volume"
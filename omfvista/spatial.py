@@ -0,0 +1,240 @@
+"""Persistent spatial indices (k-d trees) of converted point sets and line sets
+for batch nearest neighbour and radius queries.
+
+Example Use
+-----------
+
+Build the index of a point set once and query it for millions of points:
+
+.. code-block:: python
+
+    import omfvista
+
+    data = omfvista.load_project('test_file.omf')
+    index = omfvista.build_spatial_index(data['Random Points'])
+    distances, ids = index.query(points, k=5)
+    offsets, neighbours = index.query_radius(points, 25.0)
+
+The samples of a line set are its segments, so its index holds the segment
+midpoints. Find the samples within 25 m of a surface:
+
+.. code-block:: python
+
+    index = omfvista.build_spatial_index(data['wolfpass_WP_assay'])
+    near = index.within(data['Topography'].points, 25.0)
+
+Indices are built with :class:`scipy.spatial.cKDTree` (SciPy is an optional
+dependency, only imported when an index is built) and can be stored in a
+cache directory so that the elements are never converted again to query
+them. The indexed locations are stored as plain arrays in an ``.npz`` file
+and the tree is rebuilt from them when the index is loaded:
+
+.. code-block:: python
+
+    cache = omfvista.export_project('test_file.omf', 'test_file_cache', spatial_index=True)
+    index = cache.spatial_index('Random Points')
+"""
+
+__all__ = [
+    "SpatialIndex",
+    "build_spatial_index",
+    "build_spatial_indices",
+]
+
+__displayname__ = "Spatial"
+
+import numpy as np
+
+LOCATIONS = ("points", "cells")
+
+# Version of the arrays written by SpatialIndex.save
+INDEX_VERSION = 1
+
+# Number of points queried at a time by radius searches
+CHUNK_SIZE = 2**18
+
+
+def _kdtree(points, leafsize):
+    """Build a k-d tree, importing SciPy on first use"""
+    try:
+        from scipy.spatial import cKDTree
+    except ImportError:
+        raise ImportError("Spatial indices require SciPy: pip install scipy")
+    return cKDTree(points, leafsize=leafsize, balanced_tree=False, compact_nodes=False)
+
+
+def _query_points(points):
+    """An (N, 3) float array of query points (or the points of a data object)"""
+    points = getattr(points, "points", points)
+    return np.asarray(points, dtype=float).reshape(-1, 3)
+
+
+class SpatialIndex(object):
+    """A k-d tree over the points (or cell centers) of a data object.
+
+    Args:
+        points (np.ndarray): the (N, 3) locations of the samples to index
+        location (str): ``"points"`` or ``"cells"``, what the samples are
+        leafsize (int): the number of points at which the tree stops
+            splitting
+    """
+
+    def __init__(self, points, location="points", leafsize=16):
+        if location not in LOCATIONS:
+            raise ValueError(
+                "Location ({}) is not supported. Use one of {}".format(location, LOCATIONS)
+            )
+        self.location = location
+        self.leafsize = leafsize
+        self.tree = _kdtree(_query_points(points), leafsize)
+
+    def __repr__(self):
+        return "<SpatialIndex ({:d} {})>".format(len(self), self.location)
+
+    def __len__(self):
+        return int(self.tree.n)
+
+    @property
+    def points(self):
+        """The indexed locations"""
+        return self.tree.data
+
+    def query(self, points, k=1, distance_upper_bound=np.inf, workers=-1):
+        """Find the ``k`` nearest samples of each query point.
+
+        Args:
+            points (np.ndarray or :class:`pyvista.DataSet`): the (N, 3) query
+                points or a data object to query at the points of
+            k (int): the number of neighbours
+            distance_upper_bound (float): neighbours further than this are
+                not returned
+            workers (int): the number of threads (``-1`` uses all of them)
+
+        Return:
+            tuple(np.ndarray): the distances and the indices of the
+            neighbours, of shape (N,) when ``k`` is 1 or else (N, k). Missing
+            neighbours have an infinite distance and the index ``len(self)``.
+        """
+        return self.tree.query(
+            _query_points(points), k=k, distance_upper_bound=distance_upper_bound, workers=workers
+        )
+
+    def query_radius(self, points, radius, workers=-1, chunk_size=CHUNK_SIZE):
+        """Find all of the samples within ``radius`` of each query point.
+
+        Args:
+            points (np.ndarray or :class:`pyvista.DataSet`): the (N, 3) query
+                points or a data object to query at the points of
+            radius (float): the search radius
+            workers (int): the number of threads (``-1`` uses all of them)
+            chunk_size (int): the number of points queried at a time
+
+        Return:
+            tuple(np.ndarray): ``offsets`` of length N + 1 and the flat
+            ``indices`` of the neighbours: the neighbours of query point
+            ``i`` are ``indices[offsets[i]:offsets[i + 1]]``
+        """
+        points = _query_points(points)
+        counts = np.zeros(len(points), dtype=np.intp)
+        indices = []
+        for start in range(0, len(points), chunk_size):
+            found = self.tree.query_ball_point(
+                points[start : start + chunk_size], radius, workers=workers, return_sorted=False
+            )
+            counts[start : start + len(found)] = [len(f) for f in found]
+            indices.extend(np.asarray(f, dtype=np.intp) for f in found)
+        offsets = np.zeros(len(points) + 1, dtype=np.intp)
+        np.cumsum(counts, out=offsets[1:])
+        indices = np.concatenate(indices) if indices else np.zeros(0, dtype=np.intp)
+        return offsets, indices
+
+    def within(self, points, radius, workers=-1):
+        """Which samples are within ``radius`` of any of the given points
+        (for example the vertices of a surface)
+
+        Return:
+            np.ndarray: a boolean mask over the indexed samples
+        """
+        other = _kdtree(_query_points(points), 16)
+        distances, _ = other.query(self.points, k=1, distance_upper_bound=radius, workers=workers)
+        return np.isfinite(distances)
+
+    def save(self, filename):
+        """Write the indexed locations (and how they were indexed) to an
+        ``.npz`` file
+        """
+        # Through a file object, so that no extension is appended
+        with open(filename, "wb") as f:
+            np.savez(
+                f,
+                version=INDEX_VERSION,
+                points=self.points,
+                location=self.location,
+                leafsize=self.leafsize,
+            )
+
+    @classmethod
+    def load(cls, filename):
+        """Read an index written by :meth:`save`, rebuilding its tree"""
+        with np.load(filename, allow_pickle=False) as arrays:
+            if int(arrays.get("version", -1)) != INDEX_VERSION:
+                raise ValueError("({}) does not hold a spatial index.".format(filename))
+            return cls(
+                arrays["points"], location=str(arrays["location"]), leafsize=int(arrays["leafsize"])
+            )
+
+
+def build_spatial_index(dataset, location=None, leafsize=16):
+    """Build the spatial index of a converted point set or line set.
+
+    Args:
+        dataset (:class:`pyvista.DataSet`): the converted element
+        location (str): index the ``"points"`` or the ``"cells"`` (their
+            centers). Defaults to the cells of data objects with lines (the
+            segments of a line set) and to the points otherwise.
+        leafsize (int): the number of points at which the tree stops
+            splitting
+
+    Return:
+        :class:`SpatialIndex`
+    """
+    if location is None:
+        location = "cells" if getattr(dataset, "n_lines", 0) else "points"
+    if location == "cells":
+        points = dataset.cell_centers().points
+    else:
+        points = dataset.points
+    return SpatialIndex(points, location=location, leafsize=leafsize)
+
+
+def build_spatial_indices(data, names=None, leafsize=16):
+    """Build the spatial index of each point set and line set of a converted
+    project.
+
+    Args:
+        data (:class:`pyvista.MultiBlock`): the converted project (see
+            :func:`omfvista.load_project`)
+        names (list(str)): the names of the elements to index. Every element
+            holding only vertices or lines is indexed by default.
+
+    Return:
+        dict: the :class:`SpatialIndex` of each element by name
+    """
+    indices = {}
+    for name in data.keys() if names is None else names:
+        dataset = data[name]
+        if names is None and not _indexable(dataset):
+            continue
+        indices[name] = build_spatial_index(dataset, leafsize=leafsize)
+    return indices
+
+
+def _indexable(dataset):
+    """Whether a data object is a point set or line set"""
+    n_verts = getattr(dataset, "n_verts", 0)
+    n_lines = getattr(dataset, "n_lines", 0)
+    return dataset.n_cells > 0 and n_verts + n_lines == dataset.n_cells
+
+
+build_spatial_index.__displayname__ = "Build Spatial Index"
+build_spatial_indices.__displayname__ = "Build Spatial Indices"
@@ -0,0 +1,322 @@
+"""Bounds and attribute statistics of converted elements, gathered once so
+that culling and colormap ranges never need to scan the arrays again.
+
+Example Use
+-----------
+
+.. code-block:: python
+
+    import omfvista
+
+    data = omfvista.load_project('test_file.omf')
+    index = omfvista.compute_statistics(data)
+    index.range('Block Model', 'CU_pct')
+    index.cull([0, 100, 0, 100, -50, 0])
+
+or gather them while loading, as each element is converted:
+
+.. code-block:: python
+
+    index = omfvista.StatisticsIndex()
+    data = omfvista.load_project('test_file.omf', statistics=index)
+
+The statistics of a cache directory are stored in its index when it is
+exported, so they are available without reading any element:
+
+.. code-block:: python
+
+    index = omfvista.ProjectCache('test_file_cache').statistics()
+
+Arrays are reduced in blocks that fit in the CPU cache: the NaN and infinite
+counts, minimum, maximum and sum of each block are taken while it is in cache,
+so the array is swept once for them (with no masked copy of the whole array).
+The histogram spans the final range, so it takes a second sweep.
+"""
+
+__all__ = [
+    "ArrayStatistics",
+    "ElementStatistics",
+    "StatisticsIndex",
+    "array_statistics",
+    "compute_statistics",
+]
+
+__displayname__ = "Statistics"
+
+from collections import namedtuple
+
+import numpy as np
+
+# Number of histogram bins of each array
+BINS = 32
+
+# Number of values reduced at a time
+BLOCK_SIZE = 2**16
+
+ArrayStatistics = namedtuple(
+    "ArrayStatistics",
+    [
+        "name",
+        "association",
+        "count",
+        "nan_count",
+        "inf_count",
+        "minimum",
+        "maximum",
+        "mean",
+        "histogram",
+        "bin_edges",
+    ],
+)
+ArrayStatistics.__doc__ = """Statistics of a data array.
+
+``count`` is the number of values and ``nan_count`` and ``inf_count`` the
+number of those that are NaN and infinite; ``minimum``, ``maximum``, ``mean``
+and the histogram leave them out (the first three are ``None`` when no value
+is finite). Arrays with several components are summarized by their
+magnitude. The ``histogram`` has ``len(bin_edges) - 1`` bins spanning the
+finite range of the array.
+"""
+
+ElementStatistics = namedtuple(
+    "ElementStatistics", ["name", "dataset", "bounds", "n_points", "n_cells", "arrays"]
+)
+ElementStatistics.__doc__ = """Bounds, size and array statistics of a
+converted element. ``arrays`` maps ``(association, name)`` to
+:class:`ArrayStatistics`.
+"""
+
+
+def _float(value):
+    """A JSON friendly float (or None)"""
+    return None if value is None else float(value)
+
+
+def array_statistics(arr, name="", association="point", bins=BINS):
+    """Compute the statistics of an array.
+
+    Args:
+        arr (np.ndarray): the values
+        name (str): the name of the array
+        association (str): ``"point"`` or ``"cell"``
+        bins (int): the number of histogram bins
+
+    Return:
+        :class:`ArrayStatistics`
+    """
+    arr = np.asarray(arr)
+    if arr.dtype.kind not in "biuf":
+        raise TypeError("Array ({}) is not numeric.".format(name))
+    if arr.ndim > 1:
+        arr = np.linalg.norm(arr.reshape(len(arr), -1), axis=1)
+    arr = arr.ravel()
+
+    def blocks():
+        """The finite values of each block of the array and the number of
+        NaN values left out
+        """
+        for start in range(0, arr.size, BLOCK_SIZE):
+            block = arr[start : start + BLOCK_SIZE]
+            nans = 0
+            if block.dtype.kind == "f":
+                finite = np.isfinite(block)
+                if not finite.all():
+                    nans = int(np.count_nonzero(np.isnan(block)))
+                    block = block[finite]
+            yield block, nans
+
+    count = 0
+    nan_count = 0
+    total = 0.0
+    minimum = maximum = mean = None
+    for block, nans in blocks():
+        nan_count += nans
+        if not block.size:
+            continue
+        low, high = block.min(), block.max()
+        minimum = low if minimum is None else min(minimum, low)
+        maximum = high if maximum is None else max(maximum, high)
+        total += block.sum(dtype=float)
+        count += block.size
+    histogram = np.zeros(bins, dtype=np.int64)
+    bin_edges = np.zeros(bins + 1)
+    if count:
+        mean = total / count
+        for block, _ in blocks():
+            counts, bin_edges = np.histogram(block, bins=bins, range=(minimum, maximum))
+            histogram += counts
+    return ArrayStatistics(
+        name,
+        association,
+        int(arr.size),
+        nan_count,
+        int(arr.size - count - nan_count),
+        _float(minimum),
+        _float(maximum),
+        _float(mean),
+        [int(h) for h in histogram],
+        [float(e) for e in bin_edges],
+    )
+
+
+def _element_statistics(name, dataset, bins):
+    """Compute the statistics of a converted element"""
+    arrays = {}
+    for association, attributes in (("point", dataset.point_data), ("cell", dataset.cell_data)):
+        for key in attributes.keys():
+            arr = attributes[key]
+            if arr.dtype.kind not in "biuf":
+                continue
+            arrays[(association, key)] = array_statistics(arr, key, association, bins=bins)
+    return ElementStatistics(
+        name,
+        dataset.__class__.__name__,
+        tuple(float(b) for b in dataset.bounds),
+        int(dataset.n_points),
+        int(dataset.n_cells),
+        arrays,
+    )
+
+
+class StatisticsIndex(object):
+    """The statistics of the elements of a project by element name.
+
+    Args:
+        elements (list(ElementStatistics)): the statistics of each element
+    """
+
+    def __init__(self, elements=()):
+        self._elements = {}
+        for element in elements:
+            self._elements[element.name] = element
+
+    def __repr__(self):
+        return "<StatisticsIndex ({:d} elements)>".format(len(self))
+
+    def __len__(self):
+        return len(self._elements)
+
+    def __contains__(self, name):
+        return name in self._elements
+
+    def __iter__(self):
+        return iter(self._elements)
+
+    def __getitem__(self, name):
+        try:
+            return self._elements[name]
+        except KeyError:
+            raise KeyError("Element ({}) is not in the index.".format(name))
+
+    @property
+    def names(self):
+        """The names of the elements in the index"""
+        return list(self._elements)
+
+    def add(self, name, dataset, bins=BINS):
+        """Compute and add the statistics of a converted element (for
+        example while iterating over :func:`omfvista.iter_project`)
+        """
+        self._elements[name] = _element_statistics(name, dataset, bins)
+        return self._elements[name]
+
+    def bounds(self, name):
+        """The bounds of an element"""
+        return self[name].bounds
+
+    def array(self, name, array, association=None):
+        """The statistics of an array of an element
+
+        Args:
+            name (str): the name of the element
+            array (str): the name of the array
+            association (str): ``"point"`` or ``"cell"``. Point arrays are
+                looked up first by default.
+        """
+        arrays = self[name].arrays
+        associations = ("point", "cell") if association is None else (association,)
+        for association in associations:
+            if (association, array) in arrays:
+                return arrays[(association, array)]
+        raise KeyError("Element ({}) has no array named ({}).".format(name, array))
+
+    def range(self, name, array, association=None):
+        """The ``(minimum, maximum)`` of an array of an element, for
+        colormap ranges
+        """
+        stats = self.array(name, array, association=association)
+        return stats.minimum, stats.maximum
+
+    def cull(self, bounds):
+        """The names of the elements whose bounds intersect a box
+
+        Args:
+            bounds (tuple(float)): ``(xmin, xmax, ymin, ymax, zmin, zmax)``
+        """
+        names = []
+        for element in self._elements.values():
+            if all(
+                element.bounds[2 * i] <= bounds[2 * i + 1]
+                and bounds[2 * i] <= element.bounds[2 * i + 1]
+                for i in range(3)
+            ):
+                names.append(element.name)
+        return names
+
+    def to_dict(self):
+        """A JSON friendly description of the index (see :meth:`from_dict`)"""
+        return {
+            "elements": [
+                dict(
+                    element._asdict(),
+                    bounds=list(element.bounds),
+                    arrays=[stats._asdict() for stats in element.arrays.values()],
+                )
+                for element in self._elements.values()
+            ]
+        }
+
+    @classmethod
+    def from_dict(cls, description):
+        """Rebuild an index from :meth:`to_dict`"""
+        elements = []
+        for element in description["elements"]:
+            # Descriptions written before infinite values were counted
+            # have no inf_count
+            arrays = [
+                ArrayStatistics(**dict({"inf_count": 0}, **stats)) for stats in element["arrays"]
+            ]
+            elements.append(
+                ElementStatistics(
+                    element["name"],
+                    element["dataset"],
+                    tuple(element["bounds"]),
+                    element["n_points"],
+                    element["n_cells"],
+                    {(stats.association, stats.name): stats for stats in arrays},
+                )
+            )
+        return cls(elements)
+
+
+def compute_statistics(data, bins=BINS):
+    """Compute the statistics of each element of a converted project.
+
+    Args:
+        data (:class:`pyvista.MultiBlock`): the converted project (see
+            :func:`omfvista.load_project`). Empty blocks (like the elements
+            deferred by a memory budget) are skipped.
+        bins (int): the number of histogram bins of each array
+
+    Return:
+        :class:`StatisticsIndex`
+    """
+    index = StatisticsIndex()
+    for name in data.keys():
+        if data[name] is not None:
+            index.add(name, data[name], bins=bins)
+    return index
+
+
+array_statistics.__displayname__ = "Array Statistics"
+compute_statistics.__displayname__ = "Compute Statistics"
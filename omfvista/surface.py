@@ -13,7 +13,13 @@ import numpy as np
 import omf
 import pyvista
 
-from omfvista.utilities import add_data, add_texture_coordinates, check_orthogonal
+from omfvista.profiling import stage
+from omfvista.utilities import (
+    add_data,
+    add_texture_coordinates,
+    check_orientation,
+    check_orthogonal,
+)
 
 
 def surface_geom_to_vtk(surfgeom, origin=(0.0, 0.0, 0.0)):
@@ -24,20 +30,23 @@ def surface_geom_to_vtk(surfgeom, origin=(0.0, 0.0, 0.0)):
         surfgeom (:class:`omf.surface.SurfaceGeometry`): the surface geomotry to
             convert
     """
-    pts = np.array(surfgeom.vertices)
+    pts = np.array(surfgeom.vertices.array, dtype=float)
+    pts += np.array(origin)
     tris = np.array(surfgeom.triangles.array)
     faces = np.c_[np.full(len(tris), 3), tris]
-    output = pyvista.PolyData(pts, faces)
-    output.points += np.array(origin)
-    return output
+    return pyvista.PolyData(pts, faces)
 
 
-def surface_grid_geom_to_vtk(surfgridgeom, origin=(0.0, 0.0, 0.0)):
+def surface_grid_geom_to_vtk(surfgridgeom, origin=(0.0, 0.0, 0.0), implicit=False):
     """Convert the 2D grid to a :class:`pyvista.StructuredGrid` object.
 
     Args:
         surfgridgeom (:class:`omf.surface.SurfaceGridGeometry`): the surface
             grid geometry to convert
+        implicit (bool): if the grid is not rotated, return a flat
+            :class:`pyvista.RectilinearGrid` with the node offsets as an
+            ``offset_w`` point array instead of storing every node. Use
+            ``output.warp_by_scalar("offset_w")`` to get the surface.
 
     """
     surfgridgeom._validate_mesh()
@@ -49,6 +58,7 @@ def surface_grid_geom_to_vtk(surfgridgeom, origin=(0.0, 0.0, 0.0)):
         raise ValueError("axis_u, axis_v, and axis_w must be orthogonal")
     rotation_mtx = np.array([axis_u, axis_v, axis_w])
     ox, oy, oz = surfgridgeom.origin
+    origin = np.array(origin, dtype=float)
 
     # Make coordinates along each axis
     x = ox + np.cumsum(surfgridgeom.tensor_u)
@@ -56,50 +66,68 @@ def surface_grid_geom_to_vtk(surfgridgeom, origin=(0.0, 0.0, 0.0)):
     y = oy + np.cumsum(surfgridgeom.tensor_v)
     y = np.insert(y, 0, oy)
 
-    z = np.array([oz])
-
-    # Build out all nodes in the mesh
-    xx, yy, zz = np.meshgrid(x, y, z, indexing="ij")
-    (
-        xx,
-        yy,
-        zz,
-    ) = (
-        xx.ravel("F"),
-        yy.ravel("F"),
-        zz.ravel("F"),
-    )
-    zz += surfgridgeom.offset_w
-    points = np.c_[xx, yy, zz]
-
-    # Rotate the points based on the axis orientations
-    points = points.dot(rotation_mtx)
+    # Offsets of the nodes along axis_w (x varies fastest)
+    offset_w = getattr(surfgridgeom.offset_w, "array", None)
+    if offset_w is not None:
+        offset_w = np.asarray(offset_w, dtype=float).reshape(len(y), len(x))
+
+    if implicit and check_orientation(axis_u, axis_v, axis_w):
+        output = pyvista.RectilinearGrid(x + origin[0], y + origin[1], np.array([oz + origin[2]]))
+        if offset_w is None:
+            offset_w = np.zeros((len(y), len(x)))
+        output.point_data["offset_w"] = offset_w.ravel()
+        return output
+
+    # Write each coordinate of every node (x_i, y_j, oz + offset_w) rotated
+    # by the axes straight into a single buffer rather than building and
+    # stacking full size node arrays
+    points = np.empty((len(y), len(x), 3))
+    scratch = None
+    for c in range(3):
+        u, v, w = rotation_mtx[:, c]
+        np.add(v * y[:, None], u * x[None, :], out=points[:, :, c])
+        points[:, :, c] += w * oz + origin[c]
+        if offset_w is not None and w != 0:
+            if scratch is None:
+                scratch = np.empty_like(offset_w)
+            points[:, :, c] += np.multiply(offset_w, w, out=scratch)
 
     # Now build the output
     output = pyvista.StructuredGrid()
-    output.points = points
-    output.dimensions = len(x), len(y), len(z)
-
-    output.points += np.array(origin)
+    output.points = points.reshape(-1, 3)
+    output.dimensions = len(x), len(y), 1
     return output
 
 
-def surface_to_vtk(surfel, origin=(0.0, 0.0, 0.0)):
+def surface_to_vtk(surfel, origin=(0.0, 0.0, 0.0), implicit=False, mesh=None):
     """Convert the surface to a its appropriate VTK data object type.
 
     Args:
         surfel (:class:`omf.surface.SurfaceElement`): the surface element to
             convert
+        implicit (bool): convert unrotated surface grids to a flat
+            :class:`pyvista.RectilinearGrid` with an ``offset_w`` point array
+            (see :func:`surface_grid_geom_to_vtk`)
+        mesh (:class:`pyvista.DataSet`): the already converted geometry of
+            the surface. The output shares its points and cells rather than
+            converting the geometry again.
     """
 
     geom = surfel.geometry
+    kwargs = {}
 
     if isinstance(geom, omf.surface.SurfaceGeometry):
         builder = surface_geom_to_vtk
     elif isinstance(geom, omf.surface.SurfaceGridGeometry):
         builder = surface_grid_geom_to_vtk
-
-    output = builder(geom, origin=origin)
+        kwargs["implicit"] = implicit
+
+    if mesh is None:
+        with stage("geometry") as s:
+            output = builder(geom, origin=origin, **kwargs)
+            s.add(output)
+    else:
+        output = mesh.copy(deep=False)
 
     # Now add point data:
     add_data(output, surfel.data)
@@ -0,0 +1,183 @@
+"""A cache of converted textures keyed by the content of their images, so that
+an image draped on several elements (or loaded by several projects) is only
+decoded once.
+
+Example Use
+-----------
+
+Textures are converted through the shared in-process cache by default:
+
+.. code-block:: python
+
+    import omfvista
+
+    data, textures = omfvista.load_project('test_file.omf', load_textures=True)
+
+Keep decoded images on disk as well, so that other processes (or later runs)
+skip decoding the PNG files again:
+
+.. code-block:: python
+
+    from omfvista import textures
+
+    textures.set_texture_cache(
+        textures.TextureCache(max_bytes=2**30, directory='texture_cache')
+    )
+
+Textures are keyed by a digest of their compressed PNG bytes, which is cheap
+to compute compared to decoding them. Identical images give the same
+:class:`pyvista.Texture` object. The cache holds textures up to a budget of
+decoded bytes, evicting the least recently used ones beyond it. On disk,
+decoded images are stored as raw RGB ``.npy`` arrays named by their digest.
+"""
+
+__all__ = [
+    "TextureCache",
+    "get_texture_cache",
+    "set_texture_cache",
+]
+
+__displayname__ = "Textures"
+
+from collections import OrderedDict
+import hashlib
+import os
+import tempfile
+import threading
+
+import numpy as np
+import pyvista
+
+from omfvista.utilities import texture_image
+
+# The default budget of decoded bytes held in memory
+MAX_BYTES = 2**28
+
+
+def texture_digest(texture):
+    """A digest of the compressed image of an OMF texture"""
+    digest = hashlib.blake2b(digest_size=16)
+    image = texture.image
+    if hasattr(image, "getbuffer"):
+        with image.getbuffer() as buffer:
+            digest.update(buffer)
+    else:
+        image.seek(0)
+        digest.update(image.read())
+        image.seek(0)
+    return digest.hexdigest()
+
+
+class TextureCache(object):
+    """A least recently used cache of converted textures.
+
+    Args:
+        max_bytes (int): the budget of decoded image bytes held in memory.
+            Textures larger than the budget are converted but not kept.
+        directory (str): a directory to also store the decoded images in.
+            It is not limited by the budget.
+    """
+
+    def __init__(self, max_bytes=MAX_BYTES, directory=None):
+        self.max_bytes = max_bytes
+        self.directory = directory
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._textures = OrderedDict()
+        self._lock = threading.Lock()
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)
+
+    def __len__(self):
+        return len(self._textures)
+
+    def __contains__(self, key):
+        return key in self._textures
+
+    def clear(self):
+        """Release the textures held in memory"""
+        with self._lock:
+            self._textures.clear()
+            self.nbytes = 0
+
+    def _filename(self, key):
+        """The file of a decoded image on disk"""
+        return os.path.join(self.directory, key + ".npy")
+
+    def _read(self, key):
+        """Read a decoded image from disk (``None`` if it is not there)"""
+        if self.directory is None or not os.path.isfile(self._filename(key)):
+            return None
+        return np.load(self._filename(key))
+
+    def _write(self, key, img):
+        """Write a decoded image to disk, atomically so that concurrent
+        processes never read a partial file
+        """
+        fd, temp = tempfile.mkstemp(suffix=".npy", dir=self.directory)
+        with os.fdopen(fd, "wb") as fopen:
+            np.save(fopen, img)
+        os.replace(temp, self._filename(key))
+
+    def _store(self, key, vtexture, nbytes):
+        """Keep a texture within the budget and return the cached one"""
+        with self._lock:
+            if key in self._textures:
+                # Converted concurrently: share the first one
+                self._textures.move_to_end(key)
+                return self._textures[key][0]
+            if nbytes > self.max_bytes:
+                return vtexture
+            self._textures[key] = (vtexture, nbytes)
+            self.nbytes += nbytes
+            while self.nbytes > self.max_bytes:
+                _, (_, size) = self._textures.popitem(last=False)
+                self.nbytes -= size
+        return vtexture
+
+    def get(self, texture):
+        """Convert an OMF texture (:class:`omf.texture.ImageTexture`) or get
+        the converted texture of an identical image.
+
+        Return:
+            :class:`pyvista.Texture`: the texture
+        """
+        key = texture_digest(texture)
+        with self._lock:
+            if key in self._textures:
+                self._textures.move_to_end(key)
+                self.hits += 1
+                return self._textures[key][0]
+            self.misses += 1
+        # Decode outside of the lock so that other images can be converted
+        img = self._read(key)
+        if img is None:
+            img = texture_image(texture)
+            if self.directory is not None:
+                self._write(key, img)
+        return self._store(key, pyvista.numpy_to_texture(img), img.nbytes)
+
+
+_TEXTURE_CACHE = TextureCache()
+
+
+def get_texture_cache():
+    """The texture cache used by :func:`omfvista.utilities.get_textures`"""
+    return _TEXTURE_CACHE
+
+
+def set_texture_cache(cache):
+    """Set the texture cache used by :func:`omfvista.utilities.get_textures`
+    (e.g. to change its budget or store images on disk)
+
+    Return:
+        :class:`TextureCache`: the previous cache
+    """
+    global _TEXTURE_CACHE
+    previous, _TEXTURE_CACHE = _TEXTURE_CACHE, cache
+    return previous
+
+
+get_texture_cache.__displayname__ = "Get Texture Cache"
+set_texture_cache.__displayname__ = "Set Texture Cache"
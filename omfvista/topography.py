@@ -0,0 +1,173 @@
+"""Mask the cells of gridded volumes against a topography surface grid (a
+height field), e.g. to remove the air blocks of a block model.
+
+Example Use
+-----------
+
+Flag the blocks under the topography, or only convert those:
+
+.. code-block:: python
+
+    import omf
+    import omfvista
+
+    project = omf.OMFReader('test_file.omf').get_project()
+    topo, model = project.elements[3], project.elements[4]
+    grid = omfvista.mask_volume(model, topo, origin=project.origin)
+    grid.threshold(0.5, scalars='Below Topography')
+    # or
+    ground = omfvista.mask_volume(model, topo, drop=True, origin=project.origin)
+
+When the topography is an :class:`omf.surface.SurfaceGridGeometry` the test
+needs no surface conversion or point-in-surface queries: the cell centers are
+moved into the frame of the surface grid (its ``axis_u``, ``axis_v`` and
+their normal) and compared to the elevation of the surface, interpolated
+bilinearly between its nodes. Both frames being affine, these coordinates are
+sums of a term per axis of the volume. When the ``w`` axis of the volume is
+along the normal of the surface (as for any unrotated or vertically rotated
+block model under a topography), the surface is only interpolated once per
+column of cells. Layers of cells along ``u`` are masked in chunks (in
+parallel threads when asked to).
+
+Cells beyond the extent of the surface are compared to the elevation of its
+nearest edge.
+"""
+
+__all__ = [
+    "mask_volume",
+    "topography_mask",
+]
+
+__displayname__ = "Topography"
+
+import numpy as np
+import omf
+
+from omfvista.query import _selection
+from omfvista.sampling import _linear
+from omfvista.utilities import map_chunks
+from omfvista.volume import get_volume_edges, get_volume_rotation, get_volume_shape, volume_to_vtk
+
+# Number of cells masked at a time
+CHUNK_SIZE = 2**22
+
+# The name of the mask attached to the converted volumes
+MASK_NAME = "Below Topography"
+
+
+def _surface_grid(surface):
+    """The rotation, node coordinates and node elevations (as rows along
+    ``axis_v``) of a surface grid
+    """
+    geom = getattr(surface, "geometry", surface)
+    if not isinstance(geom, omf.surface.SurfaceGridGeometry):
+        raise ValueError("The topography must be a surface grid (SurfaceGridGeometry).")
+    axis_u = np.array(geom.axis_u, dtype=float)
+    axis_v = np.array(geom.axis_v, dtype=float)
+    rotation = np.array([axis_u, axis_v, np.cross(axis_u, axis_v)])
+    ox, oy, oz = geom.origin
+    x = np.insert(ox + np.cumsum(geom.tensor_u), 0, ox)
+    y = np.insert(oy + np.cumsum(geom.tensor_v), 0, oy)
+    elevations = np.full((len(y), len(x)), float(oz))
+    offset_w = getattr(geom.offset_w, "array", None)
+    if offset_w is not None:
+        elevations += np.asarray(offset_w, dtype=float).reshape(len(y), len(x))
+    return rotation, x, y, elevations
+
+
+def _elevation(x, y, elevations, su, sv):
+    """Interpolate the elevations of a surface grid bilinearly"""
+    su, sv = np.broadcast_arrays(su, sv)
+    i0, i1, tx = _linear(x, su.ravel())
+    j0, j1, ty = _linear(y, sv.ravel())
+    low = elevations[j0, i0] * (1.0 - tx) + elevations[j0, i1] * tx
+    high = elevations[j1, i0] * (1.0 - tx) + elevations[j1, i1] * tx
+    return (low * (1.0 - ty) + high * ty).reshape(su.shape)
+
+
+def topography_mask(volgeom, surface, chunk_size=CHUNK_SIZE, workers=None):
+    """Find the cells of a gridded volume whose centers are below a
+    topography surface grid.
+
+    Args:
+        volgeom (:class:`omf.volume.VolumeGridGeometry`): the grid to mask
+        surface (:class:`omf.surface.SurfaceElement` or :class:`omf.surface.SurfaceGridGeometry`):
+            the topography. Above is along the normal of its ``axis_u`` and
+            ``axis_v``.
+        chunk_size (int): the (approximate) number of cells masked at a time
+        workers (int): the number of threads masking chunks. Chunks are
+            masked in the calling thread by default.
+
+    Return:
+        np.ndarray: a flat boolean mask of the cells in the (C) order of the
+        data arrays of the volume
+    """
+    rotation, x, y, elevations = _surface_grid(surface)
+    shape = get_volume_shape(volgeom)
+    centers = [(c[1:] + c[:-1]) / 2.0 for c in get_volume_edges(volgeom)]
+    # The surface frame coordinates of each volume axis, as rows
+    transform = get_volume_rotation(volgeom).dot(np.linalg.inv(rotation))
+    columns = np.allclose(transform[2, :2], 0.0, atol=1e-12 * np.abs(transform).max())
+    u, v, w = centers
+    v = v[:, None]
+
+    def mask(start, stop):
+        layers = u[start:stop, None, None]
+        su, sv, sw = (layers * transform[0, c] + v * transform[1, c] for c in range(3))
+        if not columns:
+            su = su + w * transform[2, 0]
+            sv = sv + w * transform[2, 1]
+        below = sw + w * transform[2, 2] < _elevation(x, y, elevations, su, sv)
+        return np.broadcast_to(below, (stop - start,) + shape[1:]).ravel()
+
+    layer = shape[1] * shape[2]
+    found = map_chunks(mask, shape[0], max(1, chunk_size // max(layer, 1)), workers=workers)
+    if not found:
+        return np.zeros(0, dtype=bool)
+    return np.concatenate(found)
+
+
+def mask_volume(
+    volelement,
+    surface,
+    drop=False,
+    name=MASK_NAME,
+    attributes=None,
+    origin=(0.0, 0.0, 0.0),
+    chunk_size=CHUNK_SIZE,
+    workers=None,
+):
+    """Mask a volume element against a topography surface grid (see
+    :func:`topography_mask`).
+
+    Args:
+        volelement (:class:`omf.volume.VolumeElement`): the volume to mask
+        surface (:class:`omf.surface.SurfaceElement` or :class:`omf.surface.SurfaceGridGeometry`):
+            the topography
+        drop (bool): only convert the cells below the topography instead of
+            attaching the mask to the converted volume
+        name (str): the name of the mask cell array
+        attributes (list(str)): the names of the data arrays to keep on the
+            cells below the topography when dropping the others. All cell
+            data arrays are kept by default.
+        origin (tuple(float)): the origin of the project (see
+            :func:`omfvista.volume_to_vtk`)
+        chunk_size (int): the (approximate) number of cells masked at a time
+        workers (int): the number of threads masking chunks
+
+    Return:
+        :class:`pyvista.DataSet`: the converted volume with the mask as a
+        cell array, or the :class:`pyvista.UnstructuredGrid` of the cells
+        below the topography (see :func:`omfvista.query_volume`)
+    """
+    below = topography_mask(volelement.geometry, surface, chunk_size=chunk_size, workers=workers)
+    if drop:
+        return _selection(volelement, np.flatnonzero(below), attributes, origin=origin)
+    output = volume_to_vtk(volelement, origin=origin)
+    shape = get_volume_shape(volelement.geometry)
+    output.cell_data[name] = below.reshape(shape).ravel(order="F")
+    return output
+
+
+topography_mask.__displayname__ = "Topography Mask"
+mask_volume.__displayname__ = "Mask Volume"
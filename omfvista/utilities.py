@@ -3,18 +3,36 @@ __all__ = [
     "check_orthogonal",
     "add_data",
     "add_texture_coordinates",
+    "cell_arrays",
+    "geometry_hash",
+    "ignore_warnings",
+    "map_chunks",
+    "to_cell_array",
 ]
 
+from concurrent.futures import ThreadPoolExecutor
+import hashlib
 
-from PIL import Image
 import numpy as np
 import pyvista
+from vtkmodules.util.numpy_support import numpy_to_vtkIdTypeArray
+from vtkmodules.vtkCommonDataModel import vtkCellArray
+
+from omfvista.profiling import stage
 
 try:
     from pyvista import is_pyvista_obj as is_pyvista_dataset
 except ImportError:
     from pyvista import is_pyvista_dataset
 
+# The cell arrays of a vtkPolyData and their getters and setters
+POLY_CELLS = {
+    "verts": ("GetVerts", "SetVerts"),
+    "lines": ("GetLines", "SetLines"),
+    "polys": ("GetPolys", "SetPolys"),
+    "strips": ("GetStrips", "SetStrips"),
+}
+
 
 def check_orientation(axis_u, axis_v, axis_w):
     """This will check if the given ``axis_*`` vectors are the typical
@@ -41,23 +59,59 @@ def check_orthogonal(axis_u, axis_v, axis_w):
     return True
 
 
+def cell_arrays(cells):
+    """The offsets and connectivity arrays of a ``vtkCellArray``"""
+    return (
+        pyvista.convert_array(cells.GetOffsetsArray()),
+        pyvista.convert_array(cells.GetConnectivityArray()),
+    )
+
+
+def to_cell_array(offsets, connectivity):
+    """Build a ``vtkCellArray`` on top of offsets and connectivity arrays"""
+    cells = vtkCellArray()
+    cells.SetData(
+        numpy_to_vtkIdTypeArray(np.asarray(offsets, dtype=pyvista.ID_TYPE), deep=False),
+        numpy_to_vtkIdTypeArray(np.asarray(connectivity, dtype=pyvista.ID_TYPE), deep=False),
+    )
+    return cells
+
+
 def add_data(output, data):
     """Adds data arrays to an output VTK data object"""
-    for d in data:
-        output[d.name] = np.array(d.array.array)
+    with stage("data") as s:
+        for d in data:
+            arr = np.array(d.array.array)
+            output[d.name] = arr
+            s.add(arr)
     return output
 
 
-def add_texture_coordinates(output, textures, elname):
-    """Add texture coordinates to a pyvista data object."""
+def add_texture_coordinates(output, textures, elname, origin=(0.0, 0.0, 0.0)):
+    """Add texture coordinates to a pyvista data object.
+
+    Args:
+        origin (tuple(float)): the origin the points of the output have
+            already been shifted by (textures are shifted by it too)
+    """
     if not is_pyvista_dataset(output):
         output = pyvista.wrap(output)
+    if not textures:
+        return output
+    with stage("texture coordinates"):
+        _add_texture_coordinates(output, textures, elname, np.array(origin))
+    return output
+
+
+def _add_texture_coordinates(output, textures, elname, origin):
+    """Map each texture onto the points of the output"""
     for i, tex in enumerate(textures):
         # Now map the coordinates for the texture
+        tex_origin = tex.origin + origin
         tmp = output.texture_map_to_plane(
-            origin=tex.origin,
-            point_u=tex.origin + tex.axis_u,
-            point_v=tex.origin + tex.axis_v,
+            origin=tex_origin,
+            point_u=tex_origin + tex.axis_u,
+            point_v=tex_origin + tex.axis_v,
         )
         # Grab the texture coordinates
         tcoord = tmp.GetPointData().GetTCoords()
@@ -72,16 +126,88 @@ def add_texture_coordinates(output, textures, elname):
     return output
 
 
-def texture_to_vtk(texture):
-    """Convert an OMF texture to a VTK texture."""
+def geometry_hash(geom):
+    """A digest of the content of an OMF geometry: two geometries with the
+    same digest convert to the same VTK data object.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(geom.__class__.__name__.encode("utf-8"))
+    for name in sorted(geom._props):
+        if name in ("uid", "date_created", "date_modified"):
+            continue
+        value = getattr(geom, name)
+        arr = np.asarray(getattr(value, "array", value))
+        digest.update(name.encode("utf-8"))
+        if arr.dtype.kind in "biuf":
+            digest.update("{}{}".format(arr.dtype.str, arr.shape).encode("utf-8"))
+            digest.update(np.ascontiguousarray(arr).data)
+        else:
+            digest.update(repr(value).encode("utf-8"))
+    return digest.hexdigest()
+
+
+def map_chunks(func, size, chunk_size, workers=None):
+    """Call ``func(start, stop)`` over consecutive chunks of ``range(size)``.
+
+    Args:
+        func (callable): the function to call on each chunk
+        size (int): the number of items to split into chunks
+        chunk_size (int): the number of items in each chunk
+        workers (int): the number of threads calling ``func`` (NumPy releases
+            the GIL so chunks are processed in parallel). Chunks are processed
+            in the calling thread by default.
+
+    Return:
+        list: the result of each chunk in order
+    """
+    bounds = [(start, min(start + chunk_size, size)) for start in range(0, size, chunk_size)]
+    if workers is None or workers <= 1 or len(bounds) <= 1:
+        return [func(start, stop) for start, stop in bounds]
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(lambda b: func(*b), bounds))
+
+
+def ignore_warnings():
+    """Sets a warning filter for pillow's annoying ``DecompressionBombWarning``"""
+    import warnings
+
+    from PIL import Image
+
+    warnings.simplefilter(action="ignore", category=Image.DecompressionBombWarning)
+
+
+def texture_image(texture):
+    """Decode the image of an OMF texture to an RGB array."""
+    # PIL is only needed (and imported) once textures are decoded
+    from PIL import Image
+
+    ignore_warnings()
     img = np.array(Image.open(texture.image))
     texture.image.seek(0)  # Reset the image bytes in case it is accessed again
     if img.shape[2] > 3:
         img = img[:, :, 0:3]
-    vtexture = pyvista.numpy_to_texture(img)
+    return img
+
+
+def texture_to_vtk(texture):
+    """Convert an OMF texture to a VTK texture."""
+    vtexture = pyvista.numpy_to_texture(texture_image(texture))
     return vtexture
 
 
-def get_textures(element):
-    """Get a dictionary of textures for a given element."""
-    return [texture_to_vtk(tex) for tex in element.textures]
+def get_textures(element, cache=None):
+    """Get a dictionary of textures for a given element.
+
+    Args:
+        element: an OMF element with textures
+        cache (:class:`omfvista.textures.TextureCache`): the cache to convert
+            the textures through. Defaults to the shared cache (see
+            :func:`omfvista.textures.get_texture_cache`), so identical images
+            are decoded once.
+    """
+    from omfvista.textures import get_texture_cache
+
+    if cache is None:
+        cache = get_texture_cache()
+    with stage("textures"):
+        return [cache.get(tex) for tex in element.textures]
@@ -1,7 +1,12 @@
 """Methods for converting volumetric data objects"""
 
 __all__ = [
+    "get_volume_arrays",
+    "get_volume_cell_volumes",
+    "get_volume_edges",
+    "get_volume_rotation",
     "get_volume_shape",
+    "volume_to_grid_coordinates",
     "volume_grid_geom_to_vtk",
     "volume_to_vtk",
 ]
@@ -11,6 +16,7 @@ __displayname__ = "Volume"
 import numpy as np
 import pyvista
 
+from omfvista.profiling import stage
 from omfvista.utilities import check_orientation
 
 
@@ -19,6 +25,94 @@ def get_volume_shape(vol):
     return (len(vol.tensor_u), len(vol.tensor_v), len(vol.tensor_w))
 
 
+def get_volume_edges(vol):
+    """Returns the coordinates of the cell boundaries along each axis of a
+    gridded volume (before rotation by the axes)
+    """
+    edges = []
+    for o, tensor in zip(vol.origin, (vol.tensor_u, vol.tensor_v, vol.tensor_w)):
+        edges.append(np.insert(o + np.cumsum(tensor), 0, o))
+    return tuple(edges)
+
+
+def get_volume_rotation(vol):
+    """Returns the matrix rotating the grid coordinates of a gridded volume
+    (as rows) into place
+    """
+    return np.array([vol.axis_u, vol.axis_v, vol.axis_w], dtype=float)
+
+
+def get_volume_cell_volumes(vol, start=0, stop=None):
+    """Returns the volumes of the cells of a gridded volume in the flat (C)
+    order of its data arrays, from the outer product of its tensors, without
+    building its geometry.
+
+    Args:
+        vol (:class:`omf.volume.VolumeGridGeometry`): the grid geometry
+        start (int): the flat index of the first cell
+        stop (int): the flat index past the last cell (all of the cells by
+            default)
+    """
+    nu, nv, nw = get_volume_shape(vol)
+    if stop is None:
+        stop = nu * nv * nw
+    # The axes scale the cells when they are not unit vectors
+    scale = abs(np.linalg.det(get_volume_rotation(vol)))
+    layer = np.outer(vol.tensor_v, vol.tensor_w).ravel() * scale
+    ids = np.arange(start, stop)
+    u, vw = np.divmod(ids, nv * nw)
+    return np.asarray(vol.tensor_u)[u] * layer[vw]
+
+
+def get_volume_arrays(volelement, names=None):
+    """Returns the data of a volume element as flat arrays in C order (the
+    layout of the OMF arrays) without converting them.
+
+    Args:
+        volelement (:class:`omf.volume.VolumeElement`): the volume element
+        names (list(str)): the names of the data arrays to get. All data
+            arrays are returned by default.
+
+    Return:
+        dict: the flat array of each data, the ``(nu, nv, nw)`` shape it
+        reshapes to and whether it is on the vertices (nodes) of the grid
+    """
+    cells = get_volume_shape(volelement.geometry)
+    nodes = tuple(n + 1 for n in cells)
+    arrays = {}
+    for data in volelement.data:
+        if names is not None and data.name not in names:
+            continue
+        arr = np.asarray(data.array.array)
+        shape = nodes if data.location == "vertices" else cells
+        arrays[data.name] = (arr.reshape(-1), shape, data.location == "vertices")
+    if names is not None:
+        missing = set(names) - set(arrays)
+        if missing:
+            raise KeyError("Volume has no data named {}".format(sorted(missing)))
+    return arrays
+
+
+def volume_to_grid_coordinates(vol, points, origin=(0.0, 0.0, 0.0)):
+    """Transform points into the coordinates of a gridded volume: the inverse
+    of the rotation applied by :func:`volume_grid_geom_to_vtk`.
+
+    Args:
+        vol (:class:`omf.volume.VolumeGridGeometry`): the grid geometry
+        points (np.ndarray): an (N, 3) array of points
+        origin (tuple(float)): the origin the points are shifted by (as
+            passed to :func:`volume_grid_geom_to_vtk`)
+
+    Return:
+        np.ndarray: the (N, 3) coordinates of the points along the axes of
+        the grid, comparable to :func:`get_volume_edges`
+    """
+    points = np.asarray(points, dtype=float) - np.array(origin, dtype=float)
+    if check_orientation(vol.axis_u, vol.axis_v, vol.axis_w):
+        return points
+    return points.dot(np.linalg.inv(get_volume_rotation(vol)))
+
+
 def volume_grid_geom_to_vtk(volgridgeom, origin=(0.0, 0.0, 0.0)):
     """Convert the 3D gridded volume to a :class:`pyvista.StructuredGrid`
     (or a :class:`pyvista.RectilinearGrid` when apprropriate) object contatining
@@ -30,15 +124,8 @@ def volume_grid_geom_to_vtk(volgridgeom, origin=(0.0, 0.0, 0.0)):
     """
     volgridgeom._validate_mesh()
 
-    ox, oy, oz = volgridgeom.origin
-
     # Make coordinates along each axis
-    x = ox + np.cumsum(volgridgeom.tensor_u)
-    x = np.insert(x, 0, ox)
-    y = oy + np.cumsum(volgridgeom.tensor_v)
-    y = np.insert(y, 0, oy)
-    z = oz + np.cumsum(volgridgeom.tensor_w)
-    z = np.insert(z, 0, oz)
+    x, y, z = get_volume_edges(volgridgeom)
 
     # If axis orientations are standard then use a vtkRectilinearGrid
     if check_orientation(volgridgeom.axis_u, volgridgeom.axis_v, volgridgeom.axis_w):
@@ -50,8 +137,7 @@ def volume_grid_geom_to_vtk(volgridgeom, origin=(0.0, 0.0, 0.0)):
     points = np.c_[xx.ravel("F"), yy.ravel("F"), zz.ravel("F")]
 
     # Rotate the points based on the axis orientations
-    rotation_mtx = np.array([volgridgeom.axis_u, volgridgeom.axis_v, volgridgeom.axis_w])
-    points = points.dot(rotation_mtx)
+    points = points.dot(get_volume_rotation(volgridgeom))
 
     output = pyvista.StructuredGrid()
     output.points = points
@@ -60,21 +146,31 @@ def volume_grid_geom_to_vtk(volgridgeom, origin=(0.0, 0.0, 0.0)):
     return output
 
 
-def volume_to_vtk(volelement, origin=(0.0, 0.0, 0.0)):
+def volume_to_vtk(volelement, origin=(0.0, 0.0, 0.0), mesh=None):
     """Convert the volume element to a VTK data object.
 
     Args:
         volelement (:class:`omf.volume.VolumeElement`): The volume element to
             convert
+        mesh (:class:`pyvista.DataSet`): the already converted geometry of
+            the volume. The output shares its coordinates rather than
+            converting the geometry again.
 
     """
-    output = volume_grid_geom_to_vtk(volelement.geometry, origin=origin)
+    if mesh is None:
+        with stage("geometry") as s:
+            output = volume_grid_geom_to_vtk(volelement.geometry, origin=origin)
+            s.add(output)
+    else:
+        output = mesh.copy(deep=False)
     shp = get_volume_shape(volelement.geometry)
     # Add data to output
-    for data in volelement.data:
-        arr = data.array.array
-        arr = np.reshape(arr, shp).flatten(order="F")
-        output[data.name] = arr
+    with stage("data") as s:
+        for data in volelement.data:
+            arr = data.array.array
+            arr = np.reshape(arr, shp).flatten(order="F")
+            output[data.name] = arr
+            s.add(arr)
     return output
 
 
@@ -82,3 +178,8 @@ def volume_to_vtk(volelement, origin=(0.0, 0.0, 0.0)):
 volume_to_vtk.__displayname__ = "Volume to VTK"
 volume_grid_geom_to_vtk.__displayname__ = "Volume Grid Geometry to VTK"
 get_volume_shape.__displayname__ = "Volume Shape"
+get_volume_edges.__displayname__ = "Volume Edges"
+get_volume_arrays.__displayname__ = "Volume Arrays"
+get_volume_cell_volumes.__displayname__ = "Volume Cell Volumes"
+get_volume_rotation.__displayname__ = "Volume Rotation"
+volume_to_grid_coordinates.__displayname__ = "Volume to Grid Coordinates"
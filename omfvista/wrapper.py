@@ -39,35 +39,52 @@ Or better yet, just use the project loader:
     import omfvista
     data = omfvista.load_project('test_file.omf')
 
-"""
+Or, to handle one element at a time without holding the whole project in
+memory:
+
+.. code-block:: python
 
+    import omfvista
+    for name, dataset, textures in omfvista.iter_project('test_file.omf'):
+        dataset.save(name + '.vtk')
+
+"""
 
 __all__ = [
     "wrap",
     "project_to_vtk",
+    "iter_project",
     "load_project",
 ]
 
 __displayname__ = "Wrapper"
 
+from collections import Counter
+
 import numpy as np
-import omf
 import pyvista
 
 import omfvista
-from omfvista.lineset import line_set_to_vtk
-from omfvista.pointset import point_set_to_vtk
+from omfvista import profiling
+from omfvista.budget import apply_plan, plan_project
+from omfvista.fileio import ProjectFile
+from omfvista.lineset import line_set_geom_to_vtk, line_set_to_vtk
+from omfvista.merging import merge_blocks, merge_textures
+from omfvista.pointset import point_set_geom_to_vtk, point_set_to_vtk
 from omfvista.surface import surface_geom_to_vtk, surface_grid_geom_to_vtk, surface_to_vtk
-from omfvista.utilities import get_textures, texture_to_vtk
+from omfvista.utilities import geometry_hash, get_textures, texture_to_vtk
 from omfvista.volume import volume_grid_geom_to_vtk, volume_to_vtk
 
 
-def wrap(data, origin=(0.0, 0.0, 0.0)):
+def wrap(data, origin=(0.0, 0.0, 0.0), mesh=None):
     """Wraps the OMF data object/project as a VTK data object. This is the
     primary function that an end user will harness.
 
     Args:
         data: any OMF data object
+        origin (tuple(float)): the origin to shift the data object by
+        mesh (pyvista.DataSet): the already converted geometry of an element
+            to share (see :func:`project_to_vtk`)
 
     Example:
         >>> import omf
@@ -93,9 +110,11 @@ def wrap(data, origin=(0.0, 0.0, 0.0)):
         return multi
     # get the class name
     key = data.__class__.__name__
+    kwargs = {} if mesh is None else {"mesh": mesh}
     try:
         if key != "Project":
-            return WRAPPERS[key](data, origin=origin)
+            with profiling.element(getattr(data, "name", None)):
+                return WRAPPERS[key](data, origin=origin, **kwargs)
         else:
             # Project is a special case
             return WRAPPERS[key](data)
@@ -103,33 +122,225 @@ def wrap(data, origin=(0.0, 0.0, 0.0)):
         raise RuntimeError("Data of type ({}) is not supported currently.".format(key))
 
 
-def project_to_vtk(project, load_textures=False):
+def _geometry_keys(elements):
+    """Key the geometry of each element so that elements with the same
+    geometry share a key: by UID, and by content for geometries with
+    different UIDs that look alike (same type and size).
+    """
+    geometries = {}
+    for e in elements:
+        geometries.setdefault(e.geometry.uid, e.geometry)
+    alike = {}
+    for uid, geom in geometries.items():
+        signature = (geom.__class__.__name__, geom.num_nodes, geom.num_cells)
+        alike.setdefault(signature, []).append(uid)
+    keys = {uid: uid for uid in geometries}
+    for uids in alike.values():
+        if len(uids) > 1:
+            for uid in uids:
+                keys[uid] = geometry_hash(geometries[uid])
+    return [keys[e.geometry.uid] for e in elements]
+
+
+def _convert_geometry(name, geometry, origin, implicit=False):
+    """Convert a geometry shared by several elements (or to be converted
+    implicitly, see :func:`omfvista.surface.surface_grid_geom_to_vtk`)
+    """
+    kwargs = {"implicit": True} if implicit else {}
+    with profiling.element(name), profiling.stage("geometry") as s:
+        output = WRAPPERS[geometry.__class__.__name__](geometry, origin=origin, **kwargs)
+        s.add(output)
+    return output
+
+
+def project_to_vtk(project, load_textures=False, share_geometry=True, merge=False):
     """Converts an OMF project (:class:`omf.base.Project`) to a
     :class:`pyvista.MultiBlock` data boject
+
+    Args:
+        project (:class:`omf.base.Project`): the project to convert
+        load_textures (bool): also return a dictionary of the textures of
+            each element
+        share_geometry (bool): convert geometries shared by several elements
+            (by UID or content) once. The elements are shallow copies of the
+            converted geometry holding only their own data arrays.
+        merge (bool): concatenate the point sets, line sets and triangulated
+            surfaces into one dataset of each kind (see
+            :func:`omfvista.merging.merge_blocks`). The textures of merged
+            elements are keyed by the name of their merged dataset.
     """
     # Iterate over the elements and add converted VTK objects a MultiBlock
-    data = pyvista.MultiBlock()
+    # (built at the end: setting blocks by name is linear in their number)
+    blocks = {}
     textures = {}
     origin = np.array(project.origin)
-    for e in project.elements:
-        d = omfvista.wrap(e, origin=origin)
-        data[e.name] = d
-        if hasattr(e, "textures") and e.textures:
-            textures[e.name] = get_textures(e)
+    keys = [None] * len(project.elements)
+    if share_geometry:
+        keys = _geometry_keys(project.elements)
+    counts = Counter(keys)
+    meshes = {}
+    for e, key in zip(project.elements, keys):
+        mesh = None
+        if key is not None and counts[key] > 1:
+            if key not in meshes:
+                meshes[key] = _convert_geometry(e.name, e.geometry, origin)
+            mesh = meshes[key]
+        blocks[e.name] = omfvista.wrap(e, origin=origin, mesh=mesh)
+        if load_textures and getattr(e, "textures", None):
+            with profiling.element(e.name):
+                textures[e.name] = get_textures(e)
+    data = pyvista.MultiBlock(blocks)
+    if merge:
+        data = merge_blocks(data)
+        textures = merge_textures(data, textures)
     if load_textures:
         return data, textures
     return data
 
 
-def load_project(filename, load_textures=False):
-    """Loads an OMF project file into a :class:`pyvista.MultiBlock` dataset"""
-    reader = omf.OMFReader(filename)
-    project = reader.get_project()
-    return project_to_vtk(project, load_textures=load_textures)
+def load_project(
+    filename,
+    load_textures=False,
+    profile=False,
+    merge=False,
+    workers=None,
+    max_memory=None,
+    statistics=None,
+):
+    """Loads an OMF project file into a :class:`pyvista.MultiBlock` dataset
+
+    Args:
+        filename (str): the OMF project file to load
+        load_textures (bool): also return a dictionary of the textures of
+            each element
+        profile (bool): also return a report of the time, memory and array
+            sizes of each stage of the conversion (see
+            :class:`omfvista.profiling.Profiler`)
+        merge (bool): concatenate the point sets, line sets and triangulated
+            surfaces into one dataset of each kind (see
+            :func:`omfvista.merging.merge_blocks`). The textures of merged
+            elements are keyed by the name of their merged dataset.
+        workers (int): the number of threads decompressing the arrays of each
+            element (see :meth:`omfvista.fileio.ProjectFile.read_element`)
+        max_memory (int): a budget (in bytes) for the converted project. The
+            conversion is planned to fit in it (see
+            :func:`omfvista.budget.plan_project`) and the plan is also
+            returned, after the textures. Deferred elements have empty
+            (``None``) blocks.
+        statistics (:class:`omfvista.statistics.StatisticsIndex`): an index
+            to add the statistics of each element to as it is converted (see
+            :func:`iter_project`)
+    """
+    if profile:
+        with profiling.Profiler() as profiler:
+            output = load_project(
+                filename,
+                load_textures=load_textures,
+                merge=merge,
+                workers=workers,
+                max_memory=max_memory,
+                statistics=statistics,
+            )
+        if not isinstance(output, tuple):
+            output = (output,)
+        return output + (profiler.report(),)
+    plan = None
+    if max_memory is not None:
+        plan = plan_project(filename, max_memory)
+    # Stream the elements so that only one element's OMF arrays are held in
+    # memory alongside the converted project
+    blocks = {}
+    textures = {}
+    for name, d, tex in iter_project(
+        filename, load_textures=load_textures, workers=workers, plan=plan, statistics=statistics
+    ):
+        blocks[name] = d
+        if tex:
+            textures[name] = tex
+    data = pyvista.MultiBlock(blocks)
+    if merge:
+        data = merge_blocks(data)
+        textures = merge_textures(data, textures)
+    output = (data,)
+    if load_textures:
+        output += (textures,)
+    if plan is not None:
+        output += (plan,)
+    return output if len(output) > 1 else data
+
+
+def iter_project(filename, load_textures=False, workers=None, plan=None, statistics=None):
+    """Iterate over the converted elements of an OMF project file one element
+    at a time.
+
+    Each element is read from the file just before it is converted and its
+    OMF arrays are released once it has been converted, so pipelines that
+    handle each element independently run in roughly single-element memory.
+    Geometries shared by several elements are converted once and kept until
+    their last element has been converted.
+
+    Args:
+        filename (str): the OMF project file to load
+        load_textures (bool): also convert the textures of each element
+        workers (int): the number of threads decompressing the arrays of each
+            element (see :meth:`omfvista.fileio.ProjectFile.read_element`)
+        plan (dict): a conversion plan of the project (see
+            :func:`omfvista.budget.plan_project`)
+        statistics (:class:`omfvista.statistics.StatisticsIndex`): an index
+            to add the bounds and array statistics of each element to, right
+            after it is converted (while its arrays are still in memory)
+            rather than in another pass over the loaded project
+
+    Yields:
+        tuple: the name of the element, its VTK data object (``None`` if the
+        plan defers it) and a list of its textures (empty unless
+        ``load_textures`` is set)
+    """
+    entries = {}
+    if plan is not None:
+        entries = {entry["uid"]: entry for entry in plan["elements"]}
+    with ProjectFile(filename) as pfile:
+        origin = np.array(pfile.origin)
+        uids = pfile.project["elements"]
+        # The number of elements yet to be converted on each geometry
+        remaining = Counter(pfile.registry[uid]["geometry"] for uid in uids)
+        meshes = {}
+        for uid in uids:
+            entry = entries.get(uid)
+            key = pfile.registry[uid]["geometry"]
+            if entry is not None and entry["deferred"]:
+                remaining[key] -= 1
+                if not remaining[key]:
+                    meshes.pop(key, None)
+                yield pfile.registry[uid].get("name", ""), None, []
+                continue
+            with profiling.element(pfile.registry[uid].get("name", "")):
+                with profiling.stage("read"):
+                    element = pfile.read_element(uid, workers=workers)
+                if entry is not None:
+                    apply_plan(element, entry)
+                textures = []
+                if load_textures and getattr(element, "textures", None):
+                    textures = get_textures(element)
+            implicit = entry is not None and entry["implicit"]
+            if key not in meshes and (remaining[key] > 1 or implicit):
+                meshes[key] = _convert_geometry(
+                    element.name, element.geometry, origin, implicit=implicit
+                )
+            remaining[key] -= 1
+            mesh = meshes.get(key) if remaining[key] else meshes.pop(key, None)
+            name, output = element.name, wrap(element, origin=origin, mesh=mesh)
+            del element, mesh
+            if statistics is not None:
+                with profiling.element(name), profiling.stage("statistics"):
+                    statistics.add(name, output)
+            yield name, output, textures
 
 
 WRAPPERS = {
+    "LineSetGeometry": line_set_geom_to_vtk,
     "LineSetElement": line_set_to_vtk,
+    "PointSetGeometry": point_set_geom_to_vtk,
     "PointSetElement": point_set_to_vtk,
     # Surfaces
     "SurfaceGeometry": surface_geom_to_vtk,
@@ -145,5 +356,6 @@ WRAPPERS = {
 
 # Now set up the display names for the docs
 load_project.__displayname__ = "Load Project File"
+iter_project.__displayname__ = "Iterate Project File"
 project_to_vtk.__displayname__ = "Project to VTK"
 wrap.__displayname__ = "The Wrapper"
@@ -17,6 +17,11 @@ setuptools.setup(
     long_description_content_type="text/x-rst",
     url="https://github.com/OpenGeoVis/omfvista",
     packages=setuptools.find_packages(),
+    entry_points={
+        "console_scripts": [
+            "omfvista=omfvista.cli:main",
+        ],
+    },
     install_requires=[
         "omf>=1.0.0",
         "vectormath>=0.2.2",
@@ -24,6 +29,9 @@ setuptools.setup(
         "numpy",
         "matplotlib",
     ],
+    extras_require={
+        "spatial": ["scipy"],
+    },
     classifiers=(
         "Programming Language :: Python",
         "License :: OSI Approved :: BSD License",
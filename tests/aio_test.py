@@ -0,0 +1,113 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+import os
+import shutil
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+import omf
+import pyvista
+
+import omfvista
+from tests.element_test import PROJECT
+
+
+class TestAsync(unittest.TestCase):
+    """
+    Load the dummy OMF project with the asyncio interface
+    """
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.project_filename = os.path.join(self.test_dir, "project.omf")
+        omf.OMFWriter(PROJECT, self.project_filename)
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+
+    def test_load_project_async(self):
+        data = asyncio.run(omfvista.load_project_async(self.project_filename, max_concurrency=2))
+        self.assertTrue(isinstance(data, pyvista.MultiBlock))
+        self.assertEqual(list(data.keys()), [e.name for e in PROJECT.elements])
+        data, textures = asyncio.run(
+            omfvista.load_project_async(self.project_filename, load_textures=True)
+        )
+        self.assertEqual(data.n_blocks, len(PROJECT.elements))
+        self.assertEqual(textures, {})
+
+    def test_iter_project_async(self):
+        async def collect():
+            names = []
+            async for name, dataset, textures in omfvista.iter_project_async(self.project_filename):
+                self.assertTrue(isinstance(dataset, pyvista.DataSet))
+                self.assertEqual(textures, [])
+                names.append(name)
+            return names
+
+        names = asyncio.run(collect())
+        self.assertEqual(sorted(names), sorted(e.name for e in PROJECT.elements))
+
+    def test_stop_early(self):
+        class Executor(ThreadPoolExecutor):
+            submitted = 0
+
+            def submit(self, *args, **kwargs):
+                Executor.submitted += 1
+                return super().submit(*args, **kwargs)
+
+        async def first(executor):
+            iterator = omfvista.iter_project_async(
+                self.project_filename, max_concurrency=2, executor=executor
+            )
+            async for name, _, _ in iterator:
+                break
+            await iterator.aclose()
+            return name
+
+        with Executor(max_workers=1) as executor:
+            name = asyncio.run(first(executor))
+        self.assertIn(name, [e.name for e in PROJECT.elements])
+        # The file opening, two elements and the file closing: the other
+        # elements were never submitted
+        self.assertEqual(Executor.submitted, 4)
+
+    def test_stop_early_responsive(self):
+        read_element = omfvista.fileio.ProjectFile.read_element
+
+        def slow_read_element(pfile, uid):
+            time.sleep(0.2)
+            return read_element(pfile, uid)
+
+        async def tick(ticks):
+            while True:
+                ticks.append(time.perf_counter())
+                await asyncio.sleep(0.01)
+
+        async def stop_early():
+            ticks = []
+            iterator = omfvista.iter_project_async(self.project_filename, max_concurrency=2)
+            async for _ in iterator:
+                break
+            # The second element is being read while the iterator is closed
+            ticker = asyncio.create_task(tick(ticks))
+            await iterator.aclose()
+            ticker.cancel()
+            return ticks
+
+        with mock.patch.object(omfvista.fileio.ProjectFile, "read_element", slow_read_element):
+            ticks = asyncio.run(stop_early())
+        # The loop kept running while the file waited to be closed
+        self.assertGreater(len(ticks), 2)
+
+    def test_wrap_async(self):
+        vol = asyncio.run(omfvista.wrap_async(PROJECT.elements[4]))
+        self.assertTrue(isinstance(vol, pyvista.RectilinearGrid))
+        self.assertEqual(vol.n_cells, PROJECT.elements[4].geometry.num_cells)
+
+
+if __name__ == "__main__":
+    import unittest
+
+    unittest.main()
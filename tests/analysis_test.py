@@ -0,0 +1,99 @@
+import unittest
+
+import numpy as np
+import omf
+
+import omfvista
+from omfvista.volume import get_volume_cell_volumes
+
+SHAPE = (4, 5, 6)
+
+rng = np.random.default_rng(7)
+GRADES = rng.uniform(0.0, 2.0, np.prod(SHAPE))
+GRADES[::11] = np.nan
+DENSITY = rng.uniform(2.0, 3.0, np.prod(SHAPE))
+DOMAIN = rng.integers(1, 4, np.prod(SHAPE))
+
+# A rotated block model with uneven cells and axes that are not unit vectors
+BLOCKS = omf.VolumeElement(
+    name="blocks",
+    geometry=omf.VolumeGridGeometry(
+        axis_u=[2.0, 2.0, 0.0],
+        axis_v=[-1.0, 1.0, 0.0],
+        axis_w=[0.0, 0.0, 1.0],
+        tensor_u=rng.uniform(1.0, 3.0, SHAPE[0]),
+        tensor_v=rng.uniform(1.0, 3.0, SHAPE[1]),
+        tensor_w=rng.uniform(1.0, 3.0, SHAPE[2]),
+        origin=[10.0, 10.0, -10],
+    ),
+    data=[
+        omf.ScalarData(name="CU_pct", location="cells", array=GRADES),
+        omf.ScalarData(name="DENSITY", location="cells", array=DENSITY),
+        omf.ScalarData(name="DOMAIN", location="cells", array=DOMAIN),
+    ],
+)
+
+
+class TestAnalysis(unittest.TestCase):
+    """
+    Grade–tonnage curves and reserves of block models
+    """
+
+    def setUp(self):
+        grid = omfvista.wrap(BLOCKS)
+        # Back to the flat (C) order of the data arrays
+        self.volumes = grid.compute_cell_sizes()["Volume"].reshape(SHAPE, order="F").ravel()
+
+    def expected(self, mask):
+        tonnage = np.sum(self.volumes[mask] * DENSITY[mask])
+        metal = np.sum(self.volumes[mask] * DENSITY[mask] * GRADES[mask])
+        return tonnage, metal / tonnage
+
+    def test_cell_volumes(self):
+        self.assertTrue(np.allclose(get_volume_cell_volumes(BLOCKS.geometry), self.volumes))
+        part = get_volume_cell_volumes(BLOCKS.geometry, 17, 45)
+        self.assertTrue(np.allclose(part, self.volumes[17:45]))
+
+    def test_grade_tonnage(self):
+        cutoffs = [1.5, 0.0, 0.5, 1.0, 3.0]
+        for workers in (None, 3):
+            table = omfvista.grade_tonnage(
+                BLOCKS, "CU_pct", cutoffs, density="DENSITY", chunk_size=25, workers=workers
+            )
+            self.assertEqual(list(table["cutoff"]), cutoffs)
+            for i, cutoff in enumerate(cutoffs[:-1]):
+                tonnage, grade = self.expected(GRADES >= cutoff)
+                self.assertAlmostEqual(table["tonnage"][i], tonnage)
+                self.assertAlmostEqual(table["grade"][i], grade)
+                self.assertAlmostEqual(table["metal"][i], tonnage * grade)
+            self.assertEqual(table["tonnage"][-1], 0.0)
+            self.assertTrue(np.isnan(table["grade"][-1]))
+        volumes = omfvista.grade_tonnage(BLOCKS, "CU_pct", [0.0])["volume"]
+        self.assertAlmostEqual(volumes[0], np.sum(self.volumes[np.isfinite(GRADES)]))
+
+    def test_reserve_summary(self):
+        summary = omfvista.reserve_summary(
+            BLOCKS, "CU_pct", cutoff=0.8, density="DENSITY", domain="DOMAIN", chunk_size=7
+        )
+        self.assertEqual(summary["domain"], [1, 2, 3])
+        for i, code in enumerate(summary["domain"]):
+            tonnage, grade = self.expected((GRADES >= 0.8) & (DOMAIN == code))
+            self.assertAlmostEqual(summary["tonnage"][i], tonnage)
+            self.assertAlmostEqual(summary["grade"][i], grade)
+        total = omfvista.reserve_summary(BLOCKS, "CU_pct", density="DENSITY")
+        self.assertEqual(total["domain"], [None])
+        tonnage, grade = self.expected(np.isfinite(GRADES))
+        self.assertAlmostEqual(total["tonnage"][0], tonnage)
+        self.assertAlmostEqual(total["grade"][0], grade)
+
+    def test_invalid(self):
+        with self.assertRaises(KeyError):
+            omfvista.grade_tonnage(BLOCKS, "AU_gpt", [0.0])
+        with self.assertRaises(ValueError):
+            omfvista.reserve_summary(BLOCKS, "CU_pct", domain="DENSITY")
+
+
+if __name__ == "__main__":
+    import unittest
+
+    unittest.main()
@@ -0,0 +1,120 @@
+import unittest
+
+import numpy as np
+import omf
+import pyvista
+
+import omfvista
+from tests.element_test import VOLUME, VOLUME_IR
+
+ORIGIN = np.array([5.0, -3.0, 2.0])
+
+# A grid with variable cell sizes
+VARIABLE = omf.VolumeGridGeometry(
+    tensor_u=np.linspace(0.5, 2.0, 10),
+    tensor_v=np.ones(15),
+    tensor_w=np.geomspace(0.2, 3.0, 20),
+    origin=[10.0, 10.0, -10],
+)
+
+
+def make_points(vol, n=5000, seed=0):
+    """A point set element scattered over (and around) a volume"""
+    grid = omfvista.wrap(vol.geometry)
+    bounds = np.array(grid.bounds).reshape(3, 2)
+    rng = np.random.default_rng(seed)
+    vertices = rng.uniform(bounds[:, 0] - 1, bounds[:, 1] + 1, size=(n, 3))
+    grades = rng.random(n)
+    grades[::17] = np.nan
+    return omf.PointSetElement(
+        name="samples",
+        geometry=omf.PointSetGeometry(vertices=vertices),
+        data=[omf.ScalarData(name="grade", location="vertices", array=grades)],
+    )
+
+
+class TestBinning(unittest.TestCase):
+    """
+    Bin the data of point sets onto gridded volumes
+    """
+
+    def check(self, binned, grid, points):
+        """Compare the binned statistics to a brute force reduction"""
+        cells = grid.find_containing_cell(points.geometry.vertices.array)
+        grades = points.data[0].array.array
+        arrays = {d.name: np.asarray(d.array.array) for d in binned.data}
+        expected = np.bincount(cells[cells >= 0], minlength=grid.n_cells)
+        # Cell ids of VTK grids are in F order, OMF arrays in C order
+        shape = omfvista.volume.get_volume_shape(binned.geometry)
+        order = np.arange(grid.n_cells).reshape(shape, order="F").ravel()
+        self.assertTrue(np.array_equal(arrays["Point Count"], expected[order]))
+        for cell in np.unique(cells[cells >= 0])[:50]:
+            values = grades[(cells == cell) & np.isfinite(grades)]
+            flat = np.flatnonzero(order == cell)[0]
+            self.assertEqual(arrays["grade count"][flat], len(values))
+            if len(values):
+                self.assertAlmostEqual(arrays["grade mean"][flat], values.mean())
+                self.assertEqual(arrays["grade max"][flat], values.max())
+            else:
+                self.assertTrue(np.isnan(arrays["grade mean"][flat]))
+
+    def test_element(self):
+        for geometry in (VOLUME.geometry, VOLUME_IR.geometry, VARIABLE):
+            vol = omf.VolumeElement(name="vol", geometry=geometry)
+            points = make_points(vol)
+            binned = omfvista.bin_points(points, geometry, chunk_size=700)
+            self.assertIsInstance(binned, omf.VolumeElement)
+            self.assertEqual(
+                [d.name for d in binned.data],
+                ["Point Count", "grade count", "grade mean", "grade max"],
+            )
+            self.check(binned, omfvista.wrap(geometry), points)
+
+    def test_dataset(self):
+        points = make_points(VOLUME_IR, n=2000, seed=1)
+        dataset = omfvista.wrap(points, origin=ORIGIN)
+        grid = omfvista.bin_points(
+            dataset,
+            VOLUME_IR.geometry,
+            statistics=["sum", "min"],
+            origin=ORIGIN,
+            output="vtk",
+        )
+        self.assertIsInstance(grid, pyvista.StructuredGrid)
+        self.assertTrue(np.allclose(grid.bounds, omfvista.wrap(VOLUME_IR, origin=ORIGIN).bounds))
+        expected = omfvista.bin_points(points, VOLUME_IR.geometry, statistics=["sum", "min"])
+        expected = omfvista.volume_to_vtk(expected, origin=ORIGIN)
+        for name in ("Point Count", "grade sum", "grade min"):
+            self.assertTrue(np.allclose(grid[name], expected[name], equal_nan=True))
+
+    def test_boundaries(self):
+        # A long, nearly regular axis: points just past each cell boundary
+        tensor_u = np.ones(1000)
+        tensor_u[0] -= 1e-9
+        for tensor in (tensor_u, np.full(1000, 0.1)):
+            geometry = omf.VolumeGridGeometry(
+                tensor_u=tensor, tensor_v=np.ones(1), tensor_w=np.ones(1)
+            )
+            edges = omfvista.volume.get_volume_edges(geometry)[0]
+            u = np.nextafter(edges[1:-1], np.inf)
+            points = np.column_stack([u, np.full_like(u, 0.5), np.full_like(u, 0.5)])
+            element = omf.PointSetElement(
+                name="edges", geometry=omf.PointSetGeometry(vertices=points)
+            )
+            binned = omfvista.bin_points(element, geometry)
+            self.assertTrue(np.array_equal(binned.data[0].array.array, np.r_[0, np.ones(999)]))
+
+    def test_invalid(self):
+        points = make_points(VOLUME)
+        with self.assertRaises(ValueError):
+            omfvista.bin_points(points, VOLUME.geometry, statistics=["median"])
+        with self.assertRaises(ValueError):
+            omfvista.bin_points(points, VOLUME.geometry, output="points")
+        with self.assertRaises(KeyError):
+            omfvista.bin_points(points, VOLUME.geometry, names=["CU_pct"])
+
+
+if __name__ == "__main__":
+    import unittest
+
+    unittest.main()
@@ -0,0 +1,111 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+import omf
+import pyvista
+
+import omfvista
+from tests.element_test import POINTSET, VOLUME_IR
+
+DEM = omf.SurfaceElement(
+    name="dem",
+    geometry=omf.SurfaceGridGeometry(
+        tensor_u=np.ones(40),
+        tensor_v=np.ones(30),
+        offset_w=np.random.rand(41 * 31),
+    ),
+    data=[omf.ScalarData(name="elevation", location="vertices", array=np.random.rand(41 * 31))],
+)
+
+BLOCKS = omf.VolumeElement(
+    name="blocks",
+    geometry=VOLUME_IR.geometry,
+    data=[
+        omf.ScalarData(name=name, location="cells", array=np.random.rand(3000))
+        for name in ("CU_pct", "AU_gpt", "DENSITY")
+    ],
+)
+
+PROJECT = omf.Project(name="Budget", elements=[POINTSET, DEM, BLOCKS])
+
+
+class TestMemoryBudget(unittest.TestCase):
+    """
+    Plan the conversion of projects to fit in a memory budget
+    """
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.project_filename = os.path.join(self.test_dir, "project.omf")
+        omf.OMFWriter(PROJECT, self.project_filename)
+        self.estimate = omfvista.plan_project(self.project_filename, 2**40)["estimate"]
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+
+    def test_estimate(self):
+        plan = omfvista.plan_project(self.project_filename, self.estimate)
+        self.assertEqual(plan["strategies"], [])
+        self.assertTrue(plan["fits"])
+        self.assertEqual(plan["planned"], self.estimate)
+        data = omfvista.load_project(self.project_filename)
+        for entry, dataset in zip(plan["elements"], data):
+            # Within the overhead of VTK objects
+            actual = dataset.actual_memory_size * 1024
+            self.assertLess(abs(actual - entry["estimate"]), 0.25 * actual + 4096)
+
+    def test_strategies(self):
+        plan = omfvista.plan_project(self.project_filename, self.estimate - 1)
+        self.assertEqual(plan["strategies"], ["implicit"])
+        dem = plan["elements"][1]
+        self.assertTrue(dem["implicit"])
+        self.assertLess(dem["planned"], dem["estimate"])
+        plan = omfvista.plan_project(self.project_filename, plan["planned"] - 1)
+        self.assertEqual(plan["strategies"], ["implicit", "float32"])
+        plan = omfvista.plan_project(self.project_filename, plan["planned"] - 1)
+        self.assertEqual(plan["strategies"], ["implicit", "float32", "attributes"])
+        blocks = plan["elements"][2]
+        self.assertEqual(len(blocks["dropped"]), 1)
+        self.assertNotIn("CU_pct", blocks["dropped"])
+        plan = omfvista.plan_project(self.project_filename, 1)
+        self.assertEqual(plan["strategies"][-1], "deferred")
+        self.assertEqual(plan["planned"], 0)
+        self.assertEqual(plan["deferred"], [e.name for e in PROJECT.elements])
+
+    def test_load_project(self):
+        plan = omfvista.plan_project(self.project_filename, self.estimate - 1)
+        plan = omfvista.plan_project(self.project_filename, plan["planned"] - 1)
+        data, plan = omfvista.load_project(self.project_filename, max_memory=plan["planned"] - 1)
+        self.assertTrue(plan["fits"])
+        self.assertEqual(plan["strategies"], ["implicit", "float32", "attributes"])
+        self.assertIsInstance(data["dem"], pyvista.RectilinearGrid)
+        self.assertEqual(data["dem"]["elevation"].dtype, np.float32)
+        self.assertEqual(
+            sorted(data["blocks"].array_names),
+            sorted(set(d.name for d in BLOCKS.data) - set(plan["elements"][2]["dropped"])),
+        )
+        data, textures, plan = omfvista.load_project(
+            self.project_filename, load_textures=True, max_memory=1
+        )
+        self.assertEqual(data.keys(), [e.name for e in PROJECT.elements])
+        self.assertTrue(all(data[i] is None for i in range(data.n_blocks)))
+        self.assertEqual(textures, {})
+
+    def test_apply_plan(self):
+        with omfvista.fileio.ProjectFile(self.project_filename) as pfile:
+            element = pfile.read_element(pfile.project["elements"][2])
+        entry = {"dropped": ["AU_gpt"], "float32": True}
+        omfvista.budget.apply_plan(element, entry)
+        self.assertEqual([d.name for d in element.data], ["CU_pct", "DENSITY"])
+        for data in element.data:
+            self.assertEqual(data.array.array.dtype, np.float32)
+        self.assertTrue(element.validate())
+
+
+if __name__ == "__main__":
+    import unittest
+
+    unittest.main()
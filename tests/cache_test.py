@@ -0,0 +1,89 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+import omf
+import pyvista
+
+import omfvista
+from tests.element_test import PROJECT
+
+
+class TestProjectCache(unittest.TestCase):
+    """
+    Export the dummy OMF project to a cache directory and read it back
+    """
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.project_filename = os.path.join(self.test_dir, "project.omf")
+        self.cache_dir = os.path.join(self.test_dir, "cache")
+        omf.OMFWriter(PROJECT, self.project_filename)
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+
+    def test_export_project(self):
+        cache = omfvista.export_project(self.project_filename, self.cache_dir)
+        self.assertEqual(len(cache), len(PROJECT.elements))
+        self.assertEqual(cache.names, [e.name for e in PROJECT.elements])
+        expected = omfvista.wrap(PROJECT)
+        for name in cache.names:
+            self.assertTrue(np.allclose(cache.bounds(name), expected[name].bounds))
+            self.assertEqual(set(cache.arrays(name)), set(expected[name].array_names))
+            piece = cache[name]
+            self.assertEqual(type(piece), type(expected[name]))
+            self.assertEqual(piece.n_cells, expected[name].n_cells)
+
+    def test_load_cache(self):
+        omfvista.export_project(PROJECT, self.cache_dir)
+        data = omfvista.load_cache(self.cache_dir, names=["vol", "Random Line"])
+        self.assertEqual(data.n_blocks, 2)
+        self.assertEqual(data.get_block_name(0), "vol")
+        # The multiblock file can be read by VTK directly
+        multi = pyvista.read(os.path.join(self.cache_dir, "project.vtm"))
+        self.assertEqual(multi.n_blocks, len(PROJECT.elements))
+        self.assertEqual(multi.get_block_name(5), "vol_ir")
+
+    def test_non_numeric_arrays(self):
+        points = PROJECT.elements[0]
+        labels = np.array(["label {}".format(i % 3) for i in range(points.geometry.num_nodes)])
+        element = omf.PointSetElement(
+            name="labelled",
+            geometry=points.geometry,
+            data=[omf.ScalarData(name="values", array=np.arange(len(labels)), location="vertices")],
+        )
+        dataset = omfvista.wrap(element)
+        dataset.point_data["labels"] = labels
+        entry = omfvista.cache.write_element(dataset, element, self.test_dir, 0)
+        arrays = {a["name"]: a for a in entry["arrays"]}
+        self.assertIsNone(arrays["labels"]["statistics"])
+        self.assertEqual(arrays["values"]["statistics"]["count"], len(labels))
+        # String arrays are kept in the cached file
+        output = pyvista.read(os.path.join(self.test_dir, entry["file"]))
+        self.assertTrue(np.array_equal(output.point_data["labels"], labels))
+
+    def test_duplicate_names(self):
+        points, lines = PROJECT.elements[:2]
+        # A line set with the name of the point set
+        other = omf.LineSetElement(name=points.name, geometry=lines.geometry)
+        project = omf.Project(name="duplicates", elements=[points, other])
+        cache = omfvista.export_project(project, self.cache_dir)
+        self.assertEqual(len(cache), 2)
+        self.assertEqual(cache.names, [points.name] * 2)
+        self.assertEqual(cache.uids[0], str(points.uid))
+        with self.assertRaises(ValueError):
+            cache.entry(points.name)
+        self.assertEqual(cache[cache.uids[0]].n_points, points.geometry.num_nodes)
+        self.assertEqual(cache[cache.uids[1]].n_lines, lines.geometry.num_cells)
+        data = cache.load()
+        self.assertEqual(data.n_blocks, 2)
+        self.assertEqual(data[1].n_lines, lines.geometry.num_cells)
+
+
+if __name__ == "__main__":
+    import unittest
+
+    unittest.main()
@@ -0,0 +1,74 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+import omf
+import pyvista
+
+import omfvista
+from omfvista.cli import convert_files, main
+from tests.element_test import PROJECT
+
+
+class TestCommandLine(unittest.TestCase):
+    """
+    Batch convert a couple of copies of the dummy OMF project
+    """
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.input_dir = os.path.join(self.test_dir, "input")
+        self.output_dir = os.path.join(self.test_dir, "output")
+        os.makedirs(self.input_dir)
+        self.filenames = []
+        for name in ("first.omf", "second.omf"):
+            filename = os.path.join(self.input_dir, name)
+            omf.OMFWriter(PROJECT, filename)
+            self.filenames.append(filename)
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+
+    def test_convert_files(self):
+        results = convert_files(self.filenames, self.output_dir, processes=2)
+        self.assertEqual([r["name"] for r in results], self.filenames)
+        self.assertTrue(all(r["error"] is None for r in results))
+        cache = omfvista.ProjectCache(os.path.join(self.output_dir, "second"))
+        self.assertEqual(len(cache), len(PROJECT.elements))
+
+    def test_convert_vtm_with_filters(self):
+        results = convert_files(
+            self.filenames[:1],
+            self.output_dir,
+            file_format="vtm",
+            elements=["vol", "Random Line"],
+            attributes=["rand segment data"],
+            processes=1,
+        )
+        self.assertIsNone(results[0]["error"])
+        data = pyvista.read(os.path.join(self.output_dir, "first.vtm"))
+        self.assertEqual(data.n_blocks, 2)
+        self.assertEqual(data["vol"].n_arrays, 0)
+        self.assertEqual(set(data["Random Line"].array_names), {"rand segment data", "Line Index"})
+
+    def test_split_elements(self):
+        results = convert_files(
+            self.filenames[:1], self.output_dir, processes=2, split_elements=True
+        )
+        self.assertEqual(len(results), len(PROJECT.elements))
+        cache = omfvista.ProjectCache(os.path.join(self.output_dir, "first"))
+        self.assertEqual(cache.names, [e.name for e in PROJECT.elements])
+
+    def test_main(self):
+        code = main([self.input_dir, "-o", self.output_dir, "-q", "-e", "vol"])
+        self.assertEqual(code, 0)
+        for stem in ("first", "second"):
+            cache = omfvista.ProjectCache(os.path.join(self.output_dir, stem))
+            self.assertEqual(cache.names, ["vol"])
+
+
+if __name__ == "__main__":
+    import unittest
+
+    unittest.main()
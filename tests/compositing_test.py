@@ -0,0 +1,112 @@
+import unittest
+
+import numpy as np
+import omf
+
+import omfvista
+
+# Two vertical holes: intervals (from, to, grade, lithology), with a gap in the
+# first hole and a missing assay in the second
+HOLES = [
+    [(0.0, 1.0, 1.0, 1), (1.0, 1.5, 3.0, 1), (2.0, 4.0, 2.0, 2)],
+    [(0.0, 2.5, 4.0, 1), (2.5, 3.0, np.nan, 1), (3.0, 5.0, 1.0, 1)],
+]
+
+
+def make_line_set():
+    """Convert the holes to a line set. Contiguous intervals share vertices."""
+    vertices, segments, grades, codes, ids = [], [], [], [], []
+    for h, intervals in enumerate(HOLES):
+        bottom = None
+        for top, next_bottom, grade, code in intervals:
+            if top != bottom:
+                vertices.append([10.0 * h, 0.0, -top])
+            bottom = next_bottom
+            vertices.append([10.0 * h, 0.0, -bottom])
+            segments.append([len(vertices) - 2, len(vertices) - 1])
+            grades.append(grade)
+            codes.append(code)
+            ids.append(h)
+    element = omf.LineSetElement(
+        name="assays",
+        geometry=omf.LineSetGeometry(vertices=np.array(vertices), segments=np.array(segments)),
+        data=[
+            omf.ScalarData(name="grade", array=np.array(grades), location="segments"),
+            omf.ScalarData(name="lithology", array=np.array(codes), location="segments"),
+            omf.ScalarData(name="hole", array=np.array(ids), location="segments"),
+        ],
+    )
+    return omfvista.wrap(element)
+
+
+def expected_average(hole, top, bottom):
+    """Brute force length weighted average of a hole's grades"""
+    amount = weight = 0.0
+    for a, b, grade, _ in HOLES[hole]:
+        overlap = min(b, bottom) - max(a, top)
+        if overlap > 0 and np.isfinite(grade):
+            amount += grade * overlap
+            weight += overlap
+    return amount / weight if weight else np.nan
+
+
+class TestCompositing(unittest.TestCase):
+    """
+    Composite the intervals of a line set
+    """
+
+    def setUp(self):
+        self.holes = make_line_set()
+
+    def check_averages(self, composites):
+        for i in range(composites.n_cells):
+            hole = composites["hole"][i]
+            top, bottom = composites["From"][i], composites["To"][i]
+            self.assertAlmostEqual(composites["grade"][i], expected_average(hole, top, bottom))
+            self.assertTrue(np.allclose(composites.points[2 * i], [10.0 * hole, 0, -top]))
+            self.assertTrue(np.allclose(composites.points[2 * i + 1], [10.0 * hole, 0, -bottom]))
+
+    def test_fixed_length(self):
+        composites = omfvista.composite_line_set(
+            self.holes, length=1.5, arrays=["grade"], hole="hole"
+        )
+        self.assertEqual(composites.n_cells, 3 + 4)
+        self.assertTrue(np.allclose(composites["From"][:3], [0.0, 1.5, 3.0]))
+        self.assertTrue(np.allclose(composites["To"][:3], [1.5, 3.0, 4.0]))
+        # The gap from 1.5 to 2.0 is not sampled
+        self.assertTrue(np.allclose(composites["Sampled Length"][:3], [1.5, 1.0, 1.0]))
+        self.check_averages(composites)
+
+    def test_domain(self):
+        composites = omfvista.composite_line_set(self.holes, domain="lithology", hole="hole")
+        self.assertEqual(list(composites["lithology"]), [1, 2, 1])
+        self.assertTrue(np.allclose(composites["From"], [0.0, 2.0, 0.0]))
+        self.assertTrue(np.allclose(composites["To"], [1.5, 4.0, 5.0]))
+        self.check_averages(composites)
+        split = omfvista.composite_line_set(self.holes, length=1.0, domain="lithology", hole="hole")
+        self.assertEqual(split.n_cells, 2 + 2 + 5)
+        self.check_averages(split)
+
+    def test_line_index(self):
+        # The gap splits the first hole into two connected lines
+        self.assertEqual(len(np.unique(self.holes["Line Index"])), 3)
+        composites = omfvista.composite_line_set(self.holes, length=10.0, arrays=["grade"])
+        self.assertTrue(np.allclose(composites["From"], 0.0))
+        order = np.argsort(composites["To"])
+        self.assertTrue(np.allclose(composites["To"][order], [1.5, 2.0, 5.0]))
+        self.assertTrue(np.allclose(composites["grade"][order], [5.0 / 3.0, 2.0, 12.0 / 4.5]))
+
+    def test_invalid(self):
+        with self.assertRaises(ValueError):
+            omfvista.composite_line_set(self.holes)
+        with self.assertRaises(ValueError):
+            omfvista.composite_line_set(self.holes, length=0.0)
+        self.holes.cell_data.remove("Line Index")
+        with self.assertRaises(ValueError):
+            omfvista.composite_line_set(self.holes, length=1.0)
+
+
+if __name__ == "__main__":
+    import unittest
+
+    unittest.main()
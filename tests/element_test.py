@@ -167,6 +167,15 @@ class TestElements(unittest.TestCase):
         proj = omfvista.load_project(self.project_filename)
         self._check_multi_block(proj)
 
+    def test_iter_project(self):
+        omf.OMFWriter(PROJECT, self.project_filename)
+        names = []
+        for name, dataset, textures in omfvista.iter_project(self.project_filename):
+            self.assertTrue(isinstance(dataset, pyvista.DataSet))
+            self.assertEqual(textures, [])
+            names.append(name)
+        self.assertEqual(names, [e.name for e in PROJECT.elements])
+
     def test_wrap_project(self):
         proj = omfvista.wrap(PROJECT)
         self._check_multi_block(proj)
@@ -202,6 +211,62 @@ class TestElements(unittest.TestCase):
         self.assertEqual(grid.n_cells, GRID.geometry.num_cells)
         self.assertEqual(grid.n_points, GRID.geometry.num_nodes)
 
+    def test_surface_grid_implicit(self):
+        grid = omfvista.wrap(GRID)
+        # Rotated grids always store their nodes
+        rotated = omfvista.surface_to_vtk(GRID, implicit=True)
+        self.assertTrue(isinstance(rotated, pyvista.StructuredGrid))
+        self.assertTrue(np.allclose(rotated.points, grid.points))
+        geom = omf.SurfaceGridGeometry(
+            tensor_u=np.ones(10).astype(float),
+            tensor_v=np.ones(15).astype(float),
+            origin=[50.0, 50.0, 50.0],
+            offset_w=np.random.rand(11, 16).flatten(),
+        )
+        explicit = omfvista.surface_grid_geom_to_vtk(geom, origin=(1.0, 2.0, 3.0))
+        implicit = omfvista.surface_grid_geom_to_vtk(geom, origin=(1.0, 2.0, 3.0), implicit=True)
+        self.assertTrue(isinstance(implicit, pyvista.RectilinearGrid))
+        self.assertEqual(implicit.n_points, explicit.n_points)
+        self.assertEqual(implicit.n_cells, explicit.n_cells)
+        warped = implicit.warp_by_scalar("offset_w")
+        self.assertTrue(np.allclose(warped.points, explicit.points))
+
+    def test_shared_geometry(self):
+        grades = omf.VolumeElement(
+            name="grades",
+            geometry=VOLUME.geometry,
+            data=[
+                omf.ScalarData(
+                    name="Grade", location="cells", array=np.random.rand(10, 15, 20).flatten()
+                )
+            ],
+        )
+        # A different geometry with the same content
+        copy = omf.LineSetGeometry(
+            vertices=LINESET.geometry.vertices.array.copy(),
+            segments=LINESET.geometry.segments.array.copy(),
+        )
+        lines = omf.LineSetElement(name="more lines", geometry=copy, data=[])
+        project = omf.Project(name="shared", elements=[VOLUME, grades, LINESET, lines])
+        data = omfvista.project_to_vtk(project)
+        self.assertIs(data["grades"].GetXCoordinates(), data["vol"].GetXCoordinates())
+        self.assertTrue(np.shares_memory(data["Random Line"].points, data["more lines"].points))
+        self.assertEqual(data["vol"].array_names, ["Random Data"])
+        self.assertEqual(data["grades"].array_names, ["Grade"])
+        self.assertEqual(data["more lines"].array_names, ["Line Index"])
+        unshared = omfvista.project_to_vtk(project, share_geometry=False)
+        self.assertFalse(
+            np.shares_memory(unshared["Random Line"].points, unshared["more lines"].points)
+        )
+        for name in data.keys():
+            self.assertEqual(data[name].bounds, unshared[name].bounds)
+            self.assertEqual(data[name].n_cells, unshared[name].n_cells)
+        # Elements sharing a geometry UID in a file
+        omf.OMFWriter(project, self.project_filename)
+        streamed = {name: d for name, d, _ in omfvista.iter_project(self.project_filename)}
+        self.assertIs(streamed["grades"].GetXCoordinates(), streamed["vol"].GetXCoordinates())
+        self.assertEqual(streamed["grades"].array_names, ["Grade"])
+
     def test_wrap_volume(self):
         vol = omfvista.wrap(VOLUME)
         self.assertEqual(vol.n_arrays, 1)
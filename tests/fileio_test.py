@@ -0,0 +1,88 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+import omf
+
+import omfvista
+from omfvista.fileio import ProjectFile, is_array_index
+from tests.element_test import PROJECT
+
+
+def element_arrays(element):
+    """The arrays of the geometry and data of an element by attribute"""
+    arrays = {}
+    for name, value in element.geometry._backend.items():
+        if hasattr(value, "array"):
+            arrays[name] = value.array
+        elif isinstance(value, np.ndarray):
+            arrays[name] = value
+    for data in element.data:
+        arrays[data.name] = data.array.array
+    return arrays
+
+
+class TestParallelRead(unittest.TestCase):
+    """
+    Decompress the arrays of OMF project files in parallel threads
+    """
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.project_filename = os.path.join(self.test_dir, "project.omf")
+        omf.OMFWriter(PROJECT, self.project_filename)
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+
+    def test_read_element(self):
+        with ProjectFile(self.project_filename) as pfile:
+            for uid in pfile.project["elements"]:
+                element = pfile.read_element(uid, workers=4)
+                self.assertTrue(element.validate())
+                expected = element_arrays(pfile.read_element(uid))
+                arrays = element_arrays(element)
+                self.assertEqual(sorted(arrays), sorted(expected))
+                for name, arr in arrays.items():
+                    self.assertEqual(arr.shape, expected[name].shape)
+                    self.assertTrue(np.array_equal(arr, expected[name]))
+            # The registry of the file is left as it was
+            self.assertTrue(all(isinstance(v, dict) for v in pfile.registry.values()))
+
+    def test_array_indices(self):
+        with ProjectFile(self.project_filename) as pfile:
+            uid = pfile.project["elements"][0]
+            found = pfile.array_indices(uid)
+            # The vertices and the two data arrays of the point set
+            self.assertEqual(len(found), 3)
+            self.assertTrue(all(index["dtype"] in ("<i8", "<f8") for _, _, index in found))
+            # Every array of the file belongs to the project
+            count = sum(
+                is_array_index(value)
+                for entry in pfile.registry.values()
+                for value in entry.values()
+            )
+            self.assertEqual(len(pfile.array_indices(pfile.uid)), count)
+
+    def test_read_project(self):
+        with ProjectFile(self.project_filename) as pfile:
+            project = pfile.read_project(workers=4)
+        self.assertTrue(project.validate())
+        self.assertEqual([e.name for e in project.elements], [e.name for e in PROJECT.elements])
+
+    def test_load_project(self):
+        data = omfvista.load_project(self.project_filename, workers=4)
+        expected = omfvista.load_project(self.project_filename)
+        self.assertEqual(data.keys(), expected.keys())
+        for i in range(data.n_blocks):
+            self.assertTrue(np.allclose(data[i].points, expected[i].points))
+            for name in expected[i].array_names:
+                self.assertTrue(np.array_equal(data[i][name], expected[i][name]))
+
+
+if __name__ == "__main__":
+    import unittest
+
+    unittest.main()
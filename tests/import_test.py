@@ -0,0 +1,53 @@
+import subprocess
+import sys
+import unittest
+
+HEAVY_MODULES = ("numpy", "omf", "pyvista", "vtkmodules", "PIL")
+
+SCRIPT = """
+import sys
+import {module}
+print(','.join(m for m in {heavy!r} if m in sys.modules))
+"""
+
+
+def loaded_modules(module):
+    """Import a module in a fresh interpreter and list the heavy modules it loaded"""
+    script = SCRIPT.format(module=module, heavy=HEAVY_MODULES)
+    output = subprocess.check_output([sys.executable, "-c", script])
+    return [m for m in output.decode().strip().split(",") if m]
+
+
+class TestLazyImport(unittest.TestCase):
+    """
+    ``import omfvista`` must not pull in VTK, PIL, omf or numpy
+    """
+
+    def test_import_omfvista(self):
+        self.assertEqual(loaded_modules("omfvista"), [])
+
+    def test_import_cli(self):
+        self.assertEqual(loaded_modules("omfvista.cli"), [])
+
+    def test_lazy_attributes(self):
+        import omfvista
+
+        self.assertIn("load_project", dir(omfvista))
+        self.assertTrue(callable(omfvista.load_project))
+        self.assertTrue(callable(omfvista.ignore_warnings))
+        self.assertEqual(omfvista.wrapper.__name__, "omfvista.wrapper")
+        with self.assertRaises(AttributeError):
+            omfvista.not_an_attribute
+
+    def test_star_import(self):
+        namespace = {}
+        exec("from omfvista import *", namespace)
+        self.assertTrue(callable(namespace["load_project"]))
+        self.assertTrue(callable(namespace["wrap"]))
+        self.assertTrue(callable(namespace["volume_to_vtk"]))
+
+
+if __name__ == "__main__":
+    import unittest
+
+    unittest.main()
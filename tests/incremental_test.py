@@ -0,0 +1,92 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+import omf
+
+import omfvista
+from omfvista.fileio import ProjectFile
+from tests.element_test import POINTSET, PROJECT, VOLUME
+
+
+def changed_project():
+    """The dummy project with the data of its volume changed"""
+    volume = omf.VolumeElement(
+        name=VOLUME.name,
+        geometry=VOLUME.geometry,
+        data=[
+            omf.ScalarData(
+                name="Random Data",
+                location="cells",
+                array=np.random.rand(10, 15, 20).flatten(),
+            )
+        ],
+    )
+    elements = [volume if e is VOLUME else e for e in PROJECT.elements]
+    return omf.Project(name=PROJECT.name, elements=elements)
+
+
+class TestIncrementalReload(unittest.TestCase):
+    """
+    Only reconvert the elements of a re-exported project that changed
+    """
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.project_filename = os.path.join(self.test_dir, "project.omf")
+        omf.OMFWriter(PROJECT, self.project_filename)
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+
+    def test_checksum(self):
+        with ProjectFile(self.project_filename) as pfile:
+            before = pfile.manifest()
+        # Writing the same content again gives the same checksums
+        omf.OMFWriter(PROJECT, self.project_filename)
+        with ProjectFile(self.project_filename) as pfile:
+            self.assertEqual(pfile.manifest(), before)
+        omf.OMFWriter(changed_project(), self.project_filename)
+        with ProjectFile(self.project_filename) as pfile:
+            after = pfile.manifest()
+        changed = [
+            a["name"]
+            for a, b in zip(after["elements"], before["elements"])
+            if a["checksum"] != b["checksum"]
+        ]
+        self.assertEqual(changed, [VOLUME.name])
+
+    def test_reload_project(self):
+        data, manifest = omfvista.reload_project(self.project_filename)
+        self.assertEqual(list(data.keys()), [e.name for e in PROJECT.elements])
+        self.assertTrue(all(e["converted"] for e in manifest["elements"]))
+        project = changed_project()
+        omf.OMFWriter(project, self.project_filename)
+        reloaded, manifest = omfvista.reload_project(self.project_filename, data, manifest)
+        self.assertEqual(list(reloaded.keys()), list(data.keys()))
+        converted = [e["name"] for e in manifest["elements"] if e["converted"]]
+        self.assertEqual(converted, [VOLUME.name])
+        # Unchanged elements are the same data objects
+        self.assertIs(reloaded[POINTSET.name], data[POINTSET.name])
+        expected = omfvista.wrap(project.elements[4])
+        self.assertTrue(np.allclose(reloaded[VOLUME.name]["Random Data"], expected["Random Data"]))
+        with self.assertRaises(ValueError):
+            omfvista.reload_project(self.project_filename, data)
+
+    def test_reload_from_cache(self):
+        cache_dir = os.path.join(self.test_dir, "cache")
+        cache = omfvista.export_project(self.project_filename, cache_dir)
+        self.assertTrue(all(e["checksum"] for e in cache.index["elements"]))
+        omf.OMFWriter(changed_project(), self.project_filename)
+        data, manifest = omfvista.reload_project(self.project_filename, cache)
+        converted = [e["name"] for e in manifest["elements"] if e["converted"]]
+        self.assertEqual(converted, [VOLUME.name])
+        self.assertEqual(data[POINTSET.name].n_points, cache[POINTSET.name].n_points)
+
+
+if __name__ == "__main__":
+    import unittest
+
+    unittest.main()
@@ -0,0 +1,69 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+import omf
+
+import omfvista
+from tests.element_test import PROJECT
+
+
+class TestInspect(unittest.TestCase):
+    """
+    Compare the summary of the dummy OMF project to its converted elements
+    """
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.project_filename = os.path.join(self.test_dir, "project.omf")
+        omf.OMFWriter(PROJECT, self.project_filename)
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+
+    def test_inspect(self):
+        summary = omfvista.inspect(self.project_filename)
+        self.assertEqual(summary["name"], PROJECT.name)
+        self.assertEqual(summary["uid"], str(PROJECT.uid))
+        data = omfvista.load_project(self.project_filename)
+        for element, info in zip(PROJECT.elements, summary["elements"]):
+            self.assertEqual(info["name"], element.name)
+            self.assertEqual(info["type"], element.__class__.__name__)
+            self.assertEqual(info["n_points"], data[element.name].n_points)
+            self.assertEqual(info["n_cells"], data[element.name].n_cells)
+            self.assertTrue(np.allclose(info["bounds"], data[element.name].bounds))
+            self.assertEqual([d["name"] for d in info["data"]], [d.name for d in element.data])
+            for d in info["data"]:
+                self.assertEqual(d["dtype"], "float64")
+        self.assertEqual(summary["elements"][4]["shape"], (10, 15, 20))
+
+    def test_inspect_without_bounds(self):
+        summary = omfvista.inspect(self.project_filename, bounds=False)
+        line = summary["elements"][1]
+        self.assertIsNone(line["bounds"])
+        self.assertEqual(line["n_points"], LINESET_POINTS)
+        self.assertEqual(line["n_cells"], 50)
+        self.assertEqual(line["data"][1]["location"], "segments")
+        self.assertEqual(line["data"][1]["length"], 50)
+        for element, info in zip(PROJECT.elements, summary["elements"]):
+            self.assertEqual(info["n_points"], omfvista.wrap(element).n_points)
+
+    def test_count_smallest_array(self):
+        with omfvista.fileio.ProjectFile(self.project_filename) as pfile:
+            uid = pfile.project["elements"][0]
+            summary = omfvista.inspection.element_summary(pfile, uid, bounds=False)
+            self.assertEqual(summary["n_points"], 100)
+            # A scalar data array was counted rather than the vertices
+            vertices = pfile.registry[pfile.registry[pfile.registry[uid]["geometry"]]["vertices"]]
+            self.assertNotIn(vertices["array"]["start"], pfile._sizes)
+            self.assertEqual(len(pfile._sizes), 1)
+
+
+LINESET_POINTS = len(PROJECT.elements[1].geometry.vertices.array)
+
+if __name__ == "__main__":
+    import unittest
+
+    unittest.main()
@@ -0,0 +1,99 @@
+import unittest
+
+import numpy as np
+import omf
+
+import omfvista
+
+CENTER = np.array([10.0, 10.0, 10.0])
+RADIUS = 6.0
+
+
+def make_ball(axis_u=(1, 0, 0), axis_v=(0, 1, 0), axis_w=(0, 0, 1), location="cells"):
+    """A volume of the distance to the center of the grid, negated so that it
+    is high inside a ball
+    """
+    n = 20 if location == "cells" else 21
+    edges = np.arange(n) + (0.5 if location == "cells" else 0.0)
+    xx, yy, zz = np.meshgrid(edges, edges, edges, indexing="ij")
+    distance = np.sqrt((xx - 10.0) ** 2 + (yy - 10.0) ** 2 + (zz - 10.0) ** 2)
+    return omf.VolumeElement(
+        name="ball",
+        geometry=omf.VolumeGridGeometry(
+            axis_u=axis_u,
+            axis_v=axis_v,
+            axis_w=axis_w,
+            tensor_u=np.ones(20),
+            tensor_v=np.ones(20),
+            tensor_w=np.ones(20),
+        ),
+        data=[omf.ScalarData(name="value", location=location, array=-distance.ravel())],
+    )
+
+
+class TestIsosurface(unittest.TestCase):
+    """
+    Contour the data of gridded volumes
+    """
+
+    def check_sphere(self, surface, center, rotation=np.eye(3)):
+        self.assertTrue(surface.is_all_triangles)
+        # Closed: no boundary or non-manifold edges
+        edges = surface.extract_feature_edges(
+            boundary_edges=True, non_manifold_edges=True, feature_edges=False, manifold_edges=False
+        )
+        self.assertEqual(edges.n_cells, 0)
+        local = np.asarray(surface.points).dot(np.linalg.inv(rotation)) - CENTER
+        radii = np.linalg.norm(local, axis=1)
+        self.assertTrue(np.allclose(radii, RADIUS, atol=0.1))
+        self.assertAlmostEqual(surface.area, 4.0 * np.pi * RADIUS**2, delta=0.02 * surface.area)
+        # Facing out of the ball (to the lower values)
+        normals = surface.compute_normals(auto_orient_normals=False, consistent_normals=False)
+        outward = np.einsum(
+            "ij,ij->i", normals.cell_data["Normals"], surface.cell_centers().points - center
+        )
+        self.assertTrue(np.all(outward > 0))
+
+    def test_cells(self):
+        ball = make_ball()
+        for workers in (None, 4):
+            surface = omfvista.volume_isosurface(
+                ball, "value", -RADIUS, chunk_size=100, workers=workers
+            )
+            self.check_sphere(surface, CENTER)
+        whole = omfvista.volume_isosurface(ball, "value", -RADIUS)
+        self.assertEqual(whole.n_points, surface.n_points)
+        self.assertEqual(whole.n_cells, surface.n_cells)
+
+    def test_rotated(self):
+        ball = make_ball(axis_u=(0, 1, 0), axis_v=(1, 0, 0), axis_w=(0, 0, 1))
+        origin = np.array([100.0, 0.0, -50.0])
+        surface = omfvista.volume_isosurface(ball, "value", -RADIUS, origin=origin, chunk_size=50)
+        rotation = np.array([[0, 1, 0], [1, 0, 0], [0, 0, 1]], dtype=float)
+        surface.points -= origin
+        self.check_sphere(surface, CENTER.dot(rotation), rotation)
+
+    def test_vertices(self):
+        surface = omfvista.volume_isosurface(make_ball(location="vertices"), "value", -RADIUS)
+        self.check_sphere(surface, CENTER)
+
+    def test_empty(self):
+        surface = omfvista.volume_isosurface(make_ball(), "value", 1.0)
+        self.assertEqual(surface.n_points, 0)
+        with self.assertRaises(KeyError):
+            omfvista.volume_isosurface(make_ball(), "grade", 1.0)
+
+    def test_edge_keys(self):
+        # Edge ids of a grid of ten billion nodes stay within 64 bit integers
+        shape = (2000, 2000, 2500)
+        steps = omfvista.isosurface._edge_steps(shape)
+        self.assertEqual(steps[0], 0)
+        self.assertLessEqual(len(steps), 14)
+        self.assertLess(np.prod(shape, dtype=float) * len(steps), np.iinfo(np.int64).max)
+        self.assertIn(2000 * 2500 + 2500 + 1, steps)
+
+
+if __name__ == "__main__":
+    import unittest
+
+    unittest.main()
@@ -0,0 +1,121 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+import omf
+
+import omfvista
+from tests.element_test import GRID, LINESET, POINTSET, SURFACE, VOLUME
+
+
+def make_holes(n):
+    """Small line sets of a few segments, one with an extra array"""
+    holes = []
+    for i in range(n):
+        data = [omf.ScalarData(name="grade", array=np.random.rand(3), location="segments")]
+        if i == 1:
+            data.append(omf.ScalarData(name="code", array=np.arange(3), location="segments"))
+        holes.append(
+            omf.LineSetElement(
+                name="hole {:d}".format(i),
+                geometry=omf.LineSetGeometry(
+                    vertices=np.random.rand(4, 3) + i,
+                    segments=np.array([[0, 1], [1, 2], [2, 3]]),
+                ),
+                data=data,
+            )
+        )
+    return holes
+
+
+class TestMerging(unittest.TestCase):
+    """
+    Merge the small elements of a project into a few datasets
+    """
+
+    def setUp(self):
+        self.holes = make_holes(4)
+        self.project = omf.Project(
+            name="many", elements=[POINTSET, self.holes[0], SURFACE, GRID, VOLUME] + self.holes[1:]
+        )
+
+    def check_element(self, merged, index, expected):
+        """The cells of an element in the merged dataset match the element"""
+        cells = np.flatnonzero(merged.cell_data["Element Index"] == index)
+        part = merged.extract_cells(cells)
+        self.assertEqual(part.n_cells, expected.n_cells)
+        self.assertTrue(np.allclose(part.cell_centers().points, expected.cell_centers().points))
+        self.assertTrue(np.all(part.point_data["Element Index"] == index))
+
+    def test_project_to_vtk(self):
+        data = omfvista.project_to_vtk(self.project, merge=True)
+        self.assertEqual(
+            list(data.keys()), ["Point Sets", "Line Sets", "Surfaces", GRID.name, VOLUME.name]
+        )
+        lines = data["Line Sets"]
+        self.assertEqual(list(lines.field_data["Element Names"]), [h.name for h in self.holes])
+        self.assertEqual(lines.n_cells, 12)
+        self.assertEqual(lines.n_points, 16)
+        for i, hole in enumerate(self.holes):
+            expected = omfvista.wrap(hole)
+            self.check_element(lines, i, expected)
+            values = lines.cell_data["grade"][lines.cell_data["Element Index"] == i]
+            self.assertTrue(np.allclose(values, expected["grade"]))
+        # Elements without an array get NaN
+        code = lines.cell_data["code"]
+        self.assertTrue(np.allclose(code[3:6], [0, 1, 2]))
+        self.assertTrue(np.all(np.isnan(np.r_[code[:3], code[6:]])))
+        self.check_element(data["Surfaces"], 0, omfvista.wrap(SURFACE))
+        self.assertEqual(data["Point Sets"].n_cells, POINTSET.geometry.num_nodes)
+
+    def test_merge_datasets(self):
+        datasets = [omfvista.wrap(POINTSET), omfvista.wrap(LINESET)]
+        with self.assertRaises(ValueError):
+            omfvista.merge_datasets(datasets)
+        merged = omfvista.merge_datasets([datasets[1], datasets[1]])
+        self.assertEqual(list(merged.field_data["Element Names"]), ["Element 0", "Element 1"])
+        self.check_element(merged, 1, datasets[1])
+
+    def test_line_index(self):
+        datasets = [omfvista.wrap(LINESET)] + [omfvista.wrap(hole) for hole in self.holes]
+        merged = omfvista.merge_datasets(datasets)
+        index = merged.cell_data["Line Index"]
+        element = merged.cell_data["Element Index"]
+        # Each line of each element has its own index
+        lines = {(e, i) for e, i in zip(element, index)}
+        self.assertEqual(len(lines), len(np.unique(index)))
+        self.assertEqual(len(lines), sum(len(np.unique(d["Line Index"])) for d in datasets))
+        # The lines of an element keep their order
+        first = index[element == 1]
+        self.assertTrue(np.array_equal(first - first.min(), datasets[1]["Line Index"]))
+
+    def test_names(self):
+        # A grid that is kept holds the name of the merged line sets
+        grid = omf.SurfaceElement(name="Line Sets", geometry=GRID.geometry)
+        project = omf.Project(name="names", elements=[grid] + self.holes)
+        data = omfvista.project_to_vtk(project, merge=True)
+        self.assertEqual(list(data.keys()), ["Line Sets", "Line Sets (2)"])
+        self.assertEqual(data["Line Sets"].n_cells, GRID.geometry.num_cells)
+        self.assertEqual(data["Line Sets (2)"].n_cells, 12)
+        textures = {"hole 1": ["a"], "hole 3": ["b", "c"], "Line Sets": ["d"]}
+        merged = omfvista.merge_textures(data, textures)
+        self.assertEqual(merged, {"Line Sets (2)": ["a", "b", "c"], "Line Sets": ["d"]})
+
+    def test_load_project(self):
+        test_dir = tempfile.mkdtemp()
+        try:
+            filename = os.path.join(test_dir, "many.omf")
+            omf.OMFWriter(self.project, filename)
+            data = omfvista.load_project(filename, merge=True)
+        finally:
+            shutil.rmtree(test_dir)
+        self.assertEqual(data.n_blocks, 5)
+        self.assertEqual(data["Line Sets"].n_cells, 12)
+
+
+if __name__ == "__main__":
+    import unittest
+
+    unittest.main()
@@ -0,0 +1,56 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+import omf
+import pyvista
+
+import omfvista
+from omfvista import profiling
+from tests.element_test import PROJECT
+
+
+class TestProfiling(unittest.TestCase):
+    """
+    Check the stages of the conversion pipeline are recorded when profiling
+    """
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.project_filename = os.path.join(self.test_dir, "project.omf")
+        omf.OMFWriter(PROJECT, self.project_filename)
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+
+    def test_load_project_report(self):
+        data, report = omfvista.load_project(self.project_filename, profile=True)
+        self.assertTrue(isinstance(data, pyvista.MultiBlock))
+        self.assertIn("read", report["stages"])
+        self.assertIn("connectivity", report["elements"]["Random Line"])
+        vol = report["elements"]["vol"]
+        self.assertEqual(set(vol.keys()), {"read", "geometry", "data"})
+        self.assertEqual(vol["data"]["nbytes"], PROJECT.elements[4].data[0].array.array.nbytes)
+        self.assertIsNotNone(vol["data"]["allocated"])
+        self.assertGreater(report["seconds"], 0.0)
+
+    def test_profiler(self):
+        with omfvista.Profiler(trace_memory=False) as profiler:
+            omfvista.wrap(PROJECT)
+        elements = {r.element for r in profiler.records}
+        self.assertEqual(elements, {e.name for e in PROJECT.elements})
+        self.assertTrue(all(r.allocated is None for r in profiler.records))
+
+    def test_disabled(self):
+        self.assertIsNone(profiling._ACTIVE)
+        self.assertIs(profiling.stage("geometry"), profiling._NULL)
+        with omfvista.Profiler():
+            self.assertIsNot(profiling.stage("geometry"), profiling._NULL)
+        self.assertIsNone(profiling._ACTIVE)
+
+
+if __name__ == "__main__":
+    import unittest
+
+    unittest.main()
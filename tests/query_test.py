@@ -0,0 +1,94 @@
+import unittest
+
+import numpy as np
+import omf
+import pyvista
+
+import omfvista
+from omfvista.query import Expression
+from tests.element_test import VOLUME, VOLUME_IR
+
+ORIGIN = np.array([5.0, -3.0, 2.0])
+
+CODES = omf.VolumeElement(
+    name="codes",
+    geometry=VOLUME.geometry,
+    data=[
+        VOLUME.data[0],
+        omf.ScalarData(name="DOMAIN", location="cells", array=np.arange(3000) % 7),
+    ],
+)
+
+
+class TestQuery(unittest.TestCase):
+    """
+    Select the cells of gridded volumes by their data
+    """
+
+    def test_expression(self):
+        arrays = {"a": np.array([0.1, 0.5, 0.9, np.nan]), "Code Name": np.array([1, 2, 3, 2])}
+        expression = Expression("(a > 0.3) & (`Code Name` in {2, 3})")
+        self.assertEqual(expression.names, ["Code Name", "a"])
+        self.assertEqual(list(expression(arrays)), [False, True, True, False])
+        expression = Expression("a > 0.3 and `Code Name` in {2, 3}")
+        self.assertEqual(list(expression(arrays)), [False, True, True, False])
+        expression = Expression("~(a * 2 >= 1) | isnan(a)")
+        self.assertEqual(list(expression(arrays)), [True, False, False, True])
+        # Bitwise on integers, also within quoted names
+        arrays["P&L"] = np.array([1, 2, 3, 0])
+        expression = Expression("~`P&L` & 2 == 2")
+        self.assertEqual(expression.names, ["P&L"])
+        self.assertEqual(list(expression(arrays)), [True, False, False, True])
+        with self.assertRaises(ValueError):
+            Expression("a > 0.3 & `Code Name` < 3")
+        self.assertEqual(list(Expression("0.2 < a < 0.6")(arrays)), [False, True, False, False])
+        for source in ("__import__('os')", "a.real > 0", "a > 0 if a else a", "a in b"):
+            with self.assertRaises(ValueError):
+                Expression(source)(arrays)
+
+    def test_cells(self):
+        for vol in (VOLUME, VOLUME_IR):
+            grid = omfvista.wrap(vol, origin=ORIGIN)
+            expected = grid.threshold(0.7, scalars="Random Data")
+            selected = omfvista.query_volume(
+                vol, "`Random Data` >= 0.7", origin=ORIGIN, chunk_size=256, workers=4
+            )
+            self.assertIsInstance(selected, pyvista.UnstructuredGrid)
+            self.assertEqual(selected.n_cells, expected.n_cells)
+            ids = selected["vtkOriginalCellIds"]
+            self.assertTrue(np.allclose(selected["Random Data"], grid["Random Data"][ids]))
+            self.assertTrue(
+                np.allclose(selected.cell_centers().points, grid.cell_centers().points[ids])
+            )
+            # Neighbouring cells share their nodes
+            self.assertEqual(selected.n_points, expected.n_points)
+            self.assertTrue(np.all(selected.compute_cell_sizes()["Volume"] > 0))
+
+    def test_points(self):
+        grid = omfvista.wrap(CODES)
+        selected = omfvista.query_volume(
+            CODES,
+            lambda a: (a["Random Data"] > 0.5) & np.isin(a["DOMAIN"], [2, 5]),
+            attributes=["DOMAIN"],
+            output="points",
+        )
+        self.assertIsInstance(selected, pyvista.PolyData)
+        self.assertEqual(selected.array_names, ["DOMAIN", "vtkOriginalCellIds"])
+        ids = selected["vtkOriginalCellIds"]
+        mask = (grid["Random Data"] > 0.5) & np.isin(grid["DOMAIN"], [2, 5])
+        self.assertEqual(sorted(ids), list(np.flatnonzero(mask)))
+        self.assertTrue(np.allclose(selected.points, grid.cell_centers().points[ids]))
+
+    def test_invalid(self):
+        with self.assertRaises(KeyError):
+            omfvista.query_volume(VOLUME, "CU_pct > 1")
+        with self.assertRaises(ValueError):
+            omfvista.query_volume(VOLUME, "`Random Data` > 1", output="faces")
+        empty = omfvista.query_volume(VOLUME, "`Random Data` > 1")
+        self.assertEqual(empty.n_cells, 0)
+
+
+if __name__ == "__main__":
+    import unittest
+
+    unittest.main()
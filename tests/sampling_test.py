@@ -0,0 +1,56 @@
+import unittest
+
+import numpy as np
+import pyvista
+
+import omfvista
+from tests.element_test import VOLUME, VOLUME_IR
+
+ORIGIN = np.array([5.0, -3.0, 2.0])
+
+
+class TestSampling(unittest.TestCase):
+    """
+    Sample gridded volumes at arbitrary points
+    """
+
+    def test_nearest(self):
+        rng = np.random.default_rng(0)
+        for vol in (VOLUME, VOLUME_IR):
+            grid = omfvista.wrap(vol, origin=ORIGIN)
+            bounds = np.array(grid.bounds).reshape(3, 2)
+            points = rng.uniform(bounds[:, 0] - 1, bounds[:, 1] + 1, size=(2000, 3))
+            cells = grid.find_containing_cell(points)
+            expected = np.where(cells >= 0, grid["Random Data"][cells], np.nan)
+            sampled = omfvista.sample_volume(vol, points, origin=ORIGIN, chunk_size=300)
+            self.assertTrue(np.allclose(sampled["Random Data"], expected, equal_nan=True))
+
+    def test_linear(self):
+        for vol in (VOLUME, VOLUME_IR):
+            grid = omfvista.wrap(vol, origin=ORIGIN)
+            centers = grid.cell_centers().points
+            values = grid["Random Data"]
+            sampled = omfvista.sample_volume(vol, centers, method="linear", origin=ORIGIN)
+            self.assertTrue(np.allclose(sampled["Random Data"], values))
+            # Half way between neighbouring cells along axis_u
+            halfway = (centers[:9] + centers[1:10]) / 2.0
+            sampled = omfvista.sample_volume(vol, halfway, method="linear", origin=ORIGIN)
+            self.assertTrue(np.allclose(sampled["Random Data"], (values[:9] + values[1:10]) / 2.0))
+
+    def test_dataset(self):
+        points = pyvista.PolyData(np.random.rand(50, 3) * 10 + 10)
+        output = omfvista.sample_volume(VOLUME, points, names=["Random Data"])
+        self.assertEqual(output.array_names, ["Random Data"])
+        self.assertEqual(points.array_names, [])
+
+    def test_invalid(self):
+        with self.assertRaises(ValueError):
+            omfvista.sample_volume(VOLUME, np.zeros((1, 3)), method="cubic")
+        with self.assertRaises(KeyError):
+            omfvista.sample_volume(VOLUME, np.zeros((1, 3)), names=["Nope"])
+
+
+if __name__ == "__main__":
+    import unittest
+
+    unittest.main()
@@ -0,0 +1,93 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+import omf
+import pyvista
+
+import omfvista
+from omfvista.sharing import dump_dataset, load_dataset
+from tests.element_test import PROJECT
+
+
+class TestSharing(unittest.TestCase):
+    """
+    Hand converted data objects between processes through memory mapped files
+    """
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.project_filename = os.path.join(self.test_dir, "project.omf")
+        omf.OMFWriter(PROJECT, self.project_filename)
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+
+    def assertSameDataset(self, a, b):
+        self.assertEqual(type(a), type(b))
+        self.assertEqual(a.n_points, b.n_points)
+        self.assertEqual(a.n_cells, b.n_cells)
+        self.assertTrue(np.allclose(a.points, b.points))
+        for association in ("point_data", "cell_data"):
+            attributes = getattr(a, association)
+            self.assertEqual(set(attributes.keys()), set(getattr(b, association).keys()))
+            for name in attributes.keys():
+                self.assertTrue(np.allclose(attributes[name], getattr(b, association)[name]))
+
+    def test_round_trip(self):
+        for element in PROJECT.elements:
+            dataset = omfvista.wrap(element)
+            handle = dump_dataset(dataset, self.test_dir)
+            output = load_dataset(handle)
+            self.assertSameDataset(output, dataset)
+            if isinstance(dataset, pyvista.PolyData):
+                self.assertTrue(np.array_equal(output.verts, dataset.verts))
+                self.assertTrue(np.array_equal(output.lines, dataset.lines))
+                self.assertTrue(np.array_equal(output.faces, dataset.faces))
+            # The files are removed once mapped
+            self.assertFalse(os.path.exists(handle["directory"]))
+
+    def test_unstructured_grid(self):
+        grid = pyvista.ImageData(dimensions=(3, 4, 5)).cast_to_unstructured_grid()
+        grid["cell ids"] = np.arange(grid.n_cells)
+        output = load_dataset(dump_dataset(grid, self.test_dir))
+        self.assertSameDataset(output, grid)
+        self.assertTrue(np.array_equal(output.celltypes, grid.celltypes))
+        self.assertTrue(np.array_equal(output.cell_connectivity, grid.cell_connectivity))
+
+    def test_non_numeric_arrays(self):
+        sphere = pyvista.Sphere()
+        labels = np.array(["label {}".format(i % 3) for i in range(sphere.n_points)])
+        sphere.point_data["labels"] = labels
+        sphere.point_data["complex"] = np.ones(sphere.n_points, dtype=complex)
+        with self.assertWarns(UserWarning):
+            handle = dump_dataset(sphere, self.test_dir)
+        output = load_dataset(handle)
+        # String arrays are handed off, other non-numeric arrays are dropped
+        self.assertTrue(np.array_equal(output.point_data["labels"], labels))
+        self.assertNotIn("complex", output.point_data.keys())
+        self.assertIsNone(output.point_data.active_scalars_name)
+
+    def test_unsupported(self):
+        with self.assertRaises(TypeError):
+            dump_dataset(pyvista.ImageData(dimensions=(2, 2, 2)), self.test_dir)
+        self.assertEqual(os.listdir(self.test_dir), ["project.omf"])
+
+    def test_load_project_parallel(self):
+        expected = omfvista.load_project(self.project_filename)
+        data = omfvista.load_project_parallel(self.project_filename, processes=2)
+        self.assertEqual(list(data.keys()), list(expected.keys()))
+        for name in expected.keys():
+            self.assertSameDataset(data[name], expected[name])
+        data, textures = omfvista.load_project_parallel(
+            self.project_filename, processes=2, load_textures=True
+        )
+        self.assertEqual(textures, {})
+
+
+if __name__ == "__main__":
+    import unittest
+
+    unittest.main()
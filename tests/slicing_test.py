@@ -0,0 +1,80 @@
+import unittest
+
+import numpy as np
+import omf
+
+import omfvista
+from tests.element_test import VOLUME, VOLUME_IR
+
+ORIGIN = np.array([5.0, -3.0, 2.0])
+
+# A volume with uneven cell sizes and data on its vertices
+UNEVEN = omf.VolumeElement(
+    name="uneven",
+    geometry=omf.VolumeGridGeometry(
+        tensor_u=np.array([1.0, 2.0, 3.0]),
+        tensor_v=np.array([0.5, 0.5]),
+        tensor_w=np.array([4.0, 1.0, 1.0, 2.0]),
+        origin=[1.0, 2.0, 3.0],
+    ),
+    data=[
+        omf.ScalarData(name="cells", location="cells", array=np.arange(24.0)),
+        omf.ScalarData(name="nodes", location="vertices", array=np.arange(60.0)),
+    ],
+)
+
+
+def full_layer(shape, axis, index):
+    """The ids of the cells of a layer of a full grid (in VTK order)"""
+    ids = np.arange(np.prod(shape)).reshape(shape, order="F")
+    return np.take(ids, [index], axis=axis).ravel(order="F")
+
+
+class TestSlicing(unittest.TestCase):
+    """
+    Slice gridded volumes without converting them
+    """
+
+    def test_index(self):
+        for vol in (VOLUME, VOLUME_IR):
+            grid = omfvista.wrap(vol, origin=ORIGIN)
+            shape = omfvista.volume.get_volume_shape(vol.geometry)
+            for axis, index in (("u", 3), ("v", 0), ("w", -1)):
+                layer = omfvista.slice_volume(vol, axis, index=index, origin=ORIGIN)
+                position = "uvw".index(axis)
+                self.assertEqual(layer.n_cells, np.prod(shape) // shape[position])
+                ids = full_layer(shape, position, index % shape[position])
+                self.assertTrue(np.allclose(layer["Random Data"], grid["Random Data"][ids]))
+                centers = grid.cell_centers().points[ids]
+                self.assertTrue(np.allclose(layer.cell_centers().points, centers))
+
+    def test_offset(self):
+        grid = omfvista.volume_grid_geom_to_vtk(UNEVEN.geometry)
+        grid["cells"] = np.arange(24.0).reshape(3, 2, 4).ravel(order="F")
+        shape = (3, 2, 4)
+        # 4.5 along w is in the second layer of cells (from 4 to 5)
+        layer = omfvista.slice_volume(UNEVEN, 2, offset=4.5)
+        self.assertTrue(np.allclose(layer.bounds[4:], [7.0, 8.0]))
+        ids = full_layer(shape, 2, 1)
+        self.assertTrue(np.allclose(layer["cells"], grid["cells"][ids]))
+        nodes = np.arange(60.0).reshape(4, 3, 5)[:, :, 1:3]
+        self.assertTrue(np.allclose(layer["nodes"], nodes.ravel(order="F")))
+        last = omfvista.slice_volume(UNEVEN, "u", offset=6.0, names=["cells"])
+        self.assertEqual(last.array_names, ["cells"])
+        self.assertTrue(np.allclose(last.bounds[:2], [4.0, 7.0]))
+
+    def test_invalid(self):
+        with self.assertRaises(ValueError):
+            omfvista.slice_volume(VOLUME, "x", index=0)
+        with self.assertRaises(ValueError):
+            omfvista.slice_volume(VOLUME, "u")
+        with self.assertRaises(ValueError):
+            omfvista.slice_volume(VOLUME, "u", offset=11.0)
+        with self.assertRaises(IndexError):
+            omfvista.slice_volume(VOLUME, "u", index=10)
+
+
+if __name__ == "__main__":
+    import unittest
+
+    unittest.main()
@@ -0,0 +1,110 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+import omf
+
+import omfvista
+from tests.element_test import LINESET, POINTSET, PROJECT
+
+# A line set chaining the vertices, so that no two segments share a center
+CHAIN = omf.LineSetElement(
+    name="chain",
+    geometry=omf.LineSetGeometry(
+        vertices=LINESET.geometry.vertices.array,
+        segments=np.c_[np.arange(99), np.arange(1, 100)],
+    ),
+)
+
+try:
+    import scipy  # noqa: F401
+except ImportError:
+    scipy = None
+
+
+@unittest.skipIf(scipy is None, "SciPy is not installed")
+class TestSpatialIndex(unittest.TestCase):
+    """
+    Build spatial indices of point sets and line sets and query them
+    """
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.points = omfvista.wrap(POINTSET)
+        self.lines = omfvista.wrap(CHAIN)
+        self.queries = np.random.rand(200, 3)
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+
+    def brute_force(self, samples):
+        """The distances from every query point to every sample"""
+        return np.linalg.norm(self.queries[:, None, :] - samples[None, :, :], axis=2)
+
+    def test_query(self):
+        index = omfvista.build_spatial_index(self.points)
+        self.assertEqual(index.location, "points")
+        self.assertEqual(len(index), self.points.n_points)
+        distances = self.brute_force(np.asarray(self.points.points))
+        found, ids = index.query(self.queries, k=3)
+        self.assertEqual(ids.shape, (len(self.queries), 3))
+        self.assertTrue(np.allclose(found, np.sort(distances, axis=1)[:, :3]))
+        found, ids = index.query(self.queries)
+        self.assertTrue(np.array_equal(ids, np.argmin(distances, axis=1)))
+
+    def test_line_set(self):
+        index = omfvista.build_spatial_index(self.lines)
+        self.assertEqual(index.location, "cells")
+        self.assertEqual(len(index), self.lines.n_cells)
+        centers = np.asarray(self.lines.cell_centers().points)
+        _, ids = index.query(self.queries)
+        distances = self.brute_force(centers)
+        self.assertTrue(np.array_equal(ids, np.argmin(distances, axis=1)))
+
+    def test_query_radius(self):
+        index = omfvista.build_spatial_index(self.points)
+        distances = self.brute_force(np.asarray(self.points.points))
+        offsets, ids = index.query_radius(self.queries, 0.3, chunk_size=64)
+        self.assertEqual(len(offsets), len(self.queries) + 1)
+        for i in range(len(self.queries)):
+            expected = np.flatnonzero(distances[i] <= 0.3)
+            self.assertEqual(sorted(ids[offsets[i] : offsets[i + 1]]), list(expected))
+        near = index.within(self.queries, 0.3)
+        self.assertTrue(np.array_equal(near, np.any(distances <= 0.3, axis=0)))
+
+    def test_build_indices(self):
+        indices = omfvista.build_spatial_indices(omfvista.wrap(PROJECT))
+        self.assertEqual(sorted(indices), sorted([POINTSET.name, LINESET.name]))
+        with self.assertRaises(ValueError):
+            omfvista.SpatialIndex(self.queries, location="faces")
+
+    def test_save_load(self):
+        index = omfvista.build_spatial_index(self.points)
+        filename = os.path.join(self.test_dir, "points.npz")
+        index.save(filename)
+        loaded = omfvista.SpatialIndex.load(filename)
+        self.assertEqual(loaded.location, index.location)
+        self.assertEqual(loaded.leafsize, index.leafsize)
+        self.assertTrue(np.array_equal(loaded.points, index.points))
+        self.assertTrue(np.array_equal(loaded.query(self.queries)[1], index.query(self.queries)[1]))
+        other = os.path.join(self.test_dir, "other.npz")
+        np.savez(other, points=index.points)
+        with self.assertRaises(ValueError):
+            omfvista.SpatialIndex.load(other)
+
+    def test_cache(self):
+        cache_dir = os.path.join(self.test_dir, "cache")
+        cache = omfvista.export_project(PROJECT, cache_dir, spatial_index=True)
+        index = cache.spatial_index(POINTSET.name)
+        self.assertTrue(np.allclose(index.points, self.points.points))
+        self.assertEqual(cache.spatial_index(LINESET.name).location, "cells")
+        with self.assertRaises(KeyError):
+            cache.spatial_index("vol")
+
+
+if __name__ == "__main__":
+    import unittest
+
+    unittest.main()
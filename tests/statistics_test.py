@@ -0,0 +1,136 @@
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+import omf
+
+import omfvista
+from omfvista.statistics import StatisticsIndex, array_statistics
+from tests.element_test import PROJECT
+
+
+class TestStatistics(unittest.TestCase):
+    """
+    Index the bounds and array statistics of converted elements
+    """
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.project_filename = os.path.join(self.test_dir, "project.omf")
+        omf.OMFWriter(PROJECT, self.project_filename)
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+
+    def test_array_statistics(self):
+        arr = np.array([1.0, np.nan, 3.0, 2.0, np.nan])
+        stats = array_statistics(arr, "values", bins=4)
+        self.assertEqual(stats.count, 5)
+        self.assertEqual(stats.nan_count, 2)
+        self.assertEqual((stats.minimum, stats.maximum, stats.mean), (1.0, 3.0, 2.0))
+        self.assertEqual(sum(stats.histogram), 3)
+        self.assertEqual(len(stats.bin_edges), 5)
+        empty = array_statistics(np.full(3, np.nan))
+        self.assertIsNone(empty.minimum)
+        self.assertEqual(sum(empty.histogram), 0)
+        vectors = array_statistics(np.array([[3.0, 4.0], [0.0, 1.0]]))
+        self.assertEqual((vectors.minimum, vectors.maximum), (1.0, 5.0))
+
+    def test_non_finite(self):
+        stats = array_statistics(np.array([1.0, np.inf, 2.0, np.nan, -np.inf]), bins=4)
+        self.assertEqual((stats.count, stats.nan_count, stats.inf_count), (5, 1, 2))
+        self.assertEqual((stats.minimum, stats.maximum, stats.mean), (1.0, 2.0, 1.5))
+        self.assertEqual(sum(stats.histogram), 2)
+        self.assertEqual((stats.bin_edges[0], stats.bin_edges[-1]), (1.0, 2.0))
+        infinite = array_statistics(np.array([np.inf, -np.inf]))
+        self.assertIsNone(infinite.minimum)
+        self.assertEqual(infinite.inf_count, 2)
+        # The index, the cache and the statistics gathered while loading
+        points = PROJECT.elements[0]
+        values = np.arange(points.geometry.num_nodes, dtype=float)
+        values[:3] = [np.inf, np.nan, -np.inf]
+        element = omf.PointSetElement(
+            name="non-finite",
+            geometry=points.geometry,
+            data=[omf.ScalarData(name="values", array=values, location="vertices")],
+        )
+        project = omf.Project(name="non-finite", elements=[element])
+        filename = os.path.join(self.test_dir, "non-finite.omf")
+        omf.OMFWriter(project, filename)
+        index = omfvista.StatisticsIndex()
+        data = omfvista.load_project(filename, statistics=index)
+        stats = index.array("non-finite", "values")
+        self.assertEqual((stats.nan_count, stats.inf_count), (1, 2))
+        self.assertEqual(index.range("non-finite", "values"), (3.0, values[-1]))
+        cache = omfvista.export_project(filename, os.path.join(self.test_dir, "cache"))
+        self.assertEqual(cache.statistics().array("non-finite", "values"), stats)
+        # Deferred (empty) blocks are skipped
+        data["deferred"] = None
+        index = omfvista.compute_statistics(data)
+        self.assertEqual(index.names, ["non-finite"])
+        # Descriptions without inf_count can still be read
+        description = index.to_dict()
+        for entry in description["elements"][0]["arrays"]:
+            del entry["inf_count"]
+        copy = StatisticsIndex.from_dict(description)
+        self.assertEqual(copy.array("non-finite", "values").inf_count, 0)
+
+    def test_compute_statistics(self):
+        data = omfvista.load_project(self.project_filename)
+        index = omfvista.compute_statistics(data)
+        self.assertEqual(index.names, list(data.keys()))
+        for name in data.keys():
+            self.assertTrue(np.allclose(index.bounds(name), data[name].bounds))
+            self.assertEqual(index[name].n_cells, data[name].n_cells)
+        arr = data["vol"]["Random Data"]
+        self.assertEqual(index.range("vol", "Random Data"), (arr.min(), arr.max()))
+        self.assertEqual(index.array("vol", "Random Data", "cell").count, arr.size)
+        with self.assertRaises(KeyError):
+            index.array("vol", "Random Data", "point")
+        vol = index.bounds("vol")
+        self.assertIn("vol", index.cull(vol))
+        self.assertEqual(index.cull([1e6, 1e6 + 1, 1e6, 1e6 + 1, 1e6, 1e6 + 1]), [])
+        # Round trip through JSON
+        copy = StatisticsIndex.from_dict(json.loads(json.dumps(index.to_dict())))
+        self.assertEqual(copy.names, index.names)
+        self.assertEqual(copy["vol"], index["vol"])
+
+    def test_load_statistics(self):
+        index = omfvista.StatisticsIndex()
+        data = omfvista.load_project(self.project_filename, statistics=index)
+        expected = omfvista.compute_statistics(data)
+        self.assertEqual(index.names, expected.names)
+        for name in expected:
+            self.assertEqual(index[name], expected[name])
+
+    def test_blocks(self):
+        arr = np.random.default_rng(0).normal(size=100000)
+        arr[::13] = np.nan
+        stats = array_statistics(arr, bins=8)
+        values = arr[np.isfinite(arr)]
+        self.assertEqual(stats.nan_count, arr.size - values.size)
+        self.assertEqual((stats.minimum, stats.maximum), (values.min(), values.max()))
+        self.assertAlmostEqual(stats.mean, values.mean())
+        histogram, edges = np.histogram(values, bins=8)
+        self.assertEqual(stats.histogram, list(histogram))
+        self.assertTrue(np.allclose(stats.bin_edges, edges))
+
+    def test_cache_statistics(self):
+        cache = omfvista.export_project(self.project_filename, os.path.join(self.test_dir, "cache"))
+        index = cache.statistics()
+        expected = omfvista.compute_statistics(omfvista.load_project(self.project_filename))
+        for name in expected:
+            self.assertEqual(index[name].arrays.keys(), expected[name].arrays.keys())
+            self.assertTrue(np.allclose(index.bounds(name), expected.bounds(name)))
+        self.assertEqual(
+            index.range("Random Points", "rand data"), expected.range("Random Points", "rand data")
+        )
+
+
+if __name__ == "__main__":
+    import unittest
+
+    unittest.main()
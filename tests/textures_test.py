@@ -0,0 +1,100 @@
+import io
+import os
+import shutil
+import tempfile
+import unittest
+
+from PIL import Image
+import numpy as np
+import omf
+
+import omfvista
+from omfvista import textures
+from tests.element_test import SURFACE
+
+
+def make_image(seed, size=16):
+    """PNG bytes of a random RGB image"""
+    img = np.random.default_rng(seed).integers(0, 255, (size, size, 3), dtype=np.uint8)
+    fopen = io.BytesIO()
+    Image.fromarray(img).save(fopen, format="png")
+    fopen.seek(0)
+    return fopen, img
+
+
+def make_texture(seed):
+    """An OMF texture draped over the dummy surface"""
+    return omf.ImageTexture(
+        origin=[0.0, 0.0, 0.0],
+        axis_u=[1.0, 0.0, 0.0],
+        axis_v=[0.0, 1.0, 0.0],
+        image=make_image(seed)[0],
+    )
+
+
+def make_project():
+    """Three surfaces, two of them draped with the same image"""
+    elements = [
+        omf.SurfaceElement(name=name, geometry=SURFACE.geometry, textures=[make_texture(seed)])
+        for name, seed in (("topo", 0), ("pit", 0), ("shell", 1))
+    ]
+    return omf.Project(name="Textured", elements=elements)
+
+
+class TestTextureCache(unittest.TestCase):
+    """
+    Decode identical texture images once and share the converted textures
+    """
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.previous = textures.set_texture_cache(textures.TextureCache())
+
+    def tearDown(self):
+        textures.set_texture_cache(self.previous)
+        shutil.rmtree(self.test_dir)
+
+    def test_shared(self):
+        cache = textures.get_texture_cache()
+        data, found = omfvista.project_to_vtk(make_project(), load_textures=True)
+        self.assertIs(found["topo"][0], found["pit"][0])
+        self.assertIsNot(found["topo"][0], found["shell"][0])
+        self.assertEqual((cache.hits, cache.misses, len(cache)), (1, 2, 2))
+        self.assertTrue(np.array_equal(found["shell"][0].to_array(), make_image(1)[1]))
+        # Textures are only decoded when asked for
+        omfvista.project_to_vtk(make_project())
+        self.assertEqual(cache.hits + cache.misses, 3)
+        # And shared across projects
+        _, again = omfvista.project_to_vtk(make_project(), load_textures=True)
+        self.assertIs(again["topo"][0], found["topo"][0])
+
+    def test_budget(self):
+        nbytes = make_image(0)[1].nbytes
+        cache = textures.TextureCache(max_bytes=nbytes)
+        first = cache.get(make_texture(0))
+        self.assertIs(cache.get(make_texture(0)), first)
+        cache.get(make_texture(1))
+        # The least recently used texture was evicted
+        self.assertEqual((len(cache), cache.nbytes), (1, nbytes))
+        self.assertIsNot(cache.get(make_texture(0)), first)
+        cache = textures.TextureCache(max_bytes=nbytes - 1)
+        cache.get(make_texture(0))
+        self.assertEqual(len(cache), 0)
+
+    def test_directory(self):
+        directory = os.path.join(self.test_dir, "textures")
+        texture = make_texture(2)
+        cache = textures.TextureCache(directory=directory)
+        cache.get(texture)
+        filename = os.path.join(directory, textures.texture_digest(texture) + ".npy")
+        self.assertTrue(np.array_equal(np.load(filename), make_image(2)[1]))
+        # Another cache reads the decoded image back instead of the PNG
+        vtexture = textures.TextureCache(directory=directory).get(texture)
+        self.assertTrue(np.array_equal(vtexture.to_array(), make_image(2)[1]))
+        self.assertEqual(os.listdir(directory), [os.path.basename(filename)])
+
+
+if __name__ == "__main__":
+    import unittest
+
+    unittest.main()
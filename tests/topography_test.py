@@ -0,0 +1,91 @@
+import unittest
+
+import numpy as np
+import omf
+import pyvista
+
+import omfvista
+from tests.element_test import VOLUME, VOLUME_IR
+
+ORIGIN = np.array([5.0, -3.0, 2.0])
+
+# A volume rotated about the vertical
+VOLUME_Z = omf.VolumeElement(
+    name="vol_z",
+    geometry=omf.VolumeGridGeometry(
+        axis_u=[0.6, 0.8, 0],
+        axis_v=[-0.8, 0.6, 0],
+        axis_w=[0, 0, 1],
+        tensor_u=np.ones(10),
+        tensor_v=np.full(15, 0.5),
+        tensor_w=np.ones(20),
+        origin=[10.0, 10.0, -10],
+    ),
+    data=VOLUME.data,
+)
+
+
+def make_plane(height):
+    """A tilted plane surface grid: z = 0.2 * x - 0.1 * y + height"""
+    x, y = np.meshgrid(np.arange(21) * 5.0 - 20.0, np.arange(21) * 5.0 - 20.0)
+    return omf.SurfaceGridGeometry(
+        tensor_u=np.full(20, 5.0),
+        tensor_v=np.full(20, 5.0),
+        origin=[-20.0, -20.0, height],
+        offset_w=(0.2 * x - 0.1 * y).ravel(),
+    )
+
+
+class TestTopography(unittest.TestCase):
+    """
+    Mask gridded volumes against topography surface grids
+    """
+
+    def test_plane(self):
+        for vol, height in ((VOLUME, -3.0), (VOLUME_IR, 15.0), (VOLUME_Z, -3.0)):
+            grid = omfvista.wrap(vol)
+            centers = np.asarray(grid.cell_centers().points)
+            expected = centers[:, 2] < 0.2 * centers[:, 0] - 0.1 * centers[:, 1] + height
+            plane = make_plane(height)
+            below = omfvista.topography_mask(vol.geometry, plane, chunk_size=500, workers=2)
+            shape = omfvista.volume.get_volume_shape(vol.geometry)
+            # Cell ids of VTK grids are in F order, OMF arrays in C order
+            self.assertTrue(np.array_equal(below.reshape(shape).ravel(order="F"), expected))
+            self.assertTrue(0 < np.count_nonzero(expected) < len(expected))
+
+    def test_nodes(self):
+        # Surface nodes at the centers of the columns of cells
+        heights = np.random.default_rng(0).uniform(-8.0, 8.0, (15, 10))
+        topo = omf.SurfaceElement(
+            name="topo",
+            geometry=omf.SurfaceGridGeometry(
+                tensor_u=np.ones(9),
+                tensor_v=np.ones(14),
+                origin=[10.5, 10.5, 0.0],
+                offset_w=heights.ravel(),
+            ),
+        )
+        below = omfvista.topography_mask(VOLUME.geometry, topo).reshape(10, 15, 20)
+        z = -10 + np.arange(20) + 0.5
+        self.assertTrue(np.array_equal(below, z[None, None, :] < heights.T[:, :, None]))
+
+    def test_mask_volume(self):
+        plane = make_plane(15.0)
+        grid = omfvista.mask_volume(VOLUME_IR, plane, origin=ORIGIN)
+        self.assertIn("Below Topography", grid.cell_data)
+        below = grid["Below Topography"]
+        kept = omfvista.mask_volume(VOLUME_IR, plane, drop=True, origin=ORIGIN)
+        self.assertIsInstance(kept, pyvista.UnstructuredGrid)
+        self.assertEqual(kept.n_cells, np.count_nonzero(below))
+        ids = kept["vtkOriginalCellIds"]
+        self.assertTrue(np.all(below[ids]))
+        self.assertTrue(np.allclose(kept["Random Data"], grid["Random Data"][ids]))
+        self.assertTrue(np.allclose(kept.cell_centers().points, grid.cell_centers().points[ids]))
+        with self.assertRaises(ValueError):
+            omfvista.topography_mask(VOLUME.geometry, VOLUME.geometry)
+
+
+if __name__ == "__main__":
+    import unittest
+
+    unittest.main()